@@ -0,0 +1,125 @@
+from typing import Any, Iterable, Iterator, Optional
+from dcicutils.structured_data import StructuredDataSet
+
+# Compact storage for the parsed rows (items) of a StructuredDataSet, for the low-memory (--streaming) mode
+# of (client-side) validation of very large workbooks. Each sheet (i.e. the list of item dictionaries for a
+# schema within StructuredDataSet.data) is replaced, once it is done, with a CompactRows list, which stores
+# each item as a tuple of its (top-level) property values, with the tuple of its property names (which are
+# the same for almost all items of a sheet) stored once per sheet and shared; which is a fraction of the size
+# of a dictionary. Item dictionaries are (re)built only on demand, i.e. as each is accessed, e.g. when iterated
+# over, or indexed, and are not retained; so at most the dictionaries of the sheet being parsed are held at once,
+# and memory use is roughly that of the largest sheet, plus the (compact) tuples of all of the others.
+#
+# CompactRows is a list (subclass), so it may be used just as the original list of dictionaries, by any code,
+# with the one caveat that, since the dictionaries are built on demand, changes to an item must be written back
+# by (re)assigning it to the list, i.e. rows[index] = item; nested (e.g. array or object) values are shared.
+
+
+class CompactRows(list):
+
+    def __init__(self, items: Optional[Iterable[dict]] = None) -> None:
+        super().__init__()
+        self._keys = {}  # Shared tuples of property names
+        if items is not None:
+            self.extend(items)
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in super().__iter__():
+            yield self._expand(row)
+
+    def __reversed__(self) -> Iterator[dict]:
+        for row in super().__reversed__():
+            yield self._expand(row)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._expand(row) for row in super().__getitem__(index)]
+        return self._expand(super().__getitem__(index))
+
+    def __setitem__(self, index: Any, item: Any) -> None:
+        if isinstance(index, slice):
+            super().__setitem__(index, [self._compact(element) for element in item])
+        else:
+            super().__setitem__(index, self._compact(item))
+
+    def __contains__(self, item: Any) -> bool:
+        return any(element == item for element in self)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, list) and (len(self) == len(other)) and all(
+            element == other_element for element, other_element in zip(self, other))
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __add__(self, other: Iterable[dict]) -> list:
+        return list(self) + list(other)
+
+    def __iadd__(self, other: Iterable[dict]) -> "CompactRows":
+        self.extend(other)
+        return self
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def __reduce_ex__(self, protocol: Any) -> tuple:
+        return (CompactRows, (list(self),))
+
+    def copy(self) -> list:
+        return list(self)
+
+    def append(self, item: Any) -> None:
+        super().append(self._compact(item))
+
+    def extend(self, items: Iterable[Any]) -> None:
+        super().extend(self._compact(item) for item in items)
+
+    def insert(self, index: int, item: Any) -> None:
+        super().insert(index, self._compact(item))
+
+    def pop(self, index: int = -1) -> Any:
+        return self._expand(super().pop(index))
+
+    def remove(self, item: Any) -> None:
+        del self[self.index(item)]
+
+    def index(self, item: Any, *args) -> int:
+        for index in range(*slice(*args).indices(len(self))) if args else range(len(self)):
+            if self[index] == item:
+                return index
+        raise ValueError(f"{item!r} is not in list")
+
+    def count(self, item: Any) -> int:
+        return sum(1 for element in self if element == item)
+
+    def sort(self, *args, **kwargs) -> None:
+        items = list(self)
+        items.sort(*args, **kwargs)
+        self[:] = items
+
+    def _compact(self, item: Any) -> Any:
+        # A (property values) tuple with the (shared) tuple of property names at the end (see _expand).
+        if type(item) is not dict:
+            return item
+        keys = tuple(item)
+        if (shared_keys := self._keys.get(keys)) is None:
+            shared_keys = self._keys[keys] = keys
+        return (*item.values(), shared_keys)
+
+    @staticmethod
+    def _expand(row: Any) -> Any:
+        # Note that zip stops at the end of the property names, i.e. before the property names at the end.
+        return dict(zip(row[-1], row)) if type(row) is tuple else row
+
+
+def compact_structured_data(structured_data: StructuredDataSet, schema: Optional[str] = None) -> None:
+    """
+    Replaces the list of items for the given schema, or for every schema if not specified, within the
+    given StructuredDataSet, with an equivalent CompactRows list, if it is not one already.
+    """
+    data = structured_data.data
+    for schema in ([schema] if schema else list(data)):
+        if isinstance(items := data.get(schema), list) and not isinstance(items, CompactRows):
+            data[schema] = CompactRows(items)
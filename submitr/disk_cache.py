@@ -0,0 +1,118 @@
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, List, Optional
+
+# Simple persistent (on-disk) key/value cache, with optional time-to-live (TTL) for its entries,
+# for caching (JSON-serializable) portal responses, and the like, across runs of submitr commands.
+# Each named cache is a single JSON file in the cache directory (~/.smaht-submitr/cache by default,
+# or as specified by the SUBMITR_CACHE_DIRECTORY environment variable); it is read lazily (on first
+# access), and written (atomically) on save, which is automatically done at exit if modified; as the cached
+# responses may be user-specific, the cache directory (if created here) and files are private to the user.
+# This is strictly best-effort; any error reading or writing the cache file is silently ignored.
+
+DEFAULT_CACHE_DIRECTORY = os.path.expanduser(os.path.join("~", ".smaht-submitr", "cache"))
+_CACHE_FILE_VERSION = 1
+
+
+def get_cache_directory() -> str:
+    return os.environ.get("SUBMITR_CACHE_DIRECTORY") or DEFAULT_CACHE_DIRECTORY
+
+
+class DiskCache:
+
+    def __init__(self, name: str, ttl: Optional[int] = None, directory: Optional[str] = None) -> None:
+        """
+        Creates a persistent cache with the given name (which must be suitable as a file name);
+        its entries expire after the given TTL (in seconds) if specified, otherwise never.
+        """
+        self._name = name
+        self._ttl = ttl if isinstance(ttl, (int, float)) and ttl > 0 else None
+        self._file = os.path.join(directory or get_cache_directory(), f"{name}.json")
+        self._entries = None
+        self._modified = False
+        self._lock = threading.RLock()
+        atexit.register(self.save)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def file(self) -> str:
+        return self._file
+
+    @property
+    def ttl(self) -> Optional[int]:
+        return self._ttl
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if (entry := self._load().get(key)) is None:
+                return default
+            if self._is_expired(entry):
+                del self._entries[key]
+                self._modified = True
+                return default
+            return entry[1]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._load()[key] = [time.time(), value]
+            self._modified = True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if self._load().pop(key, None) is not None:
+                self._modified = True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._modified = False
+            try:
+                os.remove(self._file)
+            except Exception:
+                pass
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [key for key, entry in self._load().items() if not self._is_expired(entry)]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len([entry for entry in self._load().values() if not self._is_expired(entry)])
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._modified or self._entries is None:
+                return
+            try:
+                entries = {key: entry for key, entry in self._entries.items() if not self._is_expired(entry)}
+                os.makedirs(os.path.dirname(self._file), mode=0o700, exist_ok=True)
+                temporary_file = f"{self._file}.{os.getpid()}.tmp"
+                with os.fdopen(os.open(temporary_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as f:
+                    json.dump({"version": _CACHE_FILE_VERSION, "entries": entries}, f)
+                os.replace(temporary_file, self._file)
+                self._modified = False
+            except Exception:
+                pass
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            self._entries = {}
+            try:
+                if os.path.exists(self._file):
+                    with open(self._file) as f:
+                        if (isinstance(contents := json.load(f), dict) and
+                            (contents.get("version") == _CACHE_FILE_VERSION) and
+                            isinstance(entries := contents.get("entries"), dict)):  # noqa
+                            self._entries = entries
+            except Exception:
+                pass
+        return self._entries
+
+    def _is_expired(self, entry: list) -> bool:
+        return (self._ttl is not None) and ((time.time() - entry[0]) > self._ttl)
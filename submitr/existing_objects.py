@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import os
+from typing import Any, Dict, List, Optional, Set
+from urllib.parse import quote, urlparse
+from dcicutils import ff_utils
+from dcicutils.misc_utils import to_integer
+from dcicutils.structured_data import StructuredDataSet
+
+# Batched prefetch of the existing portal objects for the items of a StructuredDataSet, for the create/update
+# analysis (i.e. StructuredDataSet.compare) which otherwise looks up each item individually (i.e. one or more
+# GETs per item, per its identifying paths). Here all of the identifying property values of all of the items
+# are gathered up-front, by type, and the existing objects are fetched with paged multi-value searches, e.g.
+# /search/?type=Donor&submitted_id=A&submitted_id=B...&frame=raw, (up to _VALUES_PER_PORTAL_QUERY values per
+# page), with the pages run concurrently (SUBMITR_PREFETCH_THREADS). While prefetched_existing_objects is in
+# effect, the (raw) lookups of these identifying paths (via the StructuredDataSet portal get method) which were
+# found by these searches are then served from their results without going to the portal. Only positive results
+# are served (as with reference resolution; see ref_resolver.resolve_refs), as a search excludes objects (e.g.
+# deleted or replaced ones) which a GET returns; so any other lookups, i.e. for values not found or whose search
+# failed, or any other requests, go to the portal as usual.
+
+_VALUES_PER_PORTAL_QUERY = 100
+_PREFETCH_NTHREADS = to_integer(os.environ.get("SUBMITR_PREFETCH_THREADS"), fallback=4) or 1
+
+
+class ExistingObjects:
+
+    def __init__(self) -> None:
+        self._items = {}  # By type name and identifying value
+        self._subtypes = {}  # By type name
+        self._nqueries = 0
+
+    @property
+    def nqueries(self) -> int:
+        return self._nqueries
+
+    @property
+    def nfound(self) -> int:
+        return len(set(id(item) for items in self._items.values() for item in items.values()))
+
+    def prefetch(self, structured_data: StructuredDataSet, nthreads: Optional[int] = None) -> None:
+        """
+        Fetches the existing portal objects for all of the items of the given StructuredDataSet.
+        """
+        if not ((portal := structured_data.portal) and (portal_key := getattr(portal, "key", None))):
+            return
+        queries = []
+        for type_name, values_by_property in _get_identifying_values(structured_data).items():
+            self._subtypes[type_name] = set(portal.get_schema_subtype_names(type_name) or [])
+            for property_name, values in values_by_property.items():
+                values = sorted(values)
+                for i in range(0, len(values), _VALUES_PER_PORTAL_QUERY):
+                    queries.append((type_name, property_name, values[i:i + _VALUES_PER_PORTAL_QUERY]))
+        if (nthreads := nthreads or _PREFETCH_NTHREADS) > 1 and len(queries) > 1:
+            with ThreadPoolExecutor(max_workers=min(nthreads, len(queries))) as executor:
+                results = list(executor.map(lambda query: _search_objects(*query, portal_key), queries))
+        else:
+            results = [_search_objects(*query, portal_key) for query in queries]
+        self._nqueries += len(queries)
+        for (type_name, property_name, values), items in zip(queries, results):
+            if items is None:
+                continue
+            found = self._items.setdefault(type_name, {})
+            for item in items:
+                # Objects returned without a uuid are not usable, so those are looked up as usual.
+                if isinstance(item, dict) and isinstance(item.get("uuid"), str):
+                    for item_value in _get_values(item.get(property_name)):
+                        found[item_value] = item
+
+    def lookup(self, path: str) -> Optional[dict]:
+        """
+        Returns the (raw) existing object prefetched for the given (identifying) path, e.g. /Donor/SOME-DONOR,
+        or /SOME-DONOR, or None if none was found (in which case it should be looked up via the portal as usual).
+        """
+        if not (isinstance(path, str) and (parts := path.strip("/").split("/", 1)) and all(parts)):
+            return None
+        if len(parts) == 1:
+            for items in self._items.values():
+                if item := items.get(parts[0]):
+                    return item
+            return None
+        path_type_name, value = parts
+        for type_name, items in self._items.items():
+            if (path_type_name == type_name) or (path_type_name in self._subtypes[type_name]):
+                # For a subtype path the object must actually be of that subtype.
+                if (item := items.get(value)) and ((path_type_name == type_name) or
+                                                   (path_type_name in _get_values(item.get("@type")))):
+                    return item
+        return None
+
+
+@contextmanager
+def prefetched_existing_objects(structured_data: StructuredDataSet, nthreads: Optional[int] = None):
+    """
+    Context manager within which the raw (GET) lookups of the identifying paths of the items of the given
+    StructuredDataSet, via its portal, are served from existing portal objects prefetched in bulk.
+    """
+    existing_objects = ExistingObjects()
+    if not (portal := structured_data.portal):
+        yield existing_objects
+        return
+    try:
+        existing_objects.prefetch(structured_data, nthreads=nthreads)
+    except Exception:
+        pass
+    portal_get = portal.get
+    def get_prefetched(url: str, *args, **kwargs) -> Any:  # noqa
+        if (kwargs == {"raw": True}) and not args and isinstance(url, str) and ("?" not in url):
+            if item := existing_objects.lookup(urlparse(url).path):
+                return _PrefetchedResponse(item)
+        return portal_get(url, *args, **kwargs)
+    portal.get = get_prefetched
+    try:
+        yield existing_objects
+    finally:
+        portal.get = portal_get
+
+
+class _PrefetchedResponse:
+
+    def __init__(self, item: dict) -> None:
+        self._item = item
+        self.status_code = 200
+
+    def json(self) -> dict:
+        return {key: value for key, value in self._item.items() if not key.startswith("@")}
+
+
+def _get_identifying_values(structured_data: StructuredDataSet) -> Dict[str, Dict[str, Set[str]]]:
+    portal = structured_data.portal
+    result = {}
+    for type_name, items in (structured_data.data or {}).items():
+        if not (identifying_properties := portal.get_identifying_property_names(type_name)):
+            continue
+        values_by_property = {}
+        for item in items:
+            if isinstance(item, dict):
+                for property_name in identifying_properties:
+                    for value in _get_values(item.get(property_name)):
+                        values_by_property.setdefault(property_name, set()).add(value)
+        if values_by_property:
+            result[type_name] = values_by_property
+    return result
+
+
+def _search_objects(type_name: str, property_name: str, values: List[str], portal_key: dict) -> Optional[List[dict]]:
+    query = (f"/search/?type={type_name}" +
+             "".join(f"&{property_name}={quote(value)}" for value in values) + "&frame=raw")
+    try:
+        return ff_utils.search_metadata(query, portal_key) or []
+    except Exception:
+        return None
+
+
+def _get_values(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value] if value else []
+    if isinstance(value, list):
+        return [item for item in value if isinstance(item, str) and item]
+    return []
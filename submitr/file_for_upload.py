@@ -7,6 +7,7 @@ from dcicutils.file_utils import compute_file_md5, get_file_size, normalize_path
 from dcicutils.function_cache_decorator import function_cache
 from dcicutils.misc_utils import format_size, normalize_string
 from dcicutils.structured_data import Portal, StructuredDataSet
+from submitr.http_cache import cached_get, cached_get_json
 from submitr.output import PRINT
 from submitr.rclone import RCloneAmazon, RCloneStore
 from submitr.utils import chars
@@ -507,7 +508,7 @@ def get_file_upload_bucket(portal: Portal) -> Optional[str]:
     if not isinstance(portal, Portal):
         return None
     try:
-        return portal.get_health().json()["file_upload_bucket"]
+        return cached_get(portal, "/health").json()["file_upload_bucket"]
     except Exception:
         return None
 
@@ -536,7 +537,7 @@ def get_file_extension(file_format_uuid_or_file_object: Union[str, dict], portal
             return None
     elif isinstance(file_format_uuid_or_file_object, str):
         file_format_uuid = file_format_uuid_or_file_object
-    if file_format_uuid and (file_format_object := portal.get_metadata(file_format_uuid)):
+    if file_format_uuid and (file_format_object := cached_get_json(portal, f"/{file_format_uuid}")):
         if file_extension := file_format_object.get("standard_file_extension"):
             return file_extension
     return None
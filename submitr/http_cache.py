@@ -0,0 +1,120 @@
+import os
+import time
+from typing import Any, Optional
+from dcicutils.misc_utils import to_integer
+from submitr.disk_cache import DiskCache
+
+# Persistent (on-disk) HTTP response cache, across runs, for the slowly changing (reference) portal
+# endpoints which every run fetches, e.g. the health page, /me (user record), consortia, submission centers,
+# metadata template version, and file formats. The (JSON) body of each successful (200) response is stored
+# along with its ETag and/or Last-Modified headers, keyed by portal server, access key ID (as some responses
+# depend on the user), and path. Within SUBMITR_HTTP_CACHE_TTL seconds (default five minutes; zero disables
+# this cache entirely) of being fetched (or revalidated) the cached response is used as-is without any request;
+# after that the request is made conditionally (i.e. with If-None-Match and/or If-Modified-Since) so that if
+# unchanged only a 304 (Not Modified) round-trip is needed; entries are discarded after a week unused. Responses
+# which must reflect the current validity of the access key, i.e. /me, are always revalidated (see revalidate).
+# Only successful responses are cached; anything else (e.g. 401/403) is returned to the caller as usual.
+
+_HTTP_CACHE_NAME = "http"
+_MIME_TYPE_JSON = "application/json"
+_HTTP_CACHE_TTL = to_integer(os.environ.get("SUBMITR_HTTP_CACHE_TTL"), fallback=None)
+_HTTP_CACHE_TTL = 5 * 60 if _HTTP_CACHE_TTL is None else _HTTP_CACHE_TTL  # seconds
+_HTTP_CACHE_RETENTION = 7 * 24 * 60 * 60  # seconds
+
+_http_cache = None
+
+
+def cached_get(portal: object, path: str, ttl: Optional[int] = None, server: Optional[str] = None,
+               revalidate: bool = False, cache: Optional[DiskCache] = None) -> Any:
+    """
+    Returns the response for a GET of the given path via the given portal, from, and saved to, the persistent
+    HTTP response cache, revalidated with the portal if older than the given TTL (default SUBMITR_HTTP_CACHE_TTL);
+    the server (for the cache key) is that of the portal unless given, e.g. if the path is a full URL; if
+    revalidate is True then the (conditional) request is always made, i.e. regardless of the TTL.
+    The response is the actual one, or for one served from the cache an object with a status_code of 200, and
+    a json method, which returns the cached body (of the JSON response); i.e. typically used like:
+    if (response := cached_get(portal, "/consortia")).status_code == 200: consortia = response.json()
+    """
+    ttl = _HTTP_CACHE_TTL if ttl is None else ttl
+    if (ttl <= 0) or not (server := server or getattr(portal, "server", None)) or getattr(portal, "vapp", None):
+        return portal.get(path)
+    if cache is None and (cache := _get_http_cache()) is None:
+        return portal.get(path)
+    key = _http_cache_key(server, getattr(portal, "key_id", None), path)
+    if not isinstance(entry := cache.get(key), dict):
+        entry = None
+    elif (not revalidate) and (time.time() - (entry.get("time") or 0) < ttl):
+        return CachedResponse(entry.get("body"))
+    headers = {"Content-type": _MIME_TYPE_JSON, "Accept": _MIME_TYPE_JSON}
+    if entry and (etag := entry.get("etag")):
+        headers["If-None-Match"] = etag
+    if entry and (last_modified := entry.get("last_modified")):
+        headers["If-Modified-Since"] = last_modified
+    response = portal.get(path, headers=headers)
+    if (getattr(response, "status_code", None) == 304) and entry:
+        cache.set(key, {**entry, "time": time.time()})
+        return CachedResponse(entry.get("body"))
+    if getattr(response, "status_code", None) == 200:
+        try:
+            body = response.json()
+        except Exception:
+            return response
+        response_headers = getattr(response, "headers", None) or {}
+        cache.set(key, {"time": time.time(), "body": body,
+                        "etag": response_headers.get("ETag"), "last_modified": response_headers.get("Last-Modified")})
+    return response
+
+
+def cached_get_json(portal: object, path: str,
+                    ttl: Optional[int] = None, server: Optional[str] = None) -> Optional[Any]:
+    """
+    Same as cached_get but returns the (JSON) body of the response if successful, otherwise None.
+    """
+    try:
+        if ((response := cached_get(portal, path, ttl=ttl, server=server)) is not None and
+            (response.status_code == 200)):  # noqa
+            return response.json()
+    except Exception:
+        pass
+    return None
+
+
+def clear_http_cache(server: Optional[str] = None) -> int:
+    """
+    Clears the HTTP response cache, or only those responses for the given portal server if specified;
+    returns the number of cached responses cleared.
+    """
+    cache = _get_http_cache() or DiskCache(_HTTP_CACHE_NAME)
+    if server:
+        keys = [key for key in cache.keys() if key.startswith(f"{server.rstrip('/')}|")]
+        for key in keys:
+            cache.delete(key)
+        cache.save()
+        return len(keys)
+    nentries = len(cache)
+    cache.clear()
+    return nentries
+
+
+class CachedResponse:
+
+    def __init__(self, body: Any) -> None:
+        self._body = body
+        self.status_code = 200
+
+    def json(self) -> Any:
+        return self._body
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def _http_cache_key(server: str, key_id: Optional[str], path: str) -> str:
+    return f"{server.rstrip('/')}|{key_id or ''}|{path}"
+
+
+def _get_http_cache() -> Optional[DiskCache]:
+    global _http_cache
+    if _http_cache is None and _HTTP_CACHE_TTL > 0:
+        _http_cache = DiskCache(_HTTP_CACHE_NAME, ttl=_HTTP_CACHE_RETENTION)
+    return _http_cache
@@ -0,0 +1,217 @@
+import atexit
+import json
+import re
+import threading
+import time
+from typing import Any, Callable, List, Optional
+from urllib.parse import parse_qsl, urlparse
+from dcicutils.misc_utils import format_size
+
+# Tracing of the (portal) HTTP calls made by submitr, i.e. e.g. to tell whether a slow run is due to the
+# portal or to submitr itself. All of these calls, i.e. via the dcicutils Portal (get/post/patch/etc) and
+# the direct ff_utils calls (e.g. search_metadata, in validators), go through the requests package, so the
+# hook here is at that level (requests.Session.request) and may have any number of listeners (see also
+# run_metrics). A listener is called, after each call, with a record of: the method, the URL, the status
+# (None on connection errors, et cetera), the latency (seconds), and the (response) bytes. The HttpTrace
+# listener collects these records, and can summarize them per (normalized) endpoint, i.e. with identifying
+# values templated out of the URL (e.g. /Donor/{id}, /validators/submitted_id/{id}), with latency percentiles;
+# and can dump them as NDJSON for offline analysis. See start_http_trace (i.e. --debug and --http-trace).
+
+_UUID_REGEX = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_IDENTIFIER_REGEX = re.compile(r"^(?=.*\d)(?=.*[A-Z_])[A-Za-z0-9_.:-]+$")
+_TYPE_NAME_REGEX = re.compile(r"^[A-Z][A-Za-z0-9]*$")
+# Query parameters whose values are kept (rather than templated out) in the normalized endpoint.
+_QUERY_PARAMETERS_KEPT = {"type", "frame", "field", "limit"}
+
+_listeners = []
+_listeners_lock = threading.Lock()
+_hook_installed = False
+_http_trace = None
+
+
+class HttpTrace:
+
+    def __init__(self) -> None:
+        self._records = []
+        self._lock = threading.Lock()
+
+    @property
+    def records(self) -> List[dict]:
+        return list(self._records)
+
+    def __call__(self, record: dict) -> None:
+        with self._lock:
+            self._records.append(record)
+
+    def summary(self) -> List[dict]:
+        """
+        Returns a list, ordered by total time descending, of the summary of calls per method and normalized
+        endpoint, i.e. the count, errors (HTTP status 400 or greater, or no status), total and percentile
+        (50th, 90th, 99th) and maximum latencies (seconds), and total bytes.
+        """
+        endpoints = {}
+        for record in self.records:
+            endpoints.setdefault((record["method"], normalize_endpoint(record["url"])), []).append(record)
+        summary = []
+        for (method, endpoint), records in endpoints.items():
+            latencies = sorted(record["latency"] for record in records)
+            summary.append({
+                "method": method,
+                "endpoint": endpoint,
+                "count": len(records),
+                "errors": len([record for record in records if not record["status"] or record["status"] >= 400]),
+                "total": sum(latencies),
+                "p50": _percentile(latencies, 50),
+                "p90": _percentile(latencies, 90),
+                "p99": _percentile(latencies, 99),
+                "max": latencies[-1],
+                "bytes": sum(record["bytes"] or 0 for record in records)
+            })
+        return sorted(summary, key=lambda item: item["total"], reverse=True)
+
+    def print_summary(self, printf: Callable = print, prefix: str = "DEBUG: ") -> None:
+        if not (summary := self.summary()):
+            printf(f"{prefix}HTTP calls: 0")
+            return
+        total_count = sum(item["count"] for item in summary)
+        total_time = sum(item["total"] for item in summary)
+        total_bytes = sum(item["bytes"] for item in summary)
+        printf(f"{prefix}HTTP calls: {total_count} | Time: {total_time:.3f}s | Bytes: {format_size(total_bytes)}")
+        endpoint_width = min(max(len(item["endpoint"]) for item in summary), 60)
+        printf(f"{prefix}{'METHOD':<6} {'ENDPOINT':<{endpoint_width}} {'COUNT':>6} {'ERRORS':>6}"
+               f" {'P50 ms':>8} {'P90 ms':>8} {'P99 ms':>8} {'MAX ms':>8} {'TOTAL s':>8} {'BYTES':>9}")
+        for item in summary:
+            endpoint = item["endpoint"]
+            if len(endpoint) > endpoint_width:
+                endpoint = endpoint[:endpoint_width - 3] + "..."
+            printf(f"{prefix}{item['method']:<6} {endpoint:<{endpoint_width}} {item['count']:>6} {item['errors']:>6}"
+                   f" {item['p50'] * 1000:>8.1f} {item['p90'] * 1000:>8.1f} {item['p99'] * 1000:>8.1f}"
+                   f" {item['max'] * 1000:>8.1f} {item['total']:>8.3f} {format_size(item['bytes']):>9}")
+
+    def dump(self, file: str) -> None:
+        """
+        Writes the (raw) trace records to the given file as NDJSON, i.e. one JSON object per line.
+        """
+        with open(file, "w") as f:
+            for record in self.records:
+                f.write(json.dumps({**record, "endpoint": normalize_endpoint(record["url"])}) + "\n")
+
+
+def start_http_trace(debug: bool = False, file: Optional[str] = None,
+                     printf: Optional[Callable] = None) -> Optional[HttpTrace]:
+    """
+    Starts tracing HTTP calls, if not already started; at exit the summary is printed (using the given printf)
+    if debug is True, and the raw trace is written to the given file as NDJSON if specified. Does nothing and
+    returns None if neither debug nor a file is specified; otherwise returns the (global) HttpTrace.
+    """
+    global _http_trace
+    if not (debug or file):
+        return None
+    if _http_trace is None:
+        _http_trace = HttpTrace()
+        add_http_listener(_http_trace)
+        def finish_http_trace() -> None:  # noqa
+            if debug and callable(printf):
+                _http_trace.print_summary(printf)
+            if file:
+                try:
+                    _http_trace.dump(file)
+                except Exception:
+                    pass
+        atexit.register(finish_http_trace)
+    return _http_trace
+
+
+def add_http_listener(listener: Callable[[dict], None]) -> None:
+    """
+    Adds the given listener to be called with the record of each HTTP call (see above).
+    """
+    with _listeners_lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+        _install_hook()
+
+
+def remove_http_listener(listener: Callable[[dict], None]) -> None:
+    with _listeners_lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def normalize_endpoint(url: str) -> str:
+    """
+    Returns the given URL, without its scheme and host, with identifying values templated out, e.g.
+    https://portal/Donor/SMAHT_DONOR_1?frame=raw -> /Donor/{id}?frame=raw; path segments which are uuids
+    are replaced by {uuid}, and those which look like identifiers, or follow a type name, by {id}; and query
+    parameter values are replaced by {value}, other than for a few (e.g. type and frame).
+    """
+    parsed = urlparse(url) if isinstance(url, str) else urlparse("")
+    segments = []
+    for index, segment in enumerate(parsed.path.split("/")):
+        if not segment:
+            segments.append(segment)
+        elif _UUID_REGEX.match(segment):
+            segments.append("{uuid}")
+        elif segment.isdigit() or _IDENTIFIER_REGEX.match(segment):
+            segments.append("{id}")
+        elif (index > 1) and _TYPE_NAME_REGEX.match(segments[index - 1]):
+            segments.append("{id}")
+        else:
+            segments.append(segment)
+    endpoint = "/".join(segments) or "/"
+    if query := parse_qsl(parsed.query, keep_blank_values=True):
+        parameters = {}
+        for name, value in query:
+            parameters.setdefault(name, set()).add(value if name in _QUERY_PARAMETERS_KEPT else "{value}")
+        endpoint += "?" + "&".join(f"{name}={value}" for name in sorted(parameters)
+                                   for value in sorted(parameters[name]))
+    return endpoint
+
+
+def _install_hook() -> None:
+    global _hook_installed
+    if _hook_installed:
+        return
+    import requests
+    session_request = requests.Session.request
+    def request(self, method: str, url: str, *args, **kwargs) -> Any:  # noqa
+        if not _listeners:
+            return session_request(self, method, url, *args, **kwargs)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = session_request(self, method, url, *args, **kwargs)
+            return response
+        finally:
+            record = {
+                "timestamp": time.time(),
+                "method": str(method).upper(),
+                "url": url,
+                "status": getattr(response, "status_code", None),
+                "latency": time.perf_counter() - started,
+                "bytes": _get_response_size(response, stream=kwargs.get("stream"))
+            }
+            for listener in list(_listeners):
+                try:
+                    listener(record)
+                except Exception:
+                    pass
+    requests.Session.request = request
+    _hook_installed = True
+
+
+def _get_response_size(response: Optional[object], stream: Optional[bool] = False) -> Optional[int]:
+    if response is None:
+        return None
+    try:
+        if not stream:
+            return len(response.content)
+        return int(response.headers.get("Content-Length"))
+    except Exception:
+        return None
+
+
+def _percentile(sorted_values: List[float], percentile: int) -> float:
+    # Nearest-rank percentile of the given (sorted, non-empty) values.
+    index = max(0, min(len(sorted_values) - 1, -(-len(sorted_values) * percentile // 100) - 1))
+    return sorted_values[index]
@@ -10,6 +10,7 @@ from dcicutils.data_readers import Excel
 from dcicutils.misc_utils import get_error_message, PRINT
 from dcicutils.portal_utils import Portal
 from dcicutils.tmpfile_utils import temporary_file
+from submitr.http_cache import cached_get
 from submitr.utils import chars, is_excel_file_name, print_boxed, remove_punctuation_and_space
 
 
@@ -59,7 +60,7 @@ def check_metadata_version(file: str, portal: Portal,
 @lru_cache(maxsize=1)
 def get_metadata_template_info_from_portal(portal: Portal) -> dict:
     try:
-        if ((metadata_template_info := portal.get("/submitr-metadata-template/version")) and
+        if ((metadata_template_info := cached_get(portal, "/submitr-metadata-template/version")) and
             (metadata_template_info.status_code == 200) and
             (metadata_template_info := metadata_template_info.json())):  # noqa
             return metadata_template_info
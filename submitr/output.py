@@ -1,10 +1,13 @@
 from __future__ import annotations
+import atexit
 from datetime import datetime
+import gzip
 import io
 import os
 import pkg_resources
 import sys
-from typing import Callable, Optional, Tuple
+import threading
+from typing import Callable, List, Optional, TextIO, Tuple
 from dcicutils.command_utils import yes_or_no
 from dcicutils.misc_utils import PRINT as __PRINT
 from submitr.utils import show as __show
@@ -28,10 +31,78 @@ SHOW = _show
 ERASE_LINE = "\033[K"
 
 _OUTPUT_FILE = None
+_OUTPUT_FILE_WRITER = None
+_OUTPUT_FILE_FLUSH_INTERVAL = 1.0  # seconds
+_OUTPUT_FILE_BUFFER_SIZE = 64 * 1024  # characters
+
+# Output to the output file (i.e. the --output option) is buffered, rather than opening, writing, and
+# closing the file for each line (which dominates the run time when e.g. there are tens of thousands of
+# validation errors, particularly with network file systems); the file is kept open, and the buffered
+# output is written in order, by a background thread every _OUTPUT_FILE_FLUSH_INTERVAL seconds, or
+# directly when the buffer exceeds _OUTPUT_FILE_BUFFER_SIZE, and at exit (including on interrupt,
+# e.g. Ctrl-C, and sys.exit). If the output file name ends with .gz its output is gzip compressed.
+
+
+class OutputFileWriter:
+
+    def __init__(self, file: str,
+                 flush_interval: float = _OUTPUT_FILE_FLUSH_INTERVAL,
+                 buffer_size: int = _OUTPUT_FILE_BUFFER_SIZE) -> None:
+        self._file = file
+        self._flush_interval = flush_interval
+        self._buffer_size = buffer_size
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._handle: Optional[TextIO] = gzip.open(file, "at") if file.endswith(".gz") else io.open(file, "a")
+        self._thread = threading.Thread(target=self._flush_periodically, daemon=True)
+        self._thread.start()
+
+    @property
+    def file(self) -> str:
+        return self._file
+
+    def write(self, string: str) -> None:
+        with self._lock:
+            if self._handle is None:
+                return
+            self._buffer.append(string)
+            self._buffered += len(string)
+            if self._buffered >= self._buffer_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        self._stopped.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        with self._lock:
+            self._flush()
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _flush(self) -> None:
+        if self._buffer and (self._handle is not None):
+            self._handle.write("".join(self._buffer))
+            self._handle.flush()
+        self._buffer = []
+        self._buffered = 0
+
+    def _flush_periodically(self) -> None:
+        while not self._stopped.wait(self._flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass
 
 
 def setup_for_output_file_option(output_file: str) -> Tuple[Callable, Callable, Callable, Callable]:
-    global SHOW, PRINT, PRINT_STDOUT, PRINT_OUTPUT, _OUTPUT_FILE
+    global SHOW, PRINT, PRINT_STDOUT, PRINT_OUTPUT, _OUTPUT_FILE, _OUTPUT_FILE_WRITER
     if os.path.exists(output_file):
         PRINT(f"Output file already exists: {output_file}")
         if not yes_or_no("Overwrite this file?"):
@@ -40,12 +111,12 @@ def setup_for_output_file_option(output_file: str) -> Tuple[Callable, Callable,
             pass
     _OUTPUT_FILE = output_file  # Assuming this is only called once/globally
     PRINT(f"Logging to output file: {output_file}")
+    close_output_file()
+    _OUTPUT_FILE_WRITER = output_file_writer = OutputFileWriter(output_file)
     def append_to_output_file(*args):  # noqa
         string = io.StringIO()
         __PRINT(*args, file=string)
-        with io.open(output_file, "a") as f:
-            f.write(string.getvalue())
-            f.flush()
+        output_file_writer.write(string.getvalue())
     def show_and_output_to_file(*args, **kwargs):  # noqa
         append_to_output_file(*args)
         _show(*args, **kwargs)
@@ -73,6 +144,19 @@ def get_output_file() -> Optional[str]:
     return _OUTPUT_FILE
 
 
+def flush_output_file() -> None:
+    if _OUTPUT_FILE_WRITER is not None:
+        _OUTPUT_FILE_WRITER.flush()
+
+
+@atexit.register
+def close_output_file() -> None:
+    global _OUTPUT_FILE_WRITER
+    if _OUTPUT_FILE_WRITER is not None:
+        output_file_writer, _OUTPUT_FILE_WRITER = _OUTPUT_FILE_WRITER, None
+        output_file_writer.close()
+
+
 def get_version() -> str:
     try:
         return pkg_resources.get_distribution("smaht-submitr").version
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from boto3 import client as BotoClient
 import configparser
 import os
 from typing import Optional, Tuple
@@ -79,6 +78,7 @@ class AmazonCredentials:
     def account_number(self) -> Optional[str]:
         if not self._account_number:
             try:
+                from boto3 import client as BotoClient  # deferred; slow to import
                 iam = BotoClient("iam",
                                  region_name=self.region,
                                  aws_access_key_id=self.access_key_id,
@@ -121,6 +121,7 @@ class AmazonCredentials:
 
     def ping(self) -> bool:
         try:
+            from boto3 import client as BotoClient  # deferred; slow to import
             sts = BotoClient("sts",
                              region_name=self.region,
                              aws_access_key_id=self.access_key_id,
@@ -1,5 +1,4 @@
 from __future__ import annotations
-from google.cloud.storage import Client as GcsClient
 import os
 import requests
 from typing import Optional
@@ -40,6 +39,7 @@ class GoogleCredentials:
 
     def ping(self) -> bool:
         try:
+            from google.cloud.storage import Client as GcsClient  # deferred; slow to import
             if GoogleCredentials.is_google_compute_engine():
                 client = GcsClient()
             else:
@@ -6,6 +6,7 @@ from typing import Callable, List, Optional, Tuple, Union
 from dcicutils.datetime_utils import format_datetime, parse_datetime
 from dcicutils.misc_utils import normalize_string
 from submitr.rclone.rclone_installation import RCloneInstallation
+from submitr.run_metrics import COUNTER_RCLONE_INVOCATIONS, run_metrics
 from submitr.utils import DEBUG
 
 
@@ -92,6 +93,7 @@ class RCloneCommands:
             # Note the preexec_fn argument here, which is essential to ensure that a
             # keyboard interrupt (CTRL-C), e.g. which we handle for file uploads ourselves
             # in s3_upload, is not passed on to this rclone child subprocess thus killing it.
+            run_metrics.increment(COUNTER_RCLONE_INVOCATIONS)
             process = subprocess.Popen(command, universal_newlines=True,
                                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
                                        preexec_fn=os.setsid)
@@ -266,6 +268,7 @@ class RCloneCommands:
     @staticmethod
     def _execute(command: List[str]) -> subprocess.CompletedProcess:
         DEBUG(f"RCLONE-COMMAND: {' '.join(command)}")
+        run_metrics.increment(COUNTER_RCLONE_INVOCATIONS)
         result = subprocess.run(command, capture_output=True, universal_newlines=True)
         DEBUG(f"RCLONE-COMMAND-OUTPUT: {normalize_string(result.stdout)}")
         DEBUG(f"RCLONE-COMMAND-RESULT: {result.returncode}")
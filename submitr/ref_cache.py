@@ -0,0 +1,86 @@
+import os
+from typing import Optional
+from dcicutils.misc_utils import to_integer
+from submitr.disk_cache import DiskCache
+
+# Persistent (on-disk) cache, across runs, of positive reference lookups done via the portal during
+# (client-side) validation, i.e. the uuid of each successfully resolved reference path (e.g. /Donor/SOME-DONOR),
+# keyed by portal server and path, so that the thousands of identical references (e.g. to Sequencer, Software,
+# Donor items) in typical submissions need not be resolved against the portal on every run. Only positive
+# results are cached (a not-found reference may be created at any time); entries expire after the number of
+# seconds specified by the SUBMITR_REF_CACHE_TTL environment variable (default ten minutes, i.e. enough for
+# repeated validation runs of the same file while working on it; zero disables this cache entirely). This is
+# installed on the portal object passed to StructuredDataSet (see install_ref_cache), wrapping its ref_lookup
+# method; it is bypassed by the --ref-nocache option, and may be invalidated via the clear-submitr-cache
+# command (see clear_ref_cache).
+
+_REF_CACHE_NAME = "refs"
+_REF_CACHE_TTL = to_integer(os.environ.get("SUBMITR_REF_CACHE_TTL"), fallback=None)
+_REF_CACHE_TTL = 10 * 60 if _REF_CACHE_TTL is None else _REF_CACHE_TTL  # seconds
+_REF_CACHE_HIT_COUNT_PROPERTY = "ref_disk_cache_hit_count"
+
+_ref_cache = None
+
+
+def install_ref_cache(portal: object, cache: Optional[DiskCache] = None) -> bool:
+    """
+    Arranges for reference lookups via the given (structured_data) portal object to be served from,
+    and positive results saved to, the persistent reference cache. Returns True if installed, or False
+    if the cache is disabled (see SUBMITR_REF_CACHE_TTL). The number of lookups served from the
+    cache is available via the ref_disk_cache_hit_count attribute of the portal object.
+    """
+    if cache is None and (cache := _get_ref_cache()) is None:
+        return False
+    if not (portal and callable(ref_lookup := getattr(portal, "ref_lookup", None))):
+        return False
+    server = getattr(portal, "server", None) or ""
+    setattr(portal, _REF_CACHE_HIT_COUNT_PROPERTY, 0)
+    def ref_lookup_disk_cached(path: str) -> Optional[dict]:  # noqa
+        key = _ref_cache_key(server, path)
+        if isinstance(uuid := cache.get(key), str):
+            setattr(portal, _REF_CACHE_HIT_COUNT_PROPERTY, getattr(portal, _REF_CACHE_HIT_COUNT_PROPERTY, 0) + 1)
+            return {"uuid": uuid}
+        if isinstance(resolved := ref_lookup(path), dict) and isinstance(uuid := resolved.get("uuid"), str):
+            cache.set(key, uuid)
+        return resolved
+    portal.ref_lookup = ref_lookup_disk_cached
+    return True
+
+
+def is_ref_cached(server: str, path: str, cache: Optional[DiskCache] = None) -> bool:
+    """
+    Returns True if the given reference path for the given portal server is in the persistent reference cache.
+    """
+    if cache is None and (cache := _get_ref_cache()) is None:
+        return False
+    return isinstance(cache.get(_ref_cache_key(server or "", path)), str)
+
+
+def clear_ref_cache(server: Optional[str] = None, cache: Optional[DiskCache] = None) -> int:
+    """
+    Removes all entries from the persistent reference cache, or only those for the given portal
+    server if specified; returns the number of entries removed.
+    """
+    if cache is None:
+        cache = _get_ref_cache() or DiskCache(_REF_CACHE_NAME)
+    if not server:
+        nentries = len(cache)
+        cache.clear()
+        return nentries
+    prefix = _ref_cache_key(server, "")
+    keys = [key for key in cache.keys() if key.startswith(prefix)]
+    for key in keys:
+        cache.delete(key)
+    cache.save()
+    return len(keys)
+
+
+def _ref_cache_key(server: str, path: str) -> str:
+    return f"{server.rstrip('/')}|{path}"
+
+
+def _get_ref_cache() -> Optional[DiskCache]:
+    global _ref_cache
+    if _ref_cache is None and _REF_CACHE_TTL > 0:
+        _ref_cache = DiskCache(_REF_CACHE_NAME, ttl=_REF_CACHE_TTL)
+    return _ref_cache
@@ -0,0 +1,272 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import re
+from typing import Any, Dict, Generator, List, Optional, Tuple, Type
+from urllib.parse import quote
+from dcicutils import ff_utils
+from dcicutils.misc_utils import to_integer
+from dcicutils.structured_data import Schema
+from submitr.ref_cache import is_ref_cached
+from submitr.streaming_excel import StreamingExcel
+
+# Bulk resolution of reference (linkTo) paths, e.g. /Donor/SOME-DONOR, against the portal; rather than
+# one GET per distinct path, the paths are grouped by type and resolved with paged multi-value searches,
+# e.g. /search/?type=Donor&submitted_id=A&submitted_id=B..., (up to _REFS_PER_PORTAL_QUERY values per page),
+# one identifying property (of the type) at a time, only searching values which can possibly match it
+# (i.e. which match its pattern, if any); the pages are run concurrently (SUBMITR_REF_RESOLVER_THREADS).
+# Any path not found this way is simply not resolved here, i.e. callers should fall back to the usual
+# (per-path) lookup for such paths, which also handles e.g. lookup by root path (i.e. /SOME-DONOR).
+#
+# For (client-side) validation, see RefPrefetcher, which collects the referenced values from the rows of the
+# (Excel) metadata file as they are read by StructuredDataSet, i.e. during its (usual) parse, a batch of rows
+# at a time, bulk resolves these, and arranges for the (per-path) reference lookups of the portal object of the
+# StructuredDataSet to be served from these results; so no additional pass over the file is needed for this.
+
+_REFS_PER_PORTAL_QUERY = 100
+_REFS_PREFETCH_ROWS = 1000
+_REF_RESOLVER_NTHREADS = to_integer(os.environ.get("SUBMITR_REF_RESOLVER_THREADS"), fallback=4) or 1
+_UUID_REGEX = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+_DEFAULT_IDENTIFYING_PROPERTIES = ["identifier"]
+
+
+def resolve_refs(portal: object, paths: List[str], nthreads: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Returns a dictionary of the uuids of the given reference paths (e.g. /Donor/SOME-DONOR), resolved
+    via paged multi-value portal searches; the uuid for any path which was not found is None.
+    """
+    refs = {}
+    for path in paths:
+        if (type_and_value := _get_type_and_value(path)) and (path not in refs):
+            refs[path] = type_and_value
+    resolved = {path: None for path in refs}
+    if not refs or not (portal_key := getattr(portal, "key", None)):
+        return resolved
+    unresolved_values_by_type = {}
+    for path, (type_name, value) in refs.items():
+        unresolved_values_by_type.setdefault(type_name, set()).add(value)
+    identifying_properties_by_type = {
+        type_name: _get_identifying_properties(portal, type_name) for type_name in unresolved_values_by_type
+    }
+    # Each round searches (concurrently) the next identifying property of each type,
+    # for any values of that type which are still unresolved (and which can possibly match).
+    while queries := _get_next_queries(unresolved_values_by_type, identifying_properties_by_type):
+        if (nthreads := nthreads or _REF_RESOLVER_NTHREADS) > 1 and len(queries) > 1:
+            with ThreadPoolExecutor(max_workers=min(nthreads, len(queries))) as executor:
+                results = list(executor.map(lambda query: _search_refs(*query, portal_key), queries))
+        else:
+            results = [_search_refs(*query, portal_key) for query in queries]
+        for (type_name, _, _), found in zip(queries, results):
+            for value, uuid in found.items():
+                resolved[f"/{type_name}/{value}"] = uuid
+                unresolved_values_by_type[type_name].discard(value)
+    return resolved
+
+
+class RefPrefetcher:
+    """
+    Bulk resolves (see resolve_refs) the references (linkTo values) of a metadata (Excel) file as its rows
+    are read by StructuredDataSet, i.e. during its usual parse of the file, a batch of rows at a time just before
+    these are processed; and serves the (per-path) reference lookups (ref_lookup) of the (structured_data) portal
+    object from these results. Pass its excel_class as the excel_class to StructuredDataSet, and call install
+    with the portal object of the StructuredDataSet before loading the file. References which are not
+    found (or are already cached; see ref_cache) are left to the usual (per-path) lookup.
+    """
+
+    def __init__(self, excel_class: Type = StreamingExcel) -> None:
+        self._excel_class = _define_ref_prefetching_excel_class(excel_class, self)
+        self._portal = None
+        self._server = ""
+        self._resolved = {}
+        self._searched = set()
+        self._internal_values = set()
+        self._types = {}
+
+    @property
+    def excel_class(self) -> Type:
+        return self._excel_class
+
+    @property
+    def count(self) -> int:
+        return len(self._resolved)
+
+    def install(self, portal: object) -> bool:
+        """
+        Arranges for reference lookups via the given (structured_data) portal object to be served from the
+        references bulk resolved from the rows read (see prefetch); returns True if installed, otherwise False.
+        """
+        if not (portal and callable(ref_lookup := getattr(portal, "ref_lookup", None))):
+            return False
+        self._portal = portal
+        self._server = getattr(portal, "server", None) or ""
+        resolved = self._resolved
+        def ref_lookup_prefetched(path: str) -> Optional[dict]:  # noqa
+            if uuid := resolved.get(path):
+                return {"uuid": uuid}
+            return ref_lookup(path)
+        portal.ref_lookup = ref_lookup_prefetched
+        return True
+
+    def prefetch(self, type_name: str, rows: List[dict]) -> None:
+        """
+        Bulk resolves the distinct references in the given rows (of column values) of the given type,
+        which were not already searched for, nor are cached, excluding any values which are identifying
+        property values of items read so far (i.e. likely internal references); best-effort.
+        """
+        if not (self._portal and rows):
+            return
+        try:
+            paths = [path for path in self._collect_refs(type_name, rows)
+                     if (path not in self._searched) and not is_ref_cached(self._server, path)]
+            if paths:
+                self._searched.update(paths)
+                self._resolved.update({path: uuid for path, uuid in resolve_refs(self._portal, paths).items() if uuid})
+        except Exception:
+            pass
+
+    def _collect_refs(self, type_name: str, rows: List[dict]) -> List[str]:
+        if type_name not in self._types:
+            if schema := self._portal.get_schema(type_name):
+                identifying_properties = {name for name, _ in _get_identifying_properties(self._portal, type_name)}
+                self._types[type_name] = (schema.get("properties") or {}), identifying_properties
+            else:
+                self._types[type_name] = None
+        if not (schema_info := self._types[type_name]):
+            return []
+        properties, identifying_properties = schema_info
+        refs = {}
+        for row in rows:
+            for column, value in row.items():
+                if value is None or (value := str(value).strip()) == "":
+                    continue
+                property_name = re.split(r"[.#]", column, maxsplit=1)[0]
+                if property_name in identifying_properties:
+                    self._internal_values.add(value)
+                if link_to := _get_link_to(properties.get(property_name)):
+                    for ref_value in ([item.strip() for item in value.split("|")] if link_to[1] else [value]):
+                        if ref_value:
+                            refs[f"/{link_to[0]}/{ref_value}"] = ref_value
+        return [path for path, value in refs.items() if value not in self._internal_values]
+
+
+class _RefPrefetchingSheetReader:
+    """
+    Wraps the given sheet reader, reading ahead (up to) _REFS_PREFETCH_ROWS rows at a time, and having
+    the references of these resolved in bulk (see RefPrefetcher.prefetch) before yielding them.
+    """
+
+    def __init__(self, reader: object, type_name: str, prefetcher: RefPrefetcher) -> None:
+        self._reader = reader
+        self._type_name = type_name
+        self._prefetcher = prefetcher
+        self.row_number = reader.row_number
+
+    def __iter__(self) -> Generator[dict, None, None]:
+        rows = []
+        for row in self._reader:
+            rows.append((self._reader.row_number, row))
+            if len(rows) >= _REFS_PREFETCH_ROWS:
+                yield from self._prefetched(rows)
+                rows = []
+        yield from self._prefetched(rows)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._reader, name)
+
+    def _prefetched(self, rows: List[Tuple[int, dict]]) -> Generator[dict, None, None]:
+        self._prefetcher.prefetch(self._type_name, [row for _, row in rows])
+        for self.row_number, row in rows:
+            yield row
+
+
+def _define_ref_prefetching_excel_class(excel_class: Type, prefetcher: RefPrefetcher) -> Type:
+    class _RefPrefetchingExcel(excel_class):
+        def sheet_reader(self, sheet_name: str) -> _RefPrefetchingSheetReader:
+            type_name = Schema.type_name(self.effective_sheet_name(sheet_name))
+            return _RefPrefetchingSheetReader(super().sheet_reader(sheet_name), type_name, prefetcher)
+    _RefPrefetchingExcel.__name__ = excel_class.__name__
+    _RefPrefetchingExcel.__qualname__ = excel_class.__qualname__
+    return _RefPrefetchingExcel
+
+
+def _get_next_queries(unresolved_values_by_type: Dict[str, set],
+                      identifying_properties_by_type: Dict[str, List[Tuple[str, Optional[str]]]]) -> List[tuple]:
+    queries = []
+    for type_name, values in unresolved_values_by_type.items():
+        identifying_properties = identifying_properties_by_type[type_name]
+        while values and identifying_properties:
+            property_name, pattern = identifying_properties.pop(0)
+            if property_name == "uuid":
+                candidate_values = [value for value in values if _UUID_REGEX.match(value)]
+            elif pattern:
+                candidate_values = [value for value in values if _matches_pattern(pattern, value)]
+            else:
+                candidate_values = list(values)
+            if candidate_values := sorted(candidate_values):
+                for i in range(0, len(candidate_values), _REFS_PER_PORTAL_QUERY):
+                    queries.append((type_name, property_name, candidate_values[i:i + _REFS_PER_PORTAL_QUERY]))
+                break
+    return queries
+
+
+def _search_refs(type_name: str, property_name: str, values: List[str], portal_key: dict) -> Dict[str, str]:
+    query = (f"/search/?type={type_name}" + "".join(f"&{property_name}={quote(value)}" for value in values) +
+             f"&field=uuid&field={property_name}")
+    try:
+        items = ff_utils.search_metadata(query, portal_key)
+    except Exception:
+        return {}
+    found = {}
+    values = set(values)
+    for item in items or []:
+        if isinstance(item, dict) and isinstance(uuid := item.get("uuid"), str):
+            item_values = item.get(property_name)
+            for item_value in (item_values if isinstance(item_values, list) else [item_values]):
+                if isinstance(item_value, str) and item_value in values:
+                    found[item_value] = uuid
+    return found
+
+
+def _get_identifying_properties(portal: object, type_name: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Returns the list of identifying properties for the given type, as tuples of the property name and its
+    pattern (if any); any uuid property is put last, as values rarely are uuids and these are checked anyway.
+    """
+    try:
+        schema = portal.get_schema(type_name) or {}
+    except Exception:
+        schema = {}
+    properties = schema.get("properties") or {}
+    result = []
+    for property_name in (schema.get("identifyingProperties") or _DEFAULT_IDENTIFYING_PROPERTIES):
+        property_schema = properties.get(property_name) or {}
+        if property_schema.get("type") == "array":
+            property_schema = property_schema.get("items") or {}
+        result.append((property_name, property_schema.get("pattern")))
+    return sorted(result, key=lambda item: item[0] == "uuid")
+
+
+def _get_link_to(property_schema: Optional[dict]) -> Optional[Tuple[str, bool]]:
+    """
+    Returns a tuple of the type to which the given (top-level) property schema refers, if it is a reference,
+    or an array of references, and a boolean indicating if it is an array; otherwise returns None.
+    """
+    if isinstance(property_schema, dict):
+        if link_to := property_schema.get("linkTo"):
+            return link_to, False
+        if (property_schema.get("type") == "array") and isinstance(items := property_schema.get("items"), dict):
+            if link_to := items.get("linkTo"):
+                return link_to, True
+    return None
+
+
+def _get_type_and_value(path: str) -> Optional[Tuple[str, str]]:
+    if isinstance(path, str) and (len(parts := path.strip("/").split("/", 1)) == 2) and all(parts):
+        return parts[0], parts[1]
+    return None
+
+
+def _matches_pattern(pattern: str, value: str) -> bool:
+    try:
+        return re.search(pattern, value) is not None
+    except Exception:
+        return True
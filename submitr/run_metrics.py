@@ -0,0 +1,263 @@
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Union
+from urllib.parse import urlparse
+
+# Run metrics for submitr commands, e.g. for visibility into where the time goes when run under cron.
+# Covers the duration of the run and of each of its phases (portal setup, parse, validate, analyze,
+# server validation, ingestion, uploads), the bytes uploaded and the achieved upload throughput, the
+# number of retries, portal (HTTP) requests, and rclone invocations. These are written at the end of
+# the (outermost) command run, i.e. submit_any_ingestion, resume_uploads, or _monitor_ingestion_process,
+# including when it exits via sys.exit, to the file(s) specified by the --metrics option, or otherwise
+# by the SUBMITR_METRICS_FILE environment variable (comma-separated for more than one); a file name
+# ending with .prom is written in OpenMetrics text format, e.g. for the node_exporter textfile collector,
+# and any other file name as a JSON summary. Files are written atomically (via rename), as node_exporter
+# requires. If no metrics file is specified then nothing is collected beyond some simple counting.
+
+_METRICS_FILE_ENVIRONMENT_VARIABLE = "SUBMITR_METRICS_FILE"
+_METRICS_PREFIX = "submitr"
+_OPENMETRICS_SUFFIX = ".prom"
+
+PHASE_PORTAL_SETUP = "portal_setup"
+PHASE_PARSE = "parse"
+PHASE_VALIDATE = "validate"
+PHASE_ANALYZE = "analyze"
+PHASE_SERVER_VALIDATION = "server_validation"
+PHASE_INGESTION = "ingestion"
+PHASE_UPLOADS = "uploads"
+
+COUNTER_UPLOADED_BYTES = "uploaded_bytes"
+COUNTER_UPLOADED_FILES = "uploaded_files"
+COUNTER_UPLOAD_SECONDS = "upload_seconds"
+COUNTER_RETRIES = "retries"
+COUNTER_RCLONE_INVOCATIONS = "rclone_invocations"
+
+
+class RunMetrics:
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, command: Optional[str] = None) -> None:
+        with self._lock:
+            self._command = command
+            self._server = None
+            self._started = time.time()
+            self._duration = None
+            self._exit_code = None
+            self._phases = {}
+            self._phases_started = {}
+            self._counters = {}
+            self._requests_by_host = {}
+
+    @property
+    def command(self) -> Optional[str]:
+        return self._command
+
+    def set_server(self, server: Optional[str]) -> None:
+        self._server = server
+
+    def begin_phase(self, name: str) -> None:
+        with self._lock:
+            self._phases_started.setdefault(name, time.monotonic())
+
+    def end_phase(self, name: str) -> None:
+        with self._lock:
+            if (started := self._phases_started.pop(name, None)) is not None:
+                self._phases[name] = self._phases.get(name, 0) + time.monotonic() - started
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Context manager to time the given phase; the time for the same phase is accumulated.
+        """
+        self.begin_phase(name)
+        try:
+            yield
+        finally:
+            self.end_phase(name)
+
+    def phase_duration(self, name: str) -> Optional[float]:
+        return self._phases.get(name)
+
+    def increment(self, name: str, value: Union[int, float] = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name: str) -> Union[int, float]:
+        return self._counters.get(name, 0)
+
+    def note_request(self, url: str) -> None:
+        host = urlparse(url).netloc if isinstance(url, str) else ""
+        with self._lock:
+            self._requests_by_host[host] = self._requests_by_host.get(host, 0) + 1
+
+    @property
+    def portal_requests(self) -> int:
+        if not (self._server and (host := urlparse(self._server).netloc)):
+            return 0
+        return self._requests_by_host.get(host, 0)
+
+    def finish(self, exit_code: Optional[int] = None) -> None:
+        for name in list(self._phases_started):
+            self.end_phase(name)
+        self._duration = time.time() - self._started
+        self._exit_code = exit_code
+
+    def to_dict(self) -> Dict[str, Any]:
+        uploaded_bytes = self.counter(COUNTER_UPLOADED_BYTES)
+        upload_seconds = self.counter(COUNTER_UPLOAD_SECONDS)
+        return {
+            "command": self._command,
+            "server": self._server,
+            "started": datetime.fromtimestamp(self._started, timezone.utc).isoformat(timespec="seconds"),
+            "duration": _round(self._duration),
+            "exit_code": self._exit_code,
+            "phases": {name: _round(duration) for name, duration in self._phases.items()},
+            "uploaded_files": self.counter(COUNTER_UPLOADED_FILES),
+            "uploaded_bytes": uploaded_bytes,
+            "upload_throughput": _round(uploaded_bytes / upload_seconds) if upload_seconds > 0 else None,
+            "retries": self.counter(COUNTER_RETRIES),
+            "portal_requests": self.portal_requests,
+            "rclone_invocations": self.counter(COUNTER_RCLONE_INVOCATIONS)
+        }
+
+    def to_openmetrics(self) -> str:
+        metrics = self.to_dict()
+        labels = {"command": metrics["command"] or ""}
+        lines = []
+        def add(name: str, value: Any, description: str, unit: Optional[str] = None,  # noqa
+                extra_labels: Optional[List[tuple]] = None) -> None:
+            if value is None and not extra_labels:
+                return
+            name = f"{_METRICS_PREFIX}_{name}"
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            if unit:
+                lines.append(f"# UNIT {name} {unit}")
+            for value_labels, value in (extra_labels or [({}, value)]):
+                lines.append(f"{name}{_format_labels({**labels, **value_labels})} {_format_value(value)}")
+        add("run_start_seconds", self._started, "Start time of the run since the epoch.", "seconds")
+        add("run_duration_seconds", metrics["duration"], "Duration of the run.", "seconds")
+        add("run_exit_code", metrics["exit_code"], "Exit code of the run.")
+        add("phase_duration_seconds", None, "Duration of each phase of the run.", "seconds",
+            extra_labels=[({"phase": name}, duration) for name, duration in metrics["phases"].items()])
+        add("uploaded_files", metrics["uploaded_files"], "Number of files uploaded.")
+        add("uploaded_bytes", metrics["uploaded_bytes"], "Number of bytes uploaded.", "bytes")
+        add("upload_throughput_bytes_per_second", metrics["upload_throughput"], "Achieved upload throughput.")
+        add("retries", metrics["retries"], "Number of retried portal requests.")
+        add("portal_requests", metrics["portal_requests"], "Number of portal (HTTP) requests.")
+        add("rclone_invocations", metrics["rclone_invocations"], "Number of rclone invocations.")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self, file: str) -> None:
+        if file.endswith(_OPENMETRICS_SUFFIX):
+            content = self.to_openmetrics()
+        else:
+            content = json.dumps(self.to_dict(), indent=4) + "\n"
+        if directory := os.path.dirname(file):
+            os.makedirs(directory, exist_ok=True)
+        temporary_file = f"{file}.{os.getpid()}.tmp"
+        with open(temporary_file, "w") as f:
+            f.write(content)
+        os.replace(temporary_file, file)
+
+
+run_metrics = RunMetrics()
+
+_metrics_files = None
+_command_depth = 0
+_request_counter_installed = False
+
+
+def set_run_metrics_files(files: Optional[Union[str, List[str]]]) -> None:
+    """
+    Sets the file(s) to which the run metrics are written, i.e. from the --metrics option;
+    this overrides the SUBMITR_METRICS_FILE environment variable.
+    """
+    global _metrics_files
+    if isinstance(files, str):
+        files = files.split(",")
+    _metrics_files = [file.strip() for file in files if file.strip()] if isinstance(files, list) else None
+
+
+def get_run_metrics_files() -> List[str]:
+    if _metrics_files is not None:
+        return _metrics_files
+    files = os.environ.get(_METRICS_FILE_ENVIRONMENT_VARIABLE) or ""
+    return [file.strip() for file in files.split(",") if file.strip()]
+
+
+def run_metrics_command(command: str) -> Callable:
+    """
+    Decorator for a (top-level) submitr command function, which collects run metrics (if enabled)
+    and writes them when it finishes, even if via sys.exit or an exception; if the function is called
+    from within another such function (e.g. _monitor_ingestion_process from submit_any_ingestion)
+    then its metrics are just collected as part of the outer one.
+    """
+    def decorator(f: Callable) -> Callable:
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs) -> Any:
+            global _command_depth
+            if (_command_depth := _command_depth + 1) > 1:
+                try:
+                    return f(*args, **kwargs)
+                finally:
+                    _command_depth -= 1
+            run_metrics.reset(command)
+            if files := get_run_metrics_files():
+                _install_request_counter()
+            exit_code = 0
+            try:
+                return f(*args, **kwargs)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                raise
+            except BaseException:
+                exit_code = 1
+                raise
+            finally:
+                _command_depth -= 1
+                if files:
+                    run_metrics.finish(exit_code)
+                    for file in files:
+                        try:
+                            run_metrics.write(file)
+                        except Exception:
+                            pass
+        return wrapper
+    return decorator
+
+
+def _install_request_counter() -> None:
+    """
+    Counts all HTTP requests made via the requests package (which is what dcicutils uses for portal
+    requests, i.e. via Portal and ff_utils); those to the portal server are reported as portal requests.
+    """
+    global _request_counter_installed
+    if _request_counter_installed:
+        return
+    from submitr.http_tracer import add_http_listener
+    add_http_listener(lambda record: run_metrics.note_request(record["url"]))
+    _request_counter_installed = True
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    def escape(value: str) -> str:  # noqa
+        return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+    return ("{" + ",".join(f"{name}=\"{escape(value)}\"" for name, value in labels.items()) + "}") if labels else ""
+
+
+def _format_value(value: Union[int, float]) -> str:
+    return str(value) if isinstance(value, int) else f"{value:.6f}".rstrip("0").rstrip(".")
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if isinstance(value, (int, float)) else None
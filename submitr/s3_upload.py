@@ -1,4 +1,3 @@
-from boto3 import client as BotoClient
 from collections import namedtuple
 import os
 import signal
@@ -12,6 +11,9 @@ from dcicutils.progress_bar import ProgressBar
 from dcicutils.structured_data import Portal
 from submitr.file_for_upload import FileForUpload
 from submitr.rclone import AmazonCredentials, RCloner, RCloneAmazon, cloud_path
+from submitr.run_metrics import (
+    COUNTER_UPLOADED_BYTES, COUNTER_UPLOADED_FILES, COUNTER_UPLOAD_SECONDS, run_metrics
+)
 from submitr.s3_utils import get_s3_bucket_and_key_from_s3_uri, get_s3_key_metadata
 from submitr.utils import chars
 
@@ -293,6 +295,7 @@ def upload_file_to_aws_s3(file: FileForUpload,
         return False
 
     upload_aborted = False
+    upload_started = current_timestamp()
     rclone_subprocess_info = {}
     if rcloner:
         upload_file_callback = define_upload_file_callback(progress_total_nbytes=True)
@@ -317,6 +320,7 @@ def upload_file_to_aws_s3(file: FileForUpload,
             printf(f"Upload ABORTED: {file.path_cloud} {chars.larrow}")
             upload_aborted = True
     else:
+        from boto3 import client as BotoClient  # deferred; slow to import
         upload_file_callback = define_upload_file_callback(progress_total_nbytes=False)
         s3 = BotoClient("s3", **aws_credentials)
         aws_extra_args = {**aws_kms_args}
@@ -336,6 +340,11 @@ def upload_file_to_aws_s3(file: FileForUpload,
 
     upload_file_callback.done()
 
+    if not upload_aborted:
+        run_metrics.increment(COUNTER_UPLOADED_FILES)
+        run_metrics.increment(COUNTER_UPLOADED_BYTES, file_size or 0)
+        run_metrics.increment(COUNTER_UPLOAD_SECONDS, current_timestamp() - upload_started)
+
     if not upload_aborted and verify_upload:
         verify_uploaded_file()
 
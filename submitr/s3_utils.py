@@ -1,5 +1,4 @@
 from base64 import b64decode as base64_decode
-from boto3 import client as BotoClient
 import re
 from typing import Optional, Tuple
 from submitr.utils import format_datetime
@@ -13,6 +12,7 @@ def get_s3_key_metadata(aws_credentials: dict, s3_bucket: str, s3_key: str, stri
             isinstance(s3_key, str) and s3_key):
         return None
     try:
+        from boto3 import client as BotoClient  # deferred; slow to import
         # Note that we do not need to use any KMS key for head_object.
         s3 = BotoClient("s3", **aws_credentials)
         if not isinstance(s3_file_head := s3.head_object(Bucket=s3_bucket, Key=s3_key), dict):
@@ -0,0 +1,110 @@
+from datetime import datetime, timezone
+import gzip
+import json
+import os
+from typing import Optional
+from urllib.parse import urlparse
+from submitr.disk_cache import get_cache_directory
+
+# Support for a local (compressed, versioned) bundle of all of the schemas of a portal, i.e. its /profiles/
+# response, for (client-side) validation without fetching the schemas from the portal on each run; and for
+# validation of schema-only checks on hosts without (or with limited) network access. A bundle is a gzipped
+# JSON file containing the schemas, the portal server, and the portal version at the time it was created;
+# by default the bundle for a portal is stored in the cache directory (see disk_cache) and is named for
+# the portal server host. The bundle is automatically refreshed (i.e. downloaded again) when the (project)
+# version of the portal differs from that of the bundle; if the portal version cannot be determined (e.g. no
+# network access) then the existing bundle is used as-is. See the get-schema-bundle command, and the
+# --schema-bundle option of submit-metadata-bundle.
+
+_SCHEMA_BUNDLE_FORMAT_VERSION = 1
+_SCHEMA_BUNDLE_DIRECTORY_NAME = "schemas"
+_SCHEMA_BUNDLE_SUFFIX = ".json.gz"
+
+
+def get_schema_bundle(portal: object, file: Optional[str] = None, refresh: bool = True) -> Optional[dict]:
+    """
+    Returns the schemas for the given portal from the given schema bundle file, or from the default
+    one for the portal server if not specified; if refresh is True and the portal version differs from
+    that of the bundle, or if the bundle does not exist, then the schemas are (first) downloaded from the
+    portal and (re)written to the bundle. Returns None if no schemas could be obtained either way.
+    """
+    if not (file := file or get_default_schema_bundle_file(getattr(portal, "server", None))):
+        return None
+    bundle = load_schema_bundle(file)
+    if refresh:
+        portal_version = _get_portal_version(portal)
+        if bundle and ((portal_version is None) or (bundle.get("portal_version") == portal_version)):
+            return bundle["schemas"]
+        if downloaded_bundle := download_schema_bundle(portal, file, portal_version=portal_version):
+            return downloaded_bundle["schemas"]
+    return bundle["schemas"] if bundle else None
+
+
+def download_schema_bundle(portal: object, file: Optional[str] = None,
+                           portal_version: Optional[str] = None) -> Optional[dict]:
+    """
+    Downloads all of the schemas from the given portal and writes them to the given schema bundle file,
+    or to the default one for the portal server if not specified; returns the bundle or None if error.
+    """
+    if not (file := file or get_default_schema_bundle_file(getattr(portal, "server", None))):
+        return None
+    try:
+        if not isinstance(schemas := portal.get_schemas(), dict) or not schemas or (schemas.get("status") == "error"):
+            return None
+    except Exception:
+        return None
+    bundle = {
+        "version": _SCHEMA_BUNDLE_FORMAT_VERSION,
+        "server": getattr(portal, "server", None),
+        "portal_version": portal_version or _get_portal_version(portal),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "schemas": schemas
+    }
+    try:
+        if directory := os.path.dirname(file):
+            os.makedirs(directory, exist_ok=True)
+        temporary_file = f"{file}.{os.getpid()}.tmp"
+        with gzip.open(temporary_file, "wt", encoding="utf-8") as f:
+            json.dump(bundle, f)
+        os.replace(temporary_file, file)
+    except Exception:
+        return None
+    return bundle
+
+
+def load_schema_bundle(file: str) -> Optional[dict]:
+    """
+    Returns the schema bundle from the given file, or None if it does not exist or is not valid.
+    """
+    try:
+        if os.path.isfile(file):
+            with gzip.open(file, "rt", encoding="utf-8") as f:
+                if (isinstance(bundle := json.load(f), dict) and
+                    (bundle.get("version") == _SCHEMA_BUNDLE_FORMAT_VERSION) and
+                    isinstance(bundle.get("schemas"), dict)):  # noqa
+                    return bundle
+    except Exception:
+        pass
+    return None
+
+
+def use_schema_bundle(portal: object, schemas: dict) -> None:
+    """
+    Arranges for the given (structured_data) portal object to get its schemas from the given schemas
+    (i.e. from a schema bundle) rather than from the portal; must be called before any schema is used.
+    """
+    portal.get_schemas = lambda: schemas
+
+
+def get_default_schema_bundle_file(server: Optional[str]) -> Optional[str]:
+    if not (isinstance(server, str) and (host := urlparse(server).netloc or server.strip("/"))):
+        return None
+    host = "".join(c if (c.isalnum() or c in ".-_") else "_" for c in host)
+    return os.path.join(get_cache_directory(), _SCHEMA_BUNDLE_DIRECTORY_NAME, f"{host}{_SCHEMA_BUNDLE_SUFFIX}")
+
+
+def _get_portal_version(portal: object) -> Optional[str]:
+    try:
+        return portal.get_version()
+    except Exception:
+        return None
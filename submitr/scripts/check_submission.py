@@ -6,6 +6,7 @@ from dcicutils.common import ORCHESTRATED_APPS
 from dcicutils.misc_utils import PRINT
 from submitr.base import DEFAULT_APP
 from submitr.rclone import RCloneStore
+from submitr.run_metrics import set_run_metrics_files
 from submitr.submission import _monitor_ingestion_process, _pytesting
 from submitr.scripts.cli_utils import CustomArgumentParser
 
@@ -46,6 +47,10 @@ OPTIONS:
 --output OUTPUT-FILE
   Writes all logging output to the specified file;
   and refrains from printing lengthy content to output/stdout.
+--metrics METRICS-FILE
+  Writes run metrics (durations, portal requests, et cetera) to the
+  specified file at the end of the run; in OpenMetrics format if it
+  ends with .prom, otherwise as JSON.
 --verbose
   Displays more verbose output.
 --help
@@ -70,6 +75,7 @@ def main(simulated_args_for_testing=None):
     parser.add_argument('--directory', help="Directory of the upload files (if resuming submission).")
     parser.add_argument('--directory-only', help="Same as --directory but NOT recursively.", default=False)
     parser.add_argument('--output', help="Output file for results.", default=False)
+    parser.add_argument('--metrics', help="Write run metrics to the given (.prom or .json) file.", default=None)
     parser.add_argument('--details', action="store_true", help="More detailed output.", default=False)
     parser.add_argument('--verbose', action="store_true", help="More verbose output.", default=False)
     parser.add_argument('--timeout', help="Wait timeout for server validation/submission.")
@@ -123,6 +129,9 @@ def main(simulated_args_for_testing=None):
         else:
             args.timeout = int(args.timeout)
 
+    if args.metrics:
+        set_run_metrics_files(args.metrics)
+
     with script_catch_errors():
         return _monitor_ingestion_process(
                 args.submission_uuid,
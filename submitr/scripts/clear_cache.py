@@ -0,0 +1,62 @@
+from submitr.http_cache import clear_http_cache
+from submitr.ref_cache import clear_ref_cache
+from submitr.scripts.cli_utils import CustomArgumentParser
+from submitr.validators.utils.revalidation import clear_revalidation_cache
+
+_HELP = """
+===
+clear-submitr-cache
+===
+Tool to clear the local (on-disk) caches used by smaht-submitr,
+i.e. of portal reference (linkTo) lookups, of portal (HTTP) responses
+for slowly changing lookups (e.g. user record, consortia, health page),
+and of results from previous (incremental) validations; all by default.
+===
+USAGE: clear-submitr-cache OPTIONS
+  or: submitr clear-cache OPTIONS
+===
+OPTIONS:
+===
+--refs
+  Clears only the cache of portal reference (linkTo) lookups.
+--http
+  Clears only the cache of portal (HTTP) responses.
+--revalidation
+  Clears only the cache of previous (incremental) validation results.
+--server SERVER-URL
+  Clears only reference lookups and responses cached for the specified portal server;
+  e.g. https://data.smaht.org
+--help
+  Prints this documentation.
+===
+"""
+
+
+def main() -> None:
+
+    parser = CustomArgumentParser(help=_HELP, help_url=CustomArgumentParser.HELP_URL)
+    parser.add_argument('--refs', action="store_true",
+                        help="Clear only the cache of reference lookups.", default=False)
+    parser.add_argument('--http', action="store_true",
+                        help="Clear only the cache of portal (HTTP) responses.", default=False)
+    parser.add_argument('--revalidation', action="store_true",
+                        help="Clear only the cache of previous validation results.", default=False)
+    parser.add_argument('--server', default=None,
+                        help="Clear only reference lookups and responses for this portal server.")
+    args = parser.parse_args(None)
+
+    everything = not (args.refs or args.http or args.revalidation)
+
+    if args.refs or everything:
+        nrefs = clear_ref_cache(server=args.server)
+        print(f"Cleared reference lookup cache{f' for {args.server}' if args.server else ''}: {nrefs}")
+    if args.http or everything:
+        nresponses = clear_http_cache(server=args.server)
+        print(f"Cleared portal response cache{f' for {args.server}' if args.server else ''}: {nresponses}")
+    if args.revalidation or everything:
+        clear_revalidation_cache()
+        print("Cleared validation results cache.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,9 @@ import webbrowser
 from typing import List, Optional, Union
 from dcicutils.command_utils import yes_or_no
 from dcicutils.misc_utils import PRINT
-from submitr.utils import chars, get_version, get_most_recent_version_info, print_boxed
+from submitr.utils import (
+    chars, get_version, get_most_recent_version_info, print_boxed, start_most_recent_version_check
+)
 
 
 class CustomArgumentParser(argparse.ArgumentParser):
@@ -18,6 +20,9 @@ class CustomArgumentParser(argparse.ArgumentParser):
     HELP_URL_VERSION = "latest"
     HELP_URL = f"https://submitr.readthedocs.io/en/{HELP_URL_VERSION}"
     COPYRIGHT = "© Copyright 2020-2024 President and Fellows of Harvard College"
+    HELP_OPTIONS = ["help", "-help", "--help", "-h", "--h", "?", "-?", "--?",
+                    "--help-raw", "--help-advanced", "--help-web"]
+    VERSION_OPTIONS = ["version", "-version", "--version", "-v", "--v"]
 
     def __init__(self, help: str, help_advanced: Optional[str] = None,
                  help_url: Optional[str] = None,
@@ -45,6 +50,9 @@ class CustomArgumentParser(argparse.ArgumentParser):
                           help="Print version.", default=False)
         if self.is_pytest():
             return super().parse_args(args)
+        if any(arg in self.HELP_OPTIONS or arg in self.VERSION_OPTIONS for arg in sys.argv):
+            # Get the most recent (PyPI) version info in the background; only used for help/version output.
+            start_most_recent_version_check()
         self._check_obsolete_options()
         self._check_help_options()
         self._check_version_options()
@@ -85,14 +93,13 @@ class CustomArgumentParser(argparse.ArgumentParser):
 
     def _check_help_options(self) -> None:
         for arg in sys.argv:
-            if arg in ["help", "-help", "--help", "-h", "--h", "?", "-?", "--?",
-                       "--help-raw", "--help-advanced", "--help-web"]:
+            if arg in self.HELP_OPTIONS:
                 self.print_help()
                 sys.exit(0)
 
     def _check_version_options(self) -> None:
         for arg in sys.argv:
-            if arg in ["version", "-version", "--version", "-v", "--v"]:
+            if arg in self.VERSION_OPTIONS:
                 self._print_version(verbose=("-v" not in sys.argv) and ("--v" not in sys.argv))
                 sys.exit(0)
 
@@ -184,7 +191,7 @@ class CustomArgumentParser(argparse.ArgumentParser):
         return version
 
     @lru_cache(maxsize=1)
-    def _get_most_recent_version_info(self, this_version: Optional[str] = None) -> Union[bool, str]:
+    def _get_most_recent_version_info(self, this_version: Optional[str] = None) -> Optional[Union[bool, str]]:
         if not this_version:
             this_version = self._get_version()
         if this_version.startswith(f"{chars.check} "):
@@ -192,10 +199,11 @@ class CustomArgumentParser(argparse.ArgumentParser):
         is_beta_version = ("a" in this_version or "b" in this_version)
         is_most_recent_version = False
         more_recent_version_message = None
-        if most_recent_version_info := get_most_recent_version_info():
-            if ((most_recent_version_info.version == this_version) or
-                (most_recent_version_info.beta_version == this_version)):  # noqa
-                is_most_recent_version = True
+        if not (most_recent_version_info := get_most_recent_version_info()):
+            return None
+        if ((most_recent_version_info.version == this_version) or
+            (most_recent_version_info.beta_version == this_version)):  # noqa
+            is_most_recent_version = True
         more_recent_version_message = (
             f"{self._package or 'COMMAND'}: {this_version}{f' {chars.check}' if is_most_recent_version else ''}")
         if is_most_recent_version:
@@ -0,0 +1,75 @@
+import sys
+from submitr.schema_bundle import download_schema_bundle, get_default_schema_bundle_file, load_schema_bundle
+from submitr.scripts.cli_utils import CustomArgumentParser
+from submitr.submission import _define_portal
+
+_HELP = """
+===
+get-schema-bundle
+===
+Tool to download all of the schemas from the HMS DBMI smaht-portal
+into a local (compressed, versioned) schema bundle file; this can be
+used (via the submit-metadata-bundle --schema-bundle option) for
+(client-side) validation without getting the schemas from the portal.
+===
+USAGE: get-schema-bundle [SCHEMA-BUNDLE-FILE] OPTIONS
+-----
+SCHEMA-BUNDLE-FILE: Saves the schema bundle to this specified file;
+by default to the default schema bundle file for the portal.
+===
+OPTIONS:
+===
+--info
+  Prints info about the (existing) schema bundle; does not download.
+--env ENVIRONMENT-NAME
+  To specify your environment name; from your ~/.smaht-keys.json file.
+  Alternatively, set your SMAHT_ENV environment variable.
+--keys KEYS-FILE
+  To specify an alternate credentials/keys file,
+  rather than the default ~/.smaht-keys.json file.
+  Alternatively, set your SMAHT_KEYS environment variable.
+--help
+  Prints this documentation.
+===
+"""
+
+
+def main() -> None:
+
+    parser = CustomArgumentParser(help=_HELP, help_url=CustomArgumentParser.HELP_URL)
+    parser.add_argument("schema_bundle_file", nargs="?", help="Output schema bundle file.", default=None)
+    parser.add_argument("--info", action="store_true",
+                        help="Print info about the existing schema bundle.", default=False)
+    parser.add_argument('--env',
+                        help="Portal environment name for server/credentials (e.g. in ~/.smaht-keys.json).")
+    parser.add_argument('--keys', help="Path to keys file (rather than default ~/.smaht-keys.json).", default=None)
+    parser.add_argument('--verbose', action="store_true", help="Verbose output.", default=False)
+    args = parser.parse_args(None)
+
+    def print_schema_bundle_info(bundle: dict, file: str) -> None:
+        print(f"Schema Bundle File: {file}")
+        print(f"Portal: {bundle.get('server')}")
+        print(f"Portal Version: {bundle.get('portal_version')}")
+        print(f"Created: {bundle.get('created')}")
+        print(f"Schemas: {len(bundle.get('schemas') or {})}")
+
+    portal = _define_portal(env=args.env, keys_file=args.keys,
+                            report=args.verbose, ping=not args.info, note="Schema Bundle")
+    if not (file := args.schema_bundle_file or get_default_schema_bundle_file(portal.server)):
+        print("Cannot determine schema bundle file.")
+        sys.exit(1)
+
+    if args.info:
+        if not (bundle := load_schema_bundle(file)):
+            print(f"No schema bundle: {file}")
+            sys.exit(1)
+        print_schema_bundle_info(bundle, file)
+    elif bundle := download_schema_bundle(portal, file):
+        print_schema_bundle_info(bundle, file)
+    else:
+        print(f"Cannot download schemas from portal: {portal.server}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
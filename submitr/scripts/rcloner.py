@@ -19,7 +19,6 @@ from submitr.rclone import (
 )
 from submitr.rclone.rclone_installation import RCloneInstallation
 from submitr.rclone.rclone_store_registry import RCloneStoreRegistry
-from submitr.rclone.testing.rclone_utils_for_testing_amazon import AwsS3
 from submitr.utils import chars
 
 # Little command-line utility to interactively exercise our rclone support code in smaht-submitr.
@@ -413,6 +412,7 @@ def main_info(source: str, destination: Optional[str] = None,
 
 def generate_amazon_temporary_credentials(amazon_credentials: AmazonCredentials,
                                           *args, **kwargs) -> Optional[AmazonCredentials]:
+    from submitr.rclone.testing.rclone_utils_for_testing_amazon import AwsS3  # deferred; imports boto3
     return AwsS3(amazon_credentials).generate_temporary_credentials(*args, **kwargs) if amazon_credentials else None
 
 
@@ -456,6 +456,7 @@ def print_info_via_rclone(target: str, rclone_store: RCloneStore) -> None:
     size = rclone_store.file_size(target)
     checksum = rclone_store.file_checksum(target)
     if isinstance(rclone_store, RCloneAmazon):
+        from submitr.rclone.testing.rclone_utils_for_testing_amazon import AwsS3  # deferred; imports boto3
         s3 = AwsS3(rclone_store.credentials)
         checksum_via_aws_boto = s3.file_checksum(target)
         checksum_etag_via_boto = s3.file_checksum(target, etag=True)
@@ -5,6 +5,7 @@ from dcicutils.command_utils import script_catch_errors
 from dcicutils.misc_utils import PRINT
 from submitr.base import DEFAULT_APP
 from submitr.rclone import RCloneStore
+from submitr.run_metrics import set_run_metrics_files
 from submitr.submission import resume_uploads
 from submitr.scripts.cli_utils import CustomArgumentParser
 
@@ -46,6 +47,10 @@ OPTIONS:
   May be omitted if running on a GCE instance.
 --cloud-location LOCATION
   The Google Cloud Storage (GCS) location (aka "region").
+--metrics METRICS-FILE
+  Writes run metrics (durations, bytes uploaded, throughput, et cetera)
+  to the specified file at the end of the run; in OpenMetrics format
+  if it ends with .prom, otherwise as JSON.
 --help
   Prints this documentation.
 --help-advanced
@@ -90,6 +95,7 @@ def main(simulated_args_for_testing=None):
     parser.add_argument('--yes', action="store_true",
                         help="Suppress (yes/no) requests for user input.", default=False)
     parser.add_argument('--output', help="Output file for results.", default=False)
+    parser.add_argument('--metrics', help="Write run metrics to the given (.prom or .json) file.", default=None)
 
     # These original/deprecated options are just for backward compatibility.
     parser.add_argument('--rclone-google-source', help="Use rlcone to copy upload files from GCS.", default=None)
@@ -145,6 +151,9 @@ def main(simulated_args_for_testing=None):
         if args.env:
             env_from_env = True
 
+    if args.metrics:
+        set_run_metrics_files(args.metrics)
+
     with script_catch_errors():
 
         resume_uploads(uuid=args.uuid,
@@ -8,6 +8,7 @@ from dcicutils.misc_utils import PRINT
 from .cli_utils import CustomArgumentParser
 from submitr.base import DEFAULT_APP
 from submitr.rclone import RCloneStore
+from submitr.run_metrics import set_run_metrics_files
 from submitr.submission import (
     submit_any_ingestion,
     DEFAULT_INGESTION_TYPE,
@@ -124,12 +125,53 @@ ADVANCED OPTIONS:
 --output OUTPUT-FILE
   Writes all logging output to the specified file;
   and refrains from printing lengthy content to output/stdout.
+  If OUTPUT-FILE ends with .gz the output is gzip compressed.
 --noprogress
   Do not print progress of (client-side) parsing/validation output.
+--incremental
+  Reuses (portal-backed) validation results from the previous validation
+  of this same file for rows which have not changed since then;
+  useful when re-validating a large file after fixing a few rows.
+--streaming
+  Reads the metadata (Excel) file row by row (openpyxl read-only mode),
+  rather than first loading every cell of the workbook into memory, and
+  keeps the parsed rows of each sheet, once it is done, as compact
+  records (only those of the sheet being read are held in full), for
+  (client-side) validation; this uses much less memory for very large
+  files.
+--workers N
+  Parses the sheets of the metadata (Excel) file in parallel using
+  the given number of processes, for (client-side) validation;
+  this is faster for very large files with many sheets.
+--schema-bundle [SCHEMA-BUNDLE-FILE]
+  Uses the portal schemas from a local schema bundle file (see the
+  get-schema-bundle command), or from the default one for the portal,
+  rather than getting them from the portal, for (client-side) validation;
+  the bundle is automatically refreshed if the portal version changes.
+--ref-nocache
+  Does not cache reference (linkTo) lookups, neither in memory nor
+  on disk; by default positive lookups are cached on disk for ten
+  minutes (set SUBMITR_REF_CACHE_TTL to the number of seconds to
+  change this, or to zero to disable it); use the clear-submitr-cache
+  command to clear this cache.
 --timeout SECONDS
   Maximum umber of seconds to wait for server validation or submission.
+--metrics METRICS-FILE
+  Writes run metrics (durations of each phase, bytes uploaded, portal
+  requests, et cetera) to the specified file at the end of the run;
+  in OpenMetrics format if it ends with .prom, otherwise as JSON.
+  Or set the SUBMITR_METRICS_FILE environment variable.
 --debug
-  Displays some debugging related output.
+  Displays some debugging related output;
+  including a profile of the (client-side) validators,
+  and a summary of the (portal) HTTP calls, per endpoint.
+--http-trace FILE
+  Writes a trace of all (portal) HTTP calls to the specified file,
+  as NDJSON, i.e. the method, URL, status, latency, and bytes per call.
+--profile-validators FILE
+  Writes a (JSON) profile of the (client-side) validators to the
+  specified file, i.e. per validator the number of calls, time,
+  and number of portal calls made and validation errors noted.
 --ping
   Pings the server; to test connectivity.
 --yes
@@ -197,11 +239,18 @@ def main(simulated_args_for_testing=None):
     parser.add_argument('--no_query', '--no-query', '-nq', action="store_true",
                         help="Suppress (yes/no) requests for user input.", default=False)
     parser.add_argument('--ref-nocache', action="store_true",
-                        help="Do not cache reference (linkTo) lookups.", default=False)
+                        help="Do not cache reference (linkTo) lookups (in memory or on disk).", default=False)
     parser.add_argument('--nouploads', action="store_true",
                         help="Do not attempt to upload any files; use resume-uploads later.", default=False)
     parser.add_argument('--noprogress', action="store_true",
                         help="Do not track progress of client-side parsing/validation.", default=False)
+    parser.add_argument('--incremental', action="store_true",
+                        help="Reuse previous validation results for unchanged rows.", default=False)
+    parser.add_argument('--streaming', action="store_true",
+                        help="Read the metadata file row by row (low memory) for validation.", default=False)
+    parser.add_argument('--workers', help="Number of processes to use to parse metadata file sheets.", default=None)
+    parser.add_argument('--schema-bundle', nargs="?", const=True,
+                        help="Use portal schemas from a local schema bundle (file).", default=None)
     parser.add_argument('--app',
                         help=f"An application (default {DEFAULT_APP!r}. Only for debugging."
                              f" Normally this should not be given.")
@@ -228,7 +277,11 @@ def main(simulated_args_for_testing=None):
                         default=False)
     parser.add_argument('--verbose', action="store_true", help="Debug output.", default=False)
     parser.add_argument('--timeout', help="Wait timeout for server validation/submission.")
+    parser.add_argument('--metrics', help="Write run metrics to the given (.prom or .json) file.", default=None)
     parser.add_argument('--debug', action="store_true", help="Debug output.", default=False)
+    parser.add_argument('--profile-validators', help="Write (JSON) validator profile to the given file.",
+                        default=None)
+    parser.add_argument('--http-trace', help="Write (NDJSON) trace of HTTP calls to the given file.", default=None)
     parser.add_argument('--debug-sleep', help="Sleep on each row read for troubleshooting/testing.", default=False)
     parser.add_argument('--ping', action="store_true", help="Ping server.", default=False)
 
@@ -331,6 +384,12 @@ def main(simulated_args_for_testing=None):
         else:
             args.timeout = int(args.timeout)
 
+    if args.workers:
+        if not args.workers.isdigit():
+            args.workers = None
+        else:
+            args.workers = int(args.workers)
+
     if args.info:
         if not os.path.exists(args.bundle_filename):
             PRINT(f"File does not exist: {args.bundle_filename}")
@@ -344,6 +403,9 @@ def main(simulated_args_for_testing=None):
                                   verbose=args.verbose)
         sys.exit(0)
 
+    if args.metrics:
+        set_run_metrics_files(args.metrics)
+
     with script_catch_errors():
 
         if not _sanity_check_submitted_file(args.bundle_filename):
@@ -385,6 +447,12 @@ def main(simulated_args_for_testing=None):
                              noprogress=args.noprogress,
                              output_file=args.output,
                              timeout=args.timeout,
+                             incremental=args.incremental,
+                             streaming=args.streaming,
+                             workers=args.workers,
+                             schema_bundle=args.schema_bundle,
+                             profile_validators=args.profile_validators,
+                             http_trace=args.http_trace,
                              debug=args.debug,
                              debug_sleep=args.debug_sleep)
 
@@ -3,18 +3,17 @@ import multiprocessing
 import os
 import sys
 from typing import Optional
-from submitr.scripts.check_submission import main as main_check_submission
-from submitr.scripts.get_metadata_template import main as main_get_metadata_template
-from submitr.scripts.list_submissions import main as main_list_submissions
-from submitr.scripts.rcloner import main as main_rcloner
-from submitr.scripts.resume_uploads import main as main_resume_uploads
-from submitr.scripts.submit_metadata_bundle import main as main_submit_metadata_bundle
-from submitr.utils import get_version
 
 # This exists primarily to support pyinstaller method of running smaht-submitr commands.
 # where we package a single command (this module) into a self-contained independent
 # executable file (via pyinstaller) which can be run WITHOUT Python (and any
 # related tools like pyenv) having to be installed.
+#
+# Each command (main function) is imported only when that command is actually run, i.e. so that
+# e.g. submitr version or submitr help do not pay the (significant) cost of importing everything
+# (dcicutils structured_data, boto3, openpyxl, rclone, validators) which the real commands need;
+# the imports are (function-local) import statements, rather than importlib, so that pyinstaller
+# still finds and packages them. See also test_import_time.py (for the import-time budget).
 
 
 def usage(message: Optional[str] = None) -> None:
@@ -29,13 +28,56 @@ def usage(message: Optional[str] = None) -> None:
 
 
 def main_version():
+    from submitr.utils import get_version
     print(f"{get_version()}")
     sys.exit(0)
 
 
+def main_check_submission():
+    from submitr.scripts.check_submission import main
+    main()
+
+
+def main_clear_cache():
+    from submitr.scripts.clear_cache import main
+    main()
+
+
+def main_get_metadata_template():
+    from submitr.scripts.get_metadata_template import main
+    main()
+
+
+def main_get_schema_bundle():
+    from submitr.scripts.get_schema_bundle import main
+    main()
+
+
+def main_list_submissions():
+    from submitr.scripts.list_submissions import main
+    main()
+
+
+def main_rcloner():
+    from submitr.scripts.rcloner import main
+    main()
+
+
+def main_resume_uploads():
+    from submitr.scripts.resume_uploads import main
+    main()
+
+
+def main_submit_metadata_bundle():
+    from submitr.scripts.submit_metadata_bundle import main
+    main()
+
+
 supported_commands = {
     "check-submission": main_check_submission,
+    "clear-cache": main_clear_cache,
     "get-metadata-template": main_get_metadata_template,
+    "get-schema-bundle": main_get_schema_bundle,
     "help": usage,
     "list-submissions": main_list_submissions,
     "rcloner": main_rcloner,
@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Any, Callable, Optional
+
+# Concurrent startup probes, i.e. the independent portal requests which a command makes before any real work
+# starts, e.g. portal version, ping, user record, submission centers, health page (metadata bundles bucket,
+# S3 KMS key ID), and metadata template version; made one after the other these add up, i.e. one full round
+# trip each, which is significant over a high latency (e.g. VPN) connection. Instead these are all started
+# together, each in its own thread, as soon as the portal is defined (see _define_portal), and the result of
+# each is awaited only where it is actually needed (via the result method); an exception raised by a probe
+# (including SystemExit) is raised where its result is awaited, just as if it had been called there. A probe
+# which was not added (or not started) is simply called (synchronously) where its result is needed. Probes
+# must not print anything, as this would be interleaved with the regular (main thread) output. The threads
+# are daemon threads (rather than those of a ThreadPoolExecutor, which are joined at interpreter exit), so
+# that exiting early, e.g. via sys.exit on an error, never waits for any (possibly slow) probes still running.
+
+
+class StartupProbes:
+
+    def __init__(self) -> None:
+        self._probes = {}
+        self._futures = {}  # By name; each a _ProbeResult
+        self._durations = {}
+        self._waited = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, name: str, function: Callable[[Any], Any]) -> None:
+        """
+        Adds a probe with the given name, i.e. the given function which will be called with the portal.
+        """
+        self._probes[name] = function
+
+    def start(self, portal: Any) -> None:
+        """
+        Starts all of the (added) probes, concurrently, for the given portal; does nothing if already started.
+        """
+        if self._futures or not self._probes:
+            return
+        for name, function in self._probes.items():
+            self._futures[name] = future = _ProbeResult()
+            threading.Thread(target=self._run, args=(name, function, portal, future),
+                             name=f"submitr-probe-{name}", daemon=True).start()
+
+    def result(self, name: str, function: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        Returns the result of the probe with the given name, waiting for it to finish if necessary; if no such
+        probe was started then returns the result of calling the given function, or None if not specified.
+        """
+        if (future := self._futures.get(name)) is None:
+            return function() if callable(function) else None
+        started = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            self._waited += time.perf_counter() - started
+
+    @property
+    def waited(self) -> float:
+        """
+        Returns the total time (seconds) spent waiting for probes, i.e. the critical-path time of the probes.
+        """
+        return self._waited
+
+    def print_summary(self, printf: Callable = print, prefix: str = "DEBUG: ") -> None:
+        if not self._futures:
+            return
+        with self._lock:
+            durations = dict(self._durations)
+        printf(f"{prefix}Startup probes: {len(self._futures)}"
+               f" | Serial: {sum(durations.values()):.3f}s"
+               f" | Longest: {max(durations.values(), default=0):.3f}s"
+               f" | Critical path: {self._waited:.3f}s")
+        for name, duration in sorted(durations.items(), key=lambda item: item[1], reverse=True):
+            printf(f"{prefix}- {name}: {duration:.3f}s")
+
+    def _run(self, name: str, function: Callable[[Any], Any], portal: Any, future: "_ProbeResult") -> None:
+        started = time.perf_counter()
+        try:
+            future.set_result(function(portal))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._durations[name] = time.perf_counter() - started
+            future.set_done()
+
+
+class _ProbeResult:
+    """
+    The (eventual) result of a probe, or the exception it raised; result waits for it.
+    """
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._result = None
+        self._exception = None
+
+    def set_result(self, result: Any) -> None:
+        self._result = result
+
+    def set_exception(self, exception: BaseException) -> None:
+        self._exception = exception
+
+    def set_done(self) -> None:
+        self._done.set()
+
+    def result(self) -> Any:
+        self._done.wait()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
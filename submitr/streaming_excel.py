@@ -0,0 +1,42 @@
+import openpyxl
+import sys
+from typing import Any, Optional
+import warnings
+from dcicutils.submitr.custom_excel import CustomExcel, CustomExcelSheetReader
+
+# Low-memory (streaming) variant of the CustomExcel reader, for (client-side) validation of very large
+# workbooks (see the --streaming option). By default openpyxl materializes the entire workbook, i.e. every
+# cell of every sheet as an object, in memory up-front, which is by far the largest part of the memory
+# used by validation; and this is done twice when progress is shown (once just to count the rows).
+# Instead, this opens the workbook in openpyxl read-only mode, in which sheets are read row by row
+# directly from the file as they are iterated, so only the current row of the workbook is held; and the
+# parsed items of each sheet are kept as compact rows once the sheet is done (see submitr.compact_rows).
+# Additionally, (short) cell values are interned, so that values repeated across rows (e.g. references,
+# categories, and other enumerated values, which make up most of the values of large submissions) are
+# stored once, making the parsed row records (i.e. StructuredDataSet.data) more compact still.
+
+_INTERN_MAX_LENGTH = 256
+
+
+class StreamingExcel(CustomExcel):
+
+    def sheet_reader(self, sheet_name: str) -> CustomExcelSheetReader:
+        return StreamingExcelSheetReader(self, sheet_name=sheet_name, workbook=self._workbook,
+                                         custom_column_mappings=self._custom_column_mappings)
+
+    def open(self) -> None:
+        if self._workbook is None:
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore", category=UserWarning)
+                self._workbook = openpyxl.load_workbook(self._file, read_only=True, data_only=True)
+            self.sheet_names = [sheet_name for sheet_name in self._workbook.sheetnames
+                                if not self.is_hidden_sheet(self._workbook[sheet_name])]
+
+
+class StreamingExcelSheetReader(CustomExcelSheetReader):
+
+    def cell_value(self, value: Optional[Any]) -> Any:
+        # Note the (dcicutils) cell deletion sentinel value is a str subclass which cannot (and must not) be interned.
+        if (type(value := super().cell_value(value)) is str) and (len(value) <= _INTERN_MAX_LENGTH):
+            return sys.intern(value)
+        return value
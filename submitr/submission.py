@@ -1,6 +1,4 @@
 import ast
-import boto3
-from botocore.exceptions import NoCredentialsError as BotoNoCredentialsError
 from functools import lru_cache
 import io
 import json
@@ -8,7 +6,7 @@ import os
 import re
 import sys
 import time
-from typing import Any, BinaryIO, Callable, Dict, List, Literal, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Generator, List, Literal, Optional, Tuple, Union
 
 # get_env_real_url would rely on env_utils
 # from dcicutils.env_utils import get_env_real_url
@@ -42,9 +40,13 @@ from dcicutils.submitr.progress_constants import (
 from submitr.base import DEFAULT_APP
 from dcicutils.submitr.custom_excel import CustomExcel
 from submitr.exceptions import PortalPermissionError
+from submitr.existing_objects import prefetched_existing_objects
 from submitr.file_for_upload import FilesForUpload, get_file_upload_bucket
+from submitr.http_cache import cached_get, cached_get_json
+from submitr.http_tracer import start_http_trace
 from submitr.metadata_template import (
     check_metadata_version,
+    get_metadata_template_info_from_portal,
     print_metadata_version_warning,
 )
 from submitr.output import (
@@ -55,8 +57,18 @@ from submitr.output import (
     get_output_file,
     setup_for_output_file_option,
 )
+from submitr.parallel_excel import ParallelExcel
 from submitr.rclone import RCloneGoogle
+from submitr.ref_cache import install_ref_cache
+from submitr.ref_resolver import RefPrefetcher, resolve_refs
+from submitr.run_metrics import (
+    PHASE_ANALYZE, PHASE_INGESTION, PHASE_PARSE, PHASE_PORTAL_SETUP,
+    PHASE_SERVER_VALIDATION, PHASE_VALIDATE, run_metrics, run_metrics_command
+)
+from submitr.schema_bundle import get_schema_bundle, use_schema_bundle
 from submitr.scripts.cli_utils import get_version
+from submitr.startup_probes import StartupProbes
+from submitr.streaming_excel import StreamingExcel
 from submitr.submission_uploads import (
     do_any_uploads,
     lookup_file_metadata_by_file_name,
@@ -74,6 +86,8 @@ from submitr.validators.decorators import (
     define_structured_data_validator_hook,
     define_structured_data_validator_sheet_hook,
 )
+from submitr.validators.profiler import ValidatorProfiler
+from submitr.validators.utils.revalidation import RevalidationState
 from submitr.validators.unreferenced_validator import report_unreferenced_references
 
 
@@ -137,7 +151,7 @@ def _resolve_server(server, env):
     return  # no longer used - using dcicutils.portal_utils.Portal instead
 
 
-def _get_user_record(server, auth, quiet=False):
+def _get_user_record(server, auth, quiet=False, user_record_response=None):
     """
     Given a server and some auth info, gets the user record for the authorized user.
 
@@ -145,11 +159,12 @@ def _get_user_record(server, auth, quiet=False):
 
     :param server: a server spec
     :param auth: auth info to be used when contacting the server
+    :param user_record_response: the (already fetched) /me response, if any (see _get_user_record_response)
     :return: the /me page in JSON format
     """
 
-    user_url = server + "/me?format=json"
-    user_record_response = Portal(auth).get(user_url)
+    if user_record_response is None:
+        user_record_response = _get_user_record_response(server, auth)
     try:
         user_record = user_record_response.json()
     except Exception:
@@ -175,6 +190,11 @@ def _get_user_record(server, auth, quiet=False):
     return user_record
 
 
+def _get_user_record_response(server, auth):
+    # Always (conditionally) revalidated, so that a revoked or invalid access key is never accepted from the cache.
+    return cached_get(Portal(auth), server + "/me?format=json", server=server, revalidate=True)
+
+
 def _is_admin_user(user: dict) -> bool:
     if tobool(os.environ.get("SMAHT_NOADMIN")):
         return False
@@ -774,6 +794,7 @@ def _resolve_app_args(
     return app_args
 
 
+@run_metrics_command("submit-metadata-bundle")
 def submit_any_ingestion(
     ingestion_filename,
     *,
@@ -819,6 +840,12 @@ def submit_any_ingestion(
     env_from_env=False,
     timeout=None,
     noversion=False,
+    incremental=False,
+    streaming=False,
+    workers=None,
+    schema_bundle=None,
+    profile_validators=None,
+    http_trace=None,
     debug=False,
     debug_sleep=None,
 ):
@@ -862,15 +889,32 @@ def submit_any_ingestion(
             output_file
         )
 
+    # Trace (portal) HTTP calls; summarized at exit if debug, and/or written to the given (NDJSON) file.
+    start_http_trace(debug=debug, file=http_trace, printf=PRINT_OUTPUT)
+
+    # The independent startup (portal) requests are started concurrently as soon as the
+    # portal is defined, and the result of each is awaited only where it is needed below.
+    startup_probes = StartupProbes()
+    if report_portal := not json_only or verbose:
+        startup_probes.add("version", lambda portal: portal.get_version())
+    startup_probes.add("ping", lambda portal: portal.ping())
+    startup_probes.add("user_record", lambda portal: _get_user_record_response(portal.server, portal.key_pair))
+    startup_probes.add("health", lambda portal: get_health_page(key=portal.key))
+    startup_probes.add("submission_centers", _get_submission_centers)
+    if not noversion and not json_only and is_excel_file_name(ingestion_filename):
+        startup_probes.add("metadata_template", get_metadata_template_info_from_portal)
+
+    run_metrics.begin_phase(PHASE_PORTAL_SETUP)
     portal = _define_portal(
         env=env,
         env_from_env=env_from_env,
         server=server,
         app=app,
         keys_file=keys_file,
-        report=not json_only or verbose,
+        report=report_portal,
         verbose=verbose,
         note="Metadata Validation" if validation else "Metadata Submission",
+        startup_probes=startup_probes,
     )
 
     app_args = _resolve_app_args(
@@ -883,7 +927,7 @@ def submit_any_ingestion(
         submission_center=submission_center,
     )
 
-    if not portal.ping():
+    if not startup_probes.result("ping", portal.ping):
         SHOW(
             f"Portal credentials do not seem to work: {portal.keys_file} ({env}). "
             "Please login to the portal and double-check that your key is not expired. "
@@ -893,7 +937,8 @@ def submit_any_ingestion(
         sys.exit(1)
 
     user_record = _get_user_record(
-        portal.server, auth=portal.key_pair, quiet=json_only and not verbose
+        portal.server, auth=portal.key_pair, quiet=json_only and not verbose,
+        user_record_response=startup_probes.result("user_record")
     )
 
     # Nevermind: Too confusing for both testing and general usage
@@ -917,6 +962,7 @@ def submit_any_ingestion(
         PRINT(f"DEBUG: validate_local_skip = {validate_local_skip}")
         PRINT(f"DEBUG: validate_remote_skip = {validate_remote_skip}")
 
+    startup_probes.result("health")  # get_health_page is cached
     metadata_bundles_bucket = get_metadata_bundles_bucket_from_health_path(
         key=portal.key
     )
@@ -960,7 +1006,7 @@ def submit_any_ingestion(
             )
             sys.exit(1)
 
-    known_submission_centers = _get_submission_centers(portal)
+    known_submission_centers = startup_probes.result("submission_centers", lambda: _get_submission_centers(portal))
     if add_submission_center:
         if not _is_admin_user(user_record):
             PRINT(
@@ -1009,6 +1055,8 @@ def submit_any_ingestion(
     else:
         valid_submission_centers = ""
 
+    run_metrics.end_phase(PHASE_PORTAL_SETUP)
+
     if not json_only:
         PRINT(
             f"Metadata file to {'validate' if validation else 'ingest'}: {format_path(ingestion_filename)}"
@@ -1021,8 +1069,12 @@ def submit_any_ingestion(
         rclone_google.verify_connectivity()
 
     if not noversion and not json_only:
+        startup_probes.result("metadata_template")  # get_metadata_template_info_from_portal is cached
         check_metadata_version(ingestion_filename, portal=portal)
 
+    if debug:
+        startup_probes.print_summary(PRINT)
+
     if not validate_remote_only and not validate_local_skip:
         structured_data = _validate_locally(
             ingestion_filename,
@@ -1044,6 +1096,11 @@ def submit_any_ingestion(
             json_only=json_only,
             verbose_json=verbose_json,
             ignore_orphans=ignore_orphans,
+            incremental=incremental,
+            streaming=streaming,
+            workers=workers,
+            schema_bundle=schema_bundle,
+            profile_validators=profile_validators,
             verbose=verbose,
             debug=debug,
             debug_sleep=debug_sleep,
@@ -1333,6 +1390,7 @@ def _print_recent_submissions(
     return False
 
 
+@run_metrics_command("check-submission")
 def _monitor_ingestion_process(
     uuid: str,
     server: str,
@@ -1361,6 +1419,8 @@ def _monitor_ingestion_process(
     if output_file:
         set_output_file(output_file)
 
+    start_http_trace(debug=debug, printf=PRINT_OUTPUT)
+
     if timeout:
         global PROGRESS_TIMEOUT, PROGRESS_MAX_CHECKS
         PROGRESS_TIMEOUT = timeout
@@ -1528,15 +1588,16 @@ def _monitor_ingestion_process(
 
         return progress_report
 
-    portal = _define_portal(
-        env=env,
-        server=server,
-        keys_file=keys_file,
-        app=app or DEFAULT_APP,
-        env_from_env=env_from_env,
-        report=report,
-        note=note,
-    )
+    with run_metrics.phase(PHASE_PORTAL_SETUP):
+        portal = _define_portal(
+            env=env,
+            server=server,
+            keys_file=keys_file,
+            app=app or DEFAULT_APP,
+            env_from_env=env_from_env,
+            report=report,
+            note=note,
+        )
 
     def interrupt_exit_message(bar: ProgressBar):
         nonlocal uuid, server, env, validation, portal
@@ -1600,6 +1661,7 @@ def _monitor_ingestion_process(
         )
 
     started = time.time()
+    run_metrics.begin_phase(PHASE_SERVER_VALIDATION if validation else PHASE_INGESTION)
     progress = define_progress_callback(
         PROGRESS_MAX_CHECKS,
         title="Validation" if validation else "Submission",
@@ -1895,6 +1957,7 @@ def _monitor_ingestion_process(
             PRINT_STDOUT("Use the --output FILE option to write errors to a file.")
         sys.exit(1)
 
+    run_metrics.end_phase(PHASE_SERVER_VALIDATION if validation else PHASE_INGESTION)
     return check_done, check_status, check_response
 
 
@@ -2381,6 +2444,7 @@ def _get_upload_file_info(
         return None
 
 
+@run_metrics_command("resume-uploads")
 def resume_uploads(
     uuid,
     server=None,
@@ -2404,6 +2468,11 @@ def resume_uploads(
             output_file
         )
 
+    startup_probes = StartupProbes()
+    startup_probes.add("version", lambda portal: portal.get_version())
+    startup_probes.add("ping", lambda portal: portal.ping())
+
+    run_metrics.begin_phase(PHASE_PORTAL_SETUP)
     portal = _define_portal(
         key=keydict,
         keys_file=keys_file,
@@ -2413,8 +2482,9 @@ def resume_uploads(
         env_from_env=env_from_env,
         report=True,
         note="Resuming File Upload",
+        startup_probes=startup_probes,
     )
-    if not portal.ping():
+    if not startup_probes.result("ping", portal.ping):
         SHOW(
             f"Portal credentials do not seem to work: {portal.keys_file} ({env}). "
             "Please login to the portal and double-check that your key is not expired. "
@@ -2422,6 +2492,7 @@ def resume_uploads(
             "and try again."
         )
         sys.exit(1)
+    run_metrics.end_phase(PHASE_PORTAL_SETUP)
 
     if rclone_google:
         rclone_google.verify_connectivity()
@@ -2461,6 +2532,8 @@ def _fetch_exception_results(
 def _fetch_results(
     metadata_bundles_bucket: str, uuid: str, file: str
 ) -> Optional[Tuple[str, str]]:
+    import boto3  # deferred; slow to import
+    from botocore.exceptions import NoCredentialsError as BotoNoCredentialsError
     results_key = f"{uuid}/{file}"
     results_location = f"s3://{metadata_bundles_bucket}/{results_key}"
     try:
@@ -2481,6 +2554,20 @@ def _fetch_results(
         return (results_location, None)
 
 
+def _report_validator_profile(profiler: ValidatorProfiler,
+                              profile_file: Optional[str] = None, debug: bool = False) -> None:
+    if debug:
+        PRINT_OUTPUT("DEBUG: Validator profile:")
+        for line in profiler.format_results():
+            PRINT_OUTPUT(f"DEBUG: {line}")
+    if profile_file:
+        try:
+            profiler.write(profile_file)
+            PRINT(f"Validator profile written to: {format_path(profile_file)}")
+        except Exception as e:
+            PRINT(f"WARNING: Cannot write validator profile file: {profile_file} ({str(e)})")
+
+
 def _validate_locally(
     ingestion_filename: str,
     portal: Portal,
@@ -2502,6 +2589,11 @@ def _validate_locally(
     verbose_json: bool = False,
     verbose: bool = False,
     ignore_orphans: bool = False,
+    incremental: bool = False,
+    streaming: bool = False,
+    workers: Optional[int] = None,
+    schema_bundle: Optional[Union[bool, str]] = None,
+    profile_validators: Optional[str] = None,
     debug: bool = False,
     debug_sleep: Optional[str] = None,
 ) -> StructuredDataSet:
@@ -2598,10 +2690,37 @@ def _validate_locally(
     if debug:
         PRINT("DEBUG: Starting client validation.")
 
+    if isinstance(workers, int) and (workers > 1):
+        # Parse the sheets of the (Excel) file in a pool of worker processes; note that
+        # the file is read twice (by StructuredDataSet) when progress is reported.
+        excel_class = ParallelExcel.with_workers(workers, reads=1 if noprogress else 2)
+    elif streaming:
+        # The streaming (read-only, row by row) Excel reader uses much less memory for very large workbooks;
+        # and with streaming the parsed items of each sheet are kept as compact rows (see compact_rows).
+        excel_class = StreamingExcel
+    else:
+        excel_class = CustomExcel
+    if not ref_nocache:
+        # Resolve references in bulk, a batch of rows at a time as these are read, rather than individually.
+        ref_prefetcher = RefPrefetcher(excel_class)
+        excel_class = ref_prefetcher.excel_class
+    else:
+        ref_prefetcher = None
+
+    if schema_bundle:
+        # Get schemas from the local schema bundle (refreshed if the portal version has changed).
+        if schemas := get_schema_bundle(portal, file=schema_bundle if isinstance(schema_bundle, str) else None):
+            use_schema_bundle(portal, schemas)
+        else:
+            PRINT("WARNING: Cannot get schema bundle; getting schemas from portal.")
+
+    validator_profiler = ValidatorProfiler() if (debug or profile_validators) else None
     validator_hook = define_structured_data_validator_hook(
+        profiler=validator_profiler,
+        compact_rows=streaming,
         valid_submission_centers=valid_submission_centers
     )
-    validator_sheet_hook = define_structured_data_validator_sheet_hook()
+    validator_sheet_hook = define_structured_data_validator_sheet_hook(profiler=validator_profiler)
     structured_data = StructuredDataSet(
         None,
         portal,
@@ -2621,13 +2740,41 @@ def _validate_locally(
         progress=None if noprogress else define_progress_callback(debug=debug),
         validator_hook=validator_hook,
         validator_sheet_hook=validator_sheet_hook,
-        excel_class=CustomExcel,
+        excel_class=excel_class,
         debug_sleep=debug_sleep,
     )
-    structured_data.load_file(ingestion_filename)
+    if schema_bundle and schemas:
+        use_schema_bundle(structured_data.portal, schemas)
+    if ref_prefetcher:
+        # Serve reference lookups from those resolved in bulk (see above); and serve (positive)
+        # reference lookups from, and save them to, the persistent (across runs) cache.
+        ref_prefetcher.install(structured_data.portal)
+        install_ref_cache(structured_data.portal)
+    if incremental:
+        # Reuse results from the previous (incremental) validation of this same file for unchanged rows.
+        revalidation = RevalidationState(ingestion_filename, portal.server)
+        revalidation.attach(structured_data)
+    else:
+        revalidation = None
+    if validator_profiler:
+        with validator_profiler, run_metrics.phase(PHASE_PARSE):
+            structured_data.load_file(ingestion_filename)
+        _report_validator_profile(validator_profiler, profile_validators, debug=debug)
+    else:
+        with run_metrics.phase(PHASE_PARSE):
+            structured_data.load_file(ingestion_filename)
+
+    if revalidation:
+        revalidation.save()
+        if revalidation.has_previous:
+            counts = revalidation.counts()
+            PRINT(f"Incremental validation: {counts['unchanged']} of {counts['rows']} rows unchanged"
+                  f" since previous validation; reused {counts['reused']} cached validation results.")
 
     if debug:
         PRINT("DEBUG: Finished client validation.")
+        if ref_prefetcher:
+            PRINT(f"DEBUG: Reference bulk resolved count: {ref_prefetcher.count}")
 
     if debug:
         PRINT_OUTPUT(f"DEBUG: Reference total count: {structured_data.ref_total_count}")
@@ -2658,6 +2805,10 @@ def _validate_locally(
         PRINT_OUTPUT(
             f"DEBUG: Reference lookup count: {structured_data.ref_lookup_count}"
         )
+        PRINT_OUTPUT(
+            f"DEBUG: Reference lookup persistent cache hit count:"
+            f" {getattr(structured_data.portal, 'ref_disk_cache_hit_count', 0)}"
+        )
         PRINT_OUTPUT(
             f"DEBUG: Reference lookup found count: {structured_data.ref_lookup_found_count}"
         )
@@ -2677,17 +2828,18 @@ def _validate_locally(
     if verbose_json:
         PRINT_OUTPUT(f"Parsed JSON:")
         PRINT_OUTPUT(json.dumps(structured_data.data, indent=4))
-    validation_okay = _validate_data(
-        structured_data,
-        portal,
-        ingestion_filename,
-        upload_folder,
-        recursive=subfolders,
-        valid_submission_centers=valid_submission_centers,
-        ignore_orphans=ignore_orphans,
-        verbose=verbose,
-        debug=debug,
-    )
+    with run_metrics.phase(PHASE_VALIDATE):
+        validation_okay = _validate_data(
+            structured_data,
+            portal,
+            ingestion_filename,
+            upload_folder,
+            recursive=subfolders,
+            valid_submission_centers=valid_submission_centers,
+            ignore_orphans=ignore_orphans,
+            verbose=verbose,
+            debug=debug,
+        )
     if validation_okay:
         PRINT(f"Validation results (preliminary): OK {chars.check}")
     elif exit_immediately_on_errors:
@@ -2714,6 +2866,7 @@ def _validate_locally(
             PRINT_STDOUT("Use the --output FILE option to write errors to a file.")
         sys.exit(1)
 
+    run_metrics.begin_phase(PHASE_ANALYZE)
     if verbose:
         _print_structured_data_verbose(
             portal,
@@ -2741,6 +2894,7 @@ def _validate_locally(
         PRINT(
             "Skipping analysis of metadata wrt creates/updates to be done (per --noanalyze)."
         )
+    run_metrics.end_phase(PHASE_ANALYZE)
 
     if not validation_okay:
         if not yes_or_no(
@@ -2819,12 +2973,18 @@ def _validate_data(
         #         PRINT_OUTPUT(f"  - ERROR: {error['ref']} (refs: {error['count']})")
 
     if not ignore_orphans:
+        started = time.time()
         if (
             unreferenced_error_count := report_unreferenced_references(
                 structured_data, printf=PRINT_OUTPUT
             )
         ) > 0:
             nerrors += unreferenced_error_count
+        if debug:
+            PRINT(
+                f"DEBUG: Unreferenced items check time: {time.time() - started:.3f} seconds"
+                f" | Unreferenced items: {unreferenced_error_count}"
+            )
 
     return not (nerrors > 0)
 
@@ -2843,6 +3003,7 @@ def _validate_references(
 
     normalize(ref_errors)
     ref_validation_errors = []
+    ref_validation_errors_by_ref = {}
     ref_validation_errors_truncated = None
     if isinstance(ref_errors, list):
         for ref_error in ref_errors:
@@ -2859,10 +3020,8 @@ def _validate_references(
                 ref_validation_errors.append(ref_error)
             else:
                 if ref := ref_error.get("error"):
-                    if ref_error_existing := [
-                        r for r in ref_validation_errors if r.get("ref") == ref
-                    ]:
-                        ref_error_existing = ref_error_existing[0]
+                    # Group by ref via dictionary (rather than searching the list) so this is linear.
+                    if ref_error_existing := ref_validation_errors_by_ref.get(ref):
                         ref_error_existing["count"] += 1
                         if isinstance(src := ref_error.get("src"), dict):
                             if isinstance(ref_error_existing.get("srcs"), list):
@@ -2874,6 +3033,7 @@ def _validate_references(
                         if isinstance(src := ref_error.get("src"), dict):
                             ref_validation_error["srcs"] = [src]
                         ref_validation_errors.append(ref_validation_error)
+                        ref_validation_errors_by_ref[ref] = ref_validation_error
     if debug:
         ref_validation_errors = sorted(ref_validation_errors)
     else:
@@ -2885,20 +3045,33 @@ def _validate_references(
     return ref_validation_errors
 
 
+# Maximum number of (distinct) reference errors, and of (collapsed) source lines for
+# each, to output for reference errors; unless --verbose (or --debug) is specified.
+_REFERENCE_ERRORS_MAX = 100
+_REFERENCE_ERROR_SRCS_MAX = 10
+
+
 def _print_reference_errors(
     ref_errors: List[dict], verbose: bool = False, debug: bool = False
 ) -> None:
-    if errors := _format_reference_errors(
+    # Streamed, i.e. each line is output as soon as it is formatted.
+    for error in _generate_reference_errors(
         ref_errors=ref_errors, verbose=verbose, debug=debug
     ):
-        for error in errors:
-            PRINT_OUTPUT(error)
+        PRINT_OUTPUT(error)
 
 
 def _format_reference_errors(
     ref_errors: List[dict], verbose: bool = False, debug: bool = False
 ) -> List[str]:
-    errors = []
+    return list(
+        _generate_reference_errors(ref_errors=ref_errors, verbose=verbose, debug=debug)
+    )
+
+
+def _generate_reference_errors(
+    ref_errors: List[dict], verbose: bool = False, debug: bool = False
+) -> Generator[str, None, None]:
     if isinstance(ref_errors, list) and ref_errors:
         nref_errors = len(
             [
@@ -2908,17 +3081,22 @@ def _format_reference_errors(
                 or (not r.get("ref", "").startswith("Truncated"))
             ]
         )
-        errors.append(f"- Reference errors: {nref_errors}")
+        yield f"- Reference errors: {nref_errors}"
         if debug:
             for ref_error in ref_errors:
-                errors.append(f"  - ERROR: {ref_error}")
+                yield f"  - ERROR: {ref_error}"
         else:
             truncated = None
+            nref_errors_output = 0
             for ref_error in ref_errors:
                 if ref_error["ref"].startswith("Truncated"):
                     truncated = ref_error["ref"]
-                elif isinstance(count := ref_error.get("count"), int):
-                    errors.append(f"  - ERROR: {ref_error['ref']} (refs: {count})")
+                    continue
+                if (not verbose) and (nref_errors_output >= _REFERENCE_ERRORS_MAX):
+                    continue
+                nref_errors_output += 1
+                if isinstance(count := ref_error.get("count"), int):
+                    yield f"  - ERROR: {ref_error['ref']} (refs: {count})"
                     if isinstance(srcs := ref_error.get("srcs"), list):
                         # Convert dict issues → formatted strings
                         formatted_srcs = [_format_src(item) for item in srcs]
@@ -2928,14 +3106,23 @@ def _format_reference_errors(
                             formatted_srcs, verbose
                         )
 
+                        if (not verbose) and (len(final_src_lines) > _REFERENCE_ERROR_SRCS_MAX):
+                            nmore = len(final_src_lines) - _REFERENCE_ERROR_SRCS_MAX
+                            final_src_lines = final_src_lines[:_REFERENCE_ERROR_SRCS_MAX]
+                            final_src_lines.append(f"And {nmore} more (use --verbose to see all)")
+
                         for line in final_src_lines:
-                            errors.append(f"    - {line}")
+                            yield f"    - {line}"
 
                 else:
-                    errors.append(f"  - ERROR: {ref_error['ref']}")
+                    yield f"  - ERROR: {ref_error['ref']}"
+            if nref_errors_output < nref_errors:
+                yield (
+                    f"  - And {nref_errors - nref_errors_output} more reference errors"
+                    f" (use --verbose to see all)"
+                )
             if truncated:
-                errors.append(f"  - {truncated}")
-    return errors
+                yield f"  - {truncated}"
 
 
 def _validate_initial(structured_data: StructuredDataSet, portal: Portal) -> List[str]:
@@ -3101,7 +3288,12 @@ def _print_structured_data_status(
 
     # TODO: Allow abort of compare by returning some value from the
     # progress callback that just breaks out of the loop in structured_data.
-    diffs = structured_data.compare(progress=define_progress_callback(debug=debug))
+    # The existing portal objects are prefetched in bulk, rather than looked up individually by compare.
+    with prefetched_existing_objects(structured_data) as existing_objects:
+        diffs = structured_data.compare(progress=define_progress_callback(debug=debug))
+    if debug:
+        PRINT(f"DEBUG: Existing objects prefetched: {existing_objects.nfound}"
+              f" | Queries: {existing_objects.nqueries}")
 
     ncreates = 0
     nupdates = 0
@@ -3252,6 +3444,9 @@ def _collapse_consecutive_ints(int_strings: List[str]) -> str:
     return ", ".join(collapsed)
 
 
+_SRC_ROW_REGEX = re.compile(r"^(.*?) \[row: (\d+)\]$")
+
+
 def _collapse_formatted_srcs(srcs: List[str], verbose: bool = False) -> List[str]:
     """
     Collapse sources by prefix, but if a given src does not match the expected
@@ -3265,13 +3460,12 @@ def _collapse_formatted_srcs(srcs: List[str], verbose: bool = False) -> List[str
     if verbose and len(srcs) > 1:
         return srcs
 
-    row_re = re.compile(r"^(.*?) \[row: (\d+)\]$")
     grouped: Dict[str, List[str]] = {}
     invalid_srcs: List[str] = []
 
     # Parse sources into valid and invalid
     for s in srcs:
-        m = row_re.match(s)
+        m = _SRC_ROW_REGEX.match(s)
         if not m:
             # Collect invalid strings instead of aborting collapse
             invalid_srcs.append(s)
@@ -3345,6 +3539,7 @@ def _define_portal(
     verbose: bool = False,
     note: Optional[str] = None,
     ping: bool = False,
+    startup_probes: Optional[StartupProbes] = None,
 ) -> Portal:
 
     def get_default_keys_file():
@@ -3432,6 +3627,9 @@ def _define_portal(
             raise Exception(
                 f"No portal key defined; setup your ~/.{app or 'smaht'}-keys.json file and use the --env argument."
             )
+    if startup_probes is None:
+        startup_probes = StartupProbes()
+    startup_probes.start(portal)
     if report:
         message = (
             f"SMaHT submitr version: {get_version()}"
@@ -3460,22 +3658,23 @@ def _define_portal(
             f"Portal environment (in keys file) is: {portal.env}{' (from SMAHT_ENV)' if env_from_env else ''}"
         )
         PRINT(f"Portal keys file is: {format_path(portal.keys_file)}")
-        portal_version = portal.get_version()
+        portal_version = startup_probes.result("version", portal.get_version)
         PRINT(
             f"Portal server is: {portal.server}{f' ({portal_version})' if portal_version else ''}"
         )
         if portal.key_id and len(portal.key_id) > 2:
             PRINT(f"Portal key prefix is: {portal.key_id[:2]}******")
-    if ping and not portal.ping():
+    if ping and not startup_probes.result("ping", portal.ping):
         PRINT(f"Cannot ping Portal!")
         sys.exit(1)
+    run_metrics.set_server(portal.server)
     return portal
 
 
 @lru_cache(maxsize=1)
 def _get_consortia(portal: Portal) -> List[str]:
     results = []
-    if consortia := portal.get_metadata("/consortia?limit=1000"):
+    if consortia := cached_get_json(portal, "/consortia?limit=1000"):
         consortia = sorted(
             consortia.get("@graph", []), key=lambda key: key.get("identifier")
         )
@@ -3490,7 +3689,7 @@ def _get_consortia(portal: Portal) -> List[str]:
 @lru_cache(maxsize=1)
 def _get_submission_centers(portal: Portal) -> List[str]:
     results = []
-    if submission_centers := portal.get_metadata("/submission-centers?limit=1000"):
+    if submission_centers := cached_get_json(portal, "/submission-centers?limit=1000"):
         submission_centers = sorted(
             submission_centers.get("@graph", []), key=lambda key: key.get("identifier")
         )
@@ -3516,6 +3715,17 @@ def _get_submission_center(portal: Portal, submission_center: str) -> Optional[s
     return None
 
 
+def _get_unresolved_refs(portal: Portal, refs: List[dict]) -> List[dict]:
+    """
+    Returns the list of the given refs (i.e. from StructuredDataSet.unchecked_refs) which do not exist, either
+    internally or in the portal; the latter are resolved in bulk (see ref_resolver.resolve_refs) with any not
+    resolved this way (e.g. root references) falling back to the usual individual lookup.
+    """
+    refs = [ref for ref in refs if not portal.ref_exists_internally(ref.get("path"))]
+    resolved_refs = resolve_refs(portal, [ref.get("path") for ref in refs])
+    return [ref for ref in refs if not resolved_refs.get(ref.get("path")) and not portal.ref_exists(ref.get("path"))]
+
+
 def _print_metadata_file_info(
     file: str,
     env: str,
@@ -3600,11 +3810,7 @@ def _print_metadata_file_info(
                 verbose=verbose,
             )
             if structured_data.portal and (
-                unresolved_refs := [
-                    ref
-                    for ref in unchecked_refs
-                    if not structured_data.portal.ref_exists(ref.get("path"))
-                ]
+                unresolved_refs := _get_unresolved_refs(structured_data.portal, unchecked_refs)
             ):
                 if unresolved_refs:
                     PRINT(f"Unresolved External References: {len(unresolved_refs)}")
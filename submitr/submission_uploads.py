@@ -8,6 +8,7 @@ from dcicutils.structured_data import Portal, StructuredDataSet
 from submitr.file_for_upload import FileForUpload, FilesForUpload
 from submitr.output import PRINT
 from submitr.rclone import RCloneStore
+from submitr.run_metrics import PHASE_UPLOADS, run_metrics
 from submitr.s3_upload import upload_file_to_aws_s3
 from submitr.utils import tobool
 
@@ -215,8 +216,9 @@ def upload_files(files: List[FileForUpload], portal: Portal) -> None:
         PRINT("No files to upload.")
         return
     if yes_or_no(f"Ready to actually upload ({len(files)}) file{'s' if len(files) != 1 else ''}. Upload now?"):
-        for file in files:
-            upload_file(file, portal=portal)
+        with run_metrics.phase(PHASE_UPLOADS):
+            for file in files:
+                upload_file(file, portal=portal)
     PRINT("Upload process complete.")
 
 
@@ -1,6 +1,6 @@
 import pytest
 from unittest import mock
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 # Test Constants
 NDRI_TISSUE_SUBMITTED_ID = "NDRI_TISSUE_SMHT001-3A-LUNG"
@@ -95,7 +95,7 @@ def mock_tissue_cache():
     return {}
 
 
-def make_structured_data_mock(data_dict: Dict = None, portal_key: Dict = None):
+def make_structured_data_mock(data_dict: Dict = None, portal_key: Dict = None, spec: Optional[type] = None):
     """
     Create a mock StructuredDataSet with specified data.
 
@@ -103,8 +103,9 @@ def make_structured_data_mock(data_dict: Dict = None, portal_key: Dict = None):
     - .data dict (defaults to empty dict)
     - .portal.key (defaults to MOCK_PORTAL_KEY)
     - .note_validation_error() as Mock for call tracking
+    - the given spec, if any (e.g. StructuredDataSet, for code which checks isinstance)
     """
-    mock_structured_data = mock.Mock()
+    mock_structured_data = mock.Mock(spec=spec)
     mock_structured_data.data = data_dict if data_dict is not None else {}
     mock_structured_data.portal = mock.Mock()
     mock_structured_data.portal.key = portal_key or MOCK_PORTAL_KEY
@@ -0,0 +1,65 @@
+import re
+import pytest
+from unittest.mock import Mock
+from dcicutils.structured_data import StructuredDataSet
+from submitr.validators import decorators
+from submitr.validators.decorators import (
+    define_structured_data_validator_hook,
+    define_structured_data_validator_sheet_hook,
+    structured_data_validator_columns_hook,
+)
+from submitr.validators.utils.regex import search_column
+
+
+@pytest.fixture
+def column_validators(monkeypatch):
+    monkeypatch.setattr(decorators, "_COLUMN_VALIDATORS", [])
+    monkeypatch.setattr(decorators, "_COLUMN_VALIDATORS_COLUMNS", {})
+    monkeypatch.setattr(decorators, "_FINISH_VALIDATORS", [])
+    monkeypatch.setattr(decorators, "_SHEET_VALIDATORS", {})
+
+
+def test_columns_hook(column_validators):
+    calls = []
+
+    @structured_data_validator_columns_hook("Tissue", ["external_id", "category"])
+    def tissue_validator(structured_data, schema, columns, rows, **kwargs):
+        calls.append(("tissue", schema, columns, rows, kwargs))
+
+    @structured_data_validator_columns_hook("*", "submitted_id")
+    def all_validator(structured_data, schema, columns, rows, **kwargs):
+        calls.append(("all", schema, columns, rows, kwargs))
+
+    structured_data = Mock(spec=StructuredDataSet)
+    hook = define_structured_data_validator_hook(valid_submission_centers="smaht")
+    sheet_hook = define_structured_data_validator_sheet_hook()
+    for row, values in enumerate([{"submitted_id": "T1", "external_id": "E1", "category": "Core"},
+                                  {"submitted_id": "T2", "category": "Cells", "other": "x"},
+                                  {"other": "y"}], start=1):
+        for column, value in values.items():
+            assert hook(structured_data, "Tissue", column, row, value) == value
+    assert calls == []
+    sheet_hook(structured_data, "Tissue", [])
+    assert calls == [
+        ("tissue", "Tissue", {"external_id": ["E1", None], "category": ["Core", "Cells"]}, [1, 2],
+         {"valid_submission_centers": "smaht"}),
+        ("all", "Tissue", {"submitted_id": ["T1", "T2"]}, [1, 2], {"valid_submission_centers": "smaht"}),
+    ]
+    calls.clear()
+    # Values for a different schema flush those for the previous one; finish flushes the rest.
+    hook(structured_data, "Donor", "submitted_id", 1, "D1")
+    hook(structured_data, "Sample", "submitted_id", 1, "S1")
+    assert [call[:4] for call in calls] == [("all", "Donor", {"submitted_id": ["D1"]}, [1])]
+    hook.finish(structured_data)
+    assert [call[:4] for call in calls] == [("all", "Donor", {"submitted_id": ["D1"]}, [1]),
+                                            ("all", "Sample", {"submitted_id": ["S1"]}, [1])]
+
+
+def test_search_column():
+    regex = re.compile(r"-[13]A-(?:00[1-9]|0[1-9][0-9])X$")
+    values = ["S-1A-001X", "S-2A-001X", None, "", "S-3A-099X", "S-1A-001X\nS-1A-001X", 123, "S-1A-001Xy"]
+    assert search_column(regex, values) == [regex.search(value) is not None if isinstance(value, str) else False
+                                            for value in values]
+    assert search_column(regex, values) == [True, False, False, False, True, True, False, False]
+    assert search_column(re.compile(r"^A"), ["AB", "BA", "A"]) == [True, False, True]
+    assert search_column(regex, []) == []
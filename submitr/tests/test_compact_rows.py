@@ -0,0 +1,80 @@
+import copy
+import json
+import openpyxl
+from dcicutils.structured_data import StructuredDataSet
+from dcicutils.submitr.custom_excel import CustomExcel
+from submitr.compact_rows import CompactRows, compact_structured_data
+from submitr.streaming_excel import StreamingExcel
+from submitr.validators import decorators
+from submitr.validators.decorators import define_structured_data_validator_hook
+from submitr.validators.utils.index import get_schema_index
+
+
+def test_compact_rows():
+    items = [{"submitted_id": "X_DONOR_D1", "age": 50, "tags": ["a", "b"]},
+             {"submitted_id": "X_DONOR_D2", "age": 60, "tags": None},
+             {"submitted_id": "X_DONOR_D3"}]
+    rows = CompactRows(copy.deepcopy(items))
+    assert isinstance(rows, list) and len(rows) == 3
+    # Stored as tuples with the tuple of property names shared across rows having the same properties.
+    stored = list.__getitem__(rows, slice(None))
+    assert all(isinstance(row, tuple) for row in stored)
+    assert stored[0][-1] is stored[1][-1]
+    assert rows == items and list(rows) == items and [item for item in rows] == items
+    assert rows[0] == items[0] and rows[-1] == items[-1] and rows[1:] == items[1:]
+    assert list(reversed(rows)) == list(reversed(items))
+    assert json.loads(json.dumps({"Donor": rows})) == {"Donor": items}
+    assert sorted(rows, key=lambda item: item["submitted_id"], reverse=True)[0] == items[2]
+    assert copy.deepcopy(rows) == items and isinstance(copy.deepcopy(rows), CompactRows)
+    assert {"submitted_id": "X_DONOR_D3"} in rows and rows.index({"submitted_id": "X_DONOR_D3"}) == 2
+    # Items are built on demand so changes must be written back.
+    item = rows[2]
+    item["age"] = 70
+    assert rows[2] == {"submitted_id": "X_DONOR_D3"}
+    rows[2] = item
+    assert rows[2] == {"submitted_id": "X_DONOR_D3", "age": 70}
+    rows.append({"submitted_id": "X_DONOR_D4"})
+    rows.extend([{"submitted_id": "X_DONOR_D5"}])
+    assert [item["submitted_id"] for item in rows][-2:] == ["X_DONOR_D4", "X_DONOR_D5"]
+    assert rows.pop() == {"submitted_id": "X_DONOR_D5"} and len(rows) == 4
+
+
+def test_compact_rows_schema_index():
+    rows = CompactRows([{"submitted_id": "A", "file_sets": ["F1"]}, {"submitted_id": "B", "file_sets": ["F1", "F2"]},
+                        {"submitted_id": "A"}])
+    structured_data = StructuredDataSet(None)
+    structured_data.data["UnalignedReads"] = rows
+    index = get_schema_index(structured_data, "UnalignedReads")
+    assert index.items("A") == [rows[0], rows[2]]
+    assert index.items_in(["B", "A"]) == list(rows)
+    assert index.referencing("file_sets", "F1") == [rows[0], rows[1]]
+
+
+def test_compact_rows_structured_data(monkeypatch, tmp_path):
+    file = str(tmp_path / "compact.xlsx")
+    workbook = openpyxl.Workbook()
+    workbook.active.title = "Donor"
+    for row in [["submitted_id", "age"], ["X_DONOR_D1", 50], ["X_DONOR_D2", None]]:
+        workbook["Donor"].append(row)
+    workbook.create_sheet("Tissue")
+    for row in [["submitted_id", "donor", "comment"],
+                ["X_TISSUE_T1", "X_DONOR_D1", "x"], ["X_TISSUE_T2", "X_DONOR_D2", None]]:
+        workbook["Tissue"].append(row)
+    workbook.save(file)
+    seen = {}
+
+    def finish_validator(structured_data, **kwargs):
+        seen.update({schema: (type(items), list(items)) for schema, items in structured_data.data.items()})
+
+    monkeypatch.setattr(decorators, "_FINISH_VALIDATORS", [finish_validator])
+    structured_data = StructuredDataSet(None, excel_class=StreamingExcel,
+                                        validator_hook=define_structured_data_validator_hook(compact_rows=True))
+    structured_data.load_file(file)
+    expected = StructuredDataSet(None, excel_class=CustomExcel)
+    expected.load_file(file)
+    assert list(structured_data.data) == ["Donor", "Tissue"]
+    assert all(isinstance(items, CompactRows) for items in structured_data.data.values())
+    assert structured_data.data == expected.data
+    assert seen == {schema: (CompactRows, items) for schema, items in expected.data.items()}
+    compact_structured_data(structured_data)
+    assert structured_data.data == expected.data
@@ -0,0 +1,57 @@
+import json
+import os
+from unittest import mock
+from submitr.disk_cache import DiskCache
+
+
+def test_disk_cache(tmp_path):
+    cache = DiskCache("test", directory=str(tmp_path))
+    assert cache.get("a") is None
+    assert cache.get("a", default=[]) == []
+    cache.set("a", {"x": 1})
+    cache.set("b", [])
+    assert cache.get("a") == {"x": 1}
+    assert cache.get("b") == []
+    assert not os.path.exists(cache.file)
+    cache.save()
+    with open(cache.file) as f:
+        assert set(json.load(f)["entries"].keys()) == {"a", "b"}
+    cache = DiskCache("test", directory=str(tmp_path))
+    assert cache.get("a") == {"x": 1}
+    assert len(cache) == 2
+    cache.delete("a")
+    cache.save()
+    assert DiskCache("test", directory=str(tmp_path)).get("a") is None
+    cache.clear()
+    assert not os.path.exists(cache.file)
+    assert len(cache) == 0
+
+
+def test_disk_cache_ttl(tmp_path):
+    cache = DiskCache("test", ttl=60, directory=str(tmp_path))
+    with mock.patch("submitr.disk_cache.time.time", return_value=1000):
+        cache.set("a", "value")
+        cache.save()
+    with mock.patch("submitr.disk_cache.time.time", return_value=1059):
+        assert DiskCache("test", ttl=60, directory=str(tmp_path)).get("a") == "value"
+    with mock.patch("submitr.disk_cache.time.time", return_value=1061):
+        assert DiskCache("test", ttl=60, directory=str(tmp_path)).get("a") is None
+        assert DiskCache("test", directory=str(tmp_path)).get("a") == "value"
+
+
+def test_disk_cache_corrupt_file(tmp_path):
+    with open(os.path.join(str(tmp_path), "test.json"), "w") as f:
+        f.write("not json")
+    cache = DiskCache("test", directory=str(tmp_path))
+    assert cache.get("a") is None
+    cache.set("a", 1)
+    cache.save()
+    assert DiskCache("test", directory=str(tmp_path)).get("a") == 1
+
+
+def test_disk_cache_permissions(tmp_path):
+    cache = DiskCache("test", directory=str(tmp_path / "cache"))
+    cache.set("a", 1)
+    cache.save()
+    assert os.stat(os.path.dirname(cache.file)).st_mode & 0o777 == 0o700
+    assert os.stat(cache.file).st_mode & 0o777 == 0o600
@@ -0,0 +1,34 @@
+from unittest.mock import Mock
+from dcicutils.structured_data import StructuredDataSet
+from submitr.validators.decorators import define_structured_data_validator_sheet_hook
+from submitr.validators.duplicate_row_validator import _find_duplicate_elements
+
+
+def test_find_duplicate_elements():
+    assert _find_duplicate_elements(None) == []
+    assert _find_duplicate_elements([]) == []
+    assert _find_duplicate_elements([{"a": 1}, {"a": 2}]) == []
+    rows = [
+        {"a": 1, "b": ["x", "y"]},   # 0
+        {"b": ["x", "y"], "a": 1},   # 1 - same as 0 (key order does not matter)
+        {"a": 1, "b": ["y", "x"]},   # 2 - list order matters
+        {"a": True, "b": ["x", "y"]},  # 3 - True is not 1
+        {"a": 1.0, "b": ["x", "y"]},   # 4 - 1.0 is not 1
+        {"c": {"d": None}},          # 5
+        {"a": 1, "b": ["y", "x"]},   # 6 - same as 2
+        {"c": {"d": None}},          # 7 - same as 5
+        {"a": 1, "b": ["x", "y"]},   # 8 - same as 0
+        {"a": "1", "b": ["x", "y"]},  # 9 - "1" is not 1
+    ]
+    assert _find_duplicate_elements(rows) == [[0, 1, 8], [2, 6], [5, 7]]
+
+
+def test_duplicate_row_validator_all_sheets():
+    structured_data = Mock(spec=StructuredDataSet)
+    structured_data.note_validation_error = Mock()
+    hook = define_structured_data_validator_sheet_hook()
+    hook(structured_data, "SomeSheet", [{"a": 1}, {"a": 2}, {"a": 1}, {"a": 2}, {"a": 1}])
+    assert [call.args for call in structured_data.note_validation_error.call_args_list] == [
+        ("Duplicate rows in sheet: SomeSheet (items: 2, 4 and 6)", "SomeSheet"),
+        ("Duplicate rows in sheet: SomeSheet (items: 3 and 5)", "SomeSheet"),
+    ]
@@ -0,0 +1,77 @@
+import threading
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from submitr import existing_objects as existing_objects_module
+from submitr.existing_objects import prefetched_existing_objects
+
+_EXISTING = {
+    "Donor": [{"uuid": "uuid-d1", "submitted_id": "X_DONOR_D1", "age": 50, "@type": ["Donor", "Item"]}],
+    "Sample": [{"uuid": "uuid-t1", "submitted_id": "X_TISSUE-SAMPLE_T1", "@type": ["TissueSample", "Sample"]}],
+}
+
+
+def _define_structured_data() -> mock.Mock:
+    structured_data = mock.Mock()
+    structured_data.data = {
+        "Donor": [{"submitted_id": "X_DONOR_D1", "age": 51}, {"submitted_id": "X_DONOR_D2"}],
+        "Sample": [{"submitted_id": "X_TISSUE-SAMPLE_T1"}, {"submitted_id": "X_SAMPLE_S2"}],
+    }
+    portal = structured_data.portal
+    portal.key = {"server": "http://portal-existing", "key": "k", "secret": "s"}
+    portal.get_identifying_property_names = mock.Mock(return_value=["uuid", "submitted_id"])
+    portal.get_schema_subtype_names = mock.Mock(
+        side_effect=lambda type_name: ["TissueSample", "CellSample"] if type_name == "Sample" else [])
+    portal.get = mock.Mock(return_value=mock.Mock(status_code=404))
+    return structured_data
+
+
+def _search_metadata(queries: list):
+    lock = threading.Lock()
+
+    def search_metadata(query, key):
+        args = parse_qs(urlparse(query).query)
+        assert args["frame"] == ["raw"]
+        with lock:
+            queries.append((args["type"][0], sorted(args["submitted_id"])))
+        return [item for item in _EXISTING.get(args["type"][0], []) if item["submitted_id"] in args["submitted_id"]]
+    return search_metadata
+
+
+def test_prefetched_existing_objects():
+    structured_data = _define_structured_data()
+    portal_get = structured_data.portal.get
+    queries = []
+    with mock.patch.object(existing_objects_module.ff_utils, "search_metadata",
+                           side_effect=_search_metadata(queries)):
+        with prefetched_existing_objects(structured_data, nthreads=2) as existing_objects:
+            get = structured_data.portal.get
+            response = get("/Donor/X_DONOR_D1", raw=True)
+            assert response.status_code == 200
+            assert response.json() == {"uuid": "uuid-d1", "submitted_id": "X_DONOR_D1", "age": 50}
+            assert get("/X_DONOR_D1", raw=True).status_code == 200
+            assert get("/Sample/X_TISSUE-SAMPLE_T1", raw=True).status_code == 200
+            assert get("/TissueSample/X_TISSUE-SAMPLE_T1", raw=True).status_code == 200
+            assert portal_get.call_count == 0
+            # Values searched for but not found (e.g. deleted or replaced objects which a search
+            # excludes but a GET returns) go to the portal, as does anything else.
+            assert get("/Donor/X_DONOR_D2", raw=True).status_code == 404
+            get("/X_DONOR_D2", raw=True)
+            get("/CellSample/X_TISSUE-SAMPLE_T1", raw=True)
+            assert portal_get.call_count == 3
+            get("/Donor/X_DONOR_D3", raw=True)
+            get("/Donor/X_DONOR_D1")
+            get("/Software/X_DONOR_D1", raw=True)
+            assert portal_get.call_count == 6
+    assert sorted(queries) == [("Donor", ["X_DONOR_D1", "X_DONOR_D2"]),
+                               ("Sample", ["X_SAMPLE_S2", "X_TISSUE-SAMPLE_T1"])]
+    assert existing_objects.nqueries == 2 and existing_objects.nfound == 2
+    assert structured_data.portal.get is portal_get
+
+
+def test_prefetched_existing_objects_search_error():
+    structured_data = _define_structured_data()
+    portal_get = structured_data.portal.get
+    with mock.patch.object(existing_objects_module.ff_utils, "search_metadata", side_effect=Exception("error")):
+        with prefetched_existing_objects(structured_data):
+            structured_data.portal.get("/Donor/X_DONOR_D1", raw=True)
+            assert portal_get.call_count == 1
@@ -0,0 +1,129 @@
+import threading
+import pytest
+from submitr.validators import decorators
+from submitr.validators.decorators import structured_data_validator_finish_hook, _run_finish_validators
+
+
+class _StructuredData:
+
+    def __init__(self) -> None:
+        self.data = {}
+        self.validation_errors = []
+
+    def note_validation_error(self, validation_error: str, schema_name=None, row_number=None) -> None:
+        self.validation_errors.append({"error": validation_error})
+
+
+class _StructuredDataCopyingErrors(_StructuredData):
+
+    # I.e. where validation_errors is a copy, so the errors can only be (and are) ordered as they are noted.
+    @property
+    def validation_errors(self) -> list:
+        return list(self._validation_errors)
+
+    @validation_errors.setter
+    def validation_errors(self, value: list) -> None:
+        self._validation_errors = value
+
+    def note_validation_error(self, validation_error: str, schema_name=None, row_number=None) -> None:
+        self._validation_errors.append({"error": validation_error})
+
+
+@pytest.fixture
+def finish_validators(monkeypatch):
+    monkeypatch.setattr(decorators, "_FINISH_VALIDATORS", [])
+    monkeypatch.setattr(decorators, "_FINISH_VALIDATORS_INFO", {})
+    return decorators._FINISH_VALIDATORS
+
+
+@pytest.mark.parametrize("structured_data_class", [_StructuredData, _StructuredDataCopyingErrors])
+def test_finish_validators_concurrent_with_deterministic_errors(finish_validators, structured_data_class):
+    second_started = threading.Event()
+    events = []
+
+    @structured_data_validator_finish_hook(sheets=[], io=True)
+    def first(structured_data, **kwargs):
+        # Waits for the second (I/O) validator to start, which it only can if run concurrently.
+        if not second_started.wait(timeout=5):
+            structured_data.note_validation_error("first: not concurrent")
+        events.append("first")
+        structured_data.note_validation_error("first: 1")
+        structured_data.note_validation_error("first: 2")
+
+    @structured_data_validator_finish_hook(sheets=["Tissue"], io=True)
+    def second(structured_data, **kwargs):
+        second_started.set()
+        events.append("second")
+        structured_data.note_validation_error("second: 1")
+
+    @structured_data_validator_finish_hook(sheets=["FileSet"])
+    def third(structured_data, **kwargs):
+        events.append("third")
+        structured_data.note_validation_error(f"third: {kwargs['value']}")
+
+    @structured_data_validator_finish_hook(sheets=["FileSet", "Tissue"])
+    def fourth(structured_data, **kwargs):
+        # Overlaps sheets with second and third so runs after them.
+        assert "second" in events and "third" in events
+        events.append("fourth")
+        structured_data.note_validation_error("fourth: 1")
+
+    @structured_data_validator_finish_hook(after=["fourth"])
+    def fifth(structured_data, **kwargs):
+        assert "fourth" in events
+        events.append("fifth")
+
+    structured_data = structured_data_class()
+    structured_data.note_validation_error("existing")
+    _run_finish_validators(structured_data, finish_validators, nthreads=4, value=123)
+    assert sorted(events) == ["fifth", "first", "fourth", "second", "third"]
+    assert events.index("first") > events.index("second")
+    assert [error["error"] for error in structured_data.validation_errors] == [
+        "existing", "first: 1", "first: 2", "second: 1", "third: 123", "fourth: 1"]
+    assert structured_data.note_validation_error.__func__ is structured_data_class.note_validation_error
+
+
+def test_finish_validators_sequential_and_exceptions(finish_validators):
+    events = []
+
+    @structured_data_validator_finish_hook
+    def first(structured_data, **kwargs):
+        events.append("first")
+        raise Exception("first failed")
+
+    @structured_data_validator_finish_hook(sheets=["Donor"], io=True)
+    def second(structured_data, **kwargs):
+        events.append("second")
+
+    assert decorators._FINISH_VALIDATORS_INFO[first]["sheets"] is None
+    assert decorators._get_finish_validator_dependencies(finish_validators) == [set(), {0}]
+    with pytest.raises(Exception, match="first failed"):
+        _run_finish_validators(_StructuredData(), finish_validators, nthreads=4)
+    assert events == ["first"]
+    events.clear()
+    with pytest.raises(Exception, match="first failed"):
+        _run_finish_validators(_StructuredData(), finish_validators, nthreads=1)
+    assert events == ["first"]
+
+
+def test_finish_validators_concurrent_stops_after_exception(finish_validators):
+    events = []
+
+    @structured_data_validator_finish_hook(sheets=["Donor"], io=True)
+    def first(structured_data, **kwargs):
+        events.append("first")
+        raise Exception("first failed")
+
+    @structured_data_validator_finish_hook(sheets=["Donor"], io=True)
+    def second(structured_data, **kwargs):
+        events.append("second")
+
+    @structured_data_validator_finish_hook(sheets=["Tissue"])
+    def third(structured_data, **kwargs):
+        events.append("third")
+
+    # The third validator is independent of the first so it may (or may not) have started before the first
+    # raised; the second depends on the first and so must never be started.
+    with pytest.raises(Exception, match="first failed"):
+        _run_finish_validators(_StructuredData(), finish_validators, nthreads=4)
+    assert "first" in events and "second" not in events
@@ -0,0 +1,86 @@
+from unittest import mock
+from dcicutils.tmpfile_utils import temporary_directory
+from submitr.disk_cache import DiskCache
+from submitr.http_cache import CachedResponse, cached_get, cached_get_json
+
+
+class _Response:
+
+    def __init__(self, status_code: int, body: object = None, headers: dict = None) -> None:
+        self.status_code = status_code
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self) -> object:
+        return self._body
+
+
+def _define_portal(responses: list) -> mock.Mock:
+    portal = mock.Mock(server="https://portal.example.org", key_id="ABC", vapp=None)
+    portal.get = mock.Mock(side_effect=responses)
+    return portal
+
+
+def test_cached_get():
+    with temporary_directory() as tmpdir:
+        cache = DiskCache("http", directory=tmpdir)
+        consortia = {"@graph": [{"identifier": "smaht", "uuid": "uuid-1"}]}
+        portal = _define_portal([_Response(200, consortia, {"ETag": "\"v1\""}),
+                                 _Response(304), _Response(200, {"@graph": []}, {"ETag": "\"v2\""})])
+        # Initial request; cached.
+        response = cached_get(portal, "/consortia?limit=1000", cache=cache)
+        assert response.status_code == 200 and response.json() == consortia
+        assert portal.get.call_args.kwargs["headers"].get("If-None-Match") is None
+        # Within the TTL; no request.
+        response = cached_get(portal, "/consortia?limit=1000", cache=cache)
+        assert isinstance(response, CachedResponse) and response.json() == consortia
+        assert portal.get.call_count == 1
+        # After the TTL; conditional request, not modified.
+        with mock.patch("submitr.http_cache.time.time", return_value=cache.get(
+                "https://portal.example.org|ABC|/consortia?limit=1000")["time"] + 3600):
+            response = cached_get(portal, "/consortia?limit=1000", cache=cache)
+            assert portal.get.call_count == 2
+            assert portal.get.call_args.kwargs["headers"]["If-None-Match"] == "\"v1\""
+            assert response.status_code == 200 and response.json() == consortia
+        # Revalidated; so no request again within the TTL.
+        assert cached_get(portal, "/consortia?limit=1000", cache=cache).json() == consortia
+        assert portal.get.call_count == 2
+        # Modified.
+        with mock.patch("submitr.http_cache.time.time", return_value=cache.get(
+                "https://portal.example.org|ABC|/consortia?limit=1000")["time"] + 3600):
+            assert cached_get(portal, "/consortia?limit=1000", cache=cache).json() == {"@graph": []}
+        assert cache.get("https://portal.example.org|ABC|/consortia?limit=1000")["etag"] == "\"v2\""
+
+
+def test_cached_get_not_cached():
+    with temporary_directory() as tmpdir:
+        cache = DiskCache("http", directory=tmpdir)
+        portal = _define_portal([_Response(403, {"Title": "Not logged in."}), _Response(200, {"title": "Some User"})])
+        with mock.patch("submitr.http_cache._get_http_cache", return_value=cache):
+            assert cached_get_json(portal, "/me?format=json") is None
+            assert cached_get_json(portal, "/me?format=json") == {"title": "Some User"}
+            assert cached_get_json(portal, "/me?format=json") == {"title": "Some User"}
+        assert portal.get.call_count == 2
+        # A different user (access key) does not share cached responses.
+        portal = _define_portal([_Response(200, {"title": "Another User"})])
+        portal.key_id = "DEF"
+        with mock.patch("submitr.http_cache._get_http_cache", return_value=cache):
+            assert cached_get_json(portal, "/me?format=json") == {"title": "Another User"}
+        # Zero TTL bypasses the cache entirely.
+        portal = _define_portal([_Response(200, {"title": "Some User"})])
+        with mock.patch("submitr.http_cache._get_http_cache", return_value=cache):
+            assert cached_get_json(portal, "/me?format=json", ttl=0) == {"title": "Some User"}
+        assert portal.get.call_args.kwargs == {}
+
+
+def test_cached_get_revalidate():
+    with temporary_directory() as tmpdir:
+        cache = DiskCache("http", directory=tmpdir)
+        portal = _define_portal([_Response(200, {"title": "Some User"}, {"ETag": "\"v1\""}), _Response(304),
+                                 _Response(401, {"title": "Not logged in."})])
+        assert cached_get(portal, "/me?format=json", revalidate=True, cache=cache).json() == {"title": "Some User"}
+        # Within the TTL but still (conditionally) requested; so e.g. a revoked access key is not accepted.
+        assert cached_get(portal, "/me?format=json", revalidate=True, cache=cache).json() == {"title": "Some User"}
+        assert portal.get.call_args.kwargs["headers"]["If-None-Match"] == "\"v1\""
+        assert cached_get(portal, "/me?format=json", revalidate=True, cache=cache).status_code == 401
+        assert portal.get.call_count == 3
@@ -0,0 +1,63 @@
+import json
+import os
+import requests
+from unittest import mock
+from dcicutils.tmpfile_utils import temporary_directory
+from submitr import http_tracer as http_tracer_module
+from submitr.http_tracer import HttpTrace, add_http_listener, normalize_endpoint, remove_http_listener
+
+
+def test_normalize_endpoint():
+    assert normalize_endpoint("https://portal/health?format=json") == "/health?format={value}"
+    assert normalize_endpoint("https://portal/Donor/SMAHT_DONOR_1?frame=raw") == "/Donor/{id}?frame=raw"
+    assert normalize_endpoint("https://portal/Donor/some-donor") == "/Donor/{id}"
+    assert normalize_endpoint("https://portal/validators/submitted_id/X_DONOR_D1") == "/validators/submitted_id/{id}"
+    assert normalize_endpoint("https://portal/ingestion-submissions/d3a6ca53-2c25-4b16-a5f5-0a2d0d4c1d33/") == (
+        "/ingestion-submissions/{uuid}/")
+    assert normalize_endpoint("https://portal/files/SMAFI123ABC/@@upload") == "/files/{id}/@@upload"
+    assert normalize_endpoint("https://portal/search/?type=Donor&submitted_id=A1&submitted_id=B2&frame=raw") == (
+        "/search/?frame=raw&submitted_id={value}&type=Donor")
+    assert normalize_endpoint("https://portal/consortia?limit=1000") == "/consortia?limit=1000"
+
+
+def _record(method: str, url: str, latency: float, status: int = 200, nbytes: int = 100) -> dict:
+    return {"timestamp": 0, "method": method, "url": url, "status": status, "latency": latency, "bytes": nbytes}
+
+
+def test_http_trace_summary():
+    trace = HttpTrace()
+    for i in range(1, 101):
+        trace(_record("GET", f"https://portal/Donor/DONOR_{i}", latency=i / 1000, status=404 if i % 10 == 0 else 200))
+    trace(_record("POST", "https://portal/submit_for_ingestion", latency=5.0))
+    summary = trace.summary()
+    assert [(item["method"], item["endpoint"]) for item in summary] == [
+        ("GET", "/Donor/{id}"), ("POST", "/submit_for_ingestion")]
+    assert summary[0]["count"] == 100 and summary[0]["errors"] == 10 and summary[0]["bytes"] == 10000
+    assert (summary[0]["p50"], summary[0]["p90"], summary[0]["p99"], summary[0]["max"]) == (0.05, 0.09, 0.099, 0.1)
+    assert summary[1]["p50"] == summary[1]["p99"] == 5.0
+    output = []
+    trace.print_summary(printf=output.append)
+    assert output[0] == "DEBUG: HTTP calls: 101 | Time: 10.050s | Bytes: 9.86 KB"
+    assert output[2].startswith("DEBUG: GET    /Donor/{id}")
+    with temporary_directory() as tmpdir:
+        trace.dump(file := os.path.join(tmpdir, "trace.ndjson"))
+        with open(file) as f:
+            records = [json.loads(line) for line in f]
+    assert len(records) == 101 and records[0]["endpoint"] == "/Donor/{id}" and records[0]["status"] == 200
+
+
+def test_http_listener():
+    response = mock.Mock(status_code=200, content=b"12345")
+    with mock.patch.object(requests.Session, "request", return_value=response) as mock_request, \
+         mock.patch.object(http_tracer_module, "_hook_installed", False):
+        trace = HttpTrace()
+        add_http_listener(trace)
+        try:
+            assert requests.get("https://portal/health") is response
+            assert mock_request.call_count == 1
+        finally:
+            remove_http_listener(trace)
+        requests.get("https://portal/health")
+    assert len(trace.records) == 1
+    assert trace.records[0]["method"] == "GET" and trace.records[0]["url"] == "https://portal/health"
+    assert trace.records[0]["status"] == 200 and trace.records[0]["bytes"] == 5
@@ -0,0 +1,53 @@
+import os
+import pytest
+import re
+import subprocess
+import sys
+from typing import Dict
+from dcicutils.misc_utils import to_integer
+
+# The guard for the import-time (cold start) of the submitr (single, pyinstaller packaged) command entry point
+# is that none of the (slow to import) modules which only the actual commands need are imported up-front; this
+# is deterministic. An import-time budget (in microseconds, as reported cumulatively by python -X importtime) is
+# only enforced if explicitly specified via the SUBMITR_IMPORT_TIME_BUDGET environment variable, as the actual
+# timing varies too much from machine to machine (and run to run) to be used as a gate by default.
+_IMPORT_TIME_BUDGET = to_integer(os.environ.get("SUBMITR_IMPORT_TIME_BUDGET"), fallback=None)
+_IMPORT_TIME_REGEX = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)\s*$")
+_SLOW_MODULES = ["boto3", "google.cloud.storage", "openpyxl", "dcicutils.structured_data",
+                 "submitr.rclone", "submitr.submission", "submitr.validators"]
+
+
+def _get_import_times(module: str) -> Dict[str, int]:
+    """
+    Returns a dictionary of the cumulative import time (microseconds) of each module imported (in
+    a fresh Python process) by importing the given module, as reported by python -X importtime.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True)
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if match := _IMPORT_TIME_REGEX.match(line):
+            import_times[match.group(4)] = int(match.group(2))
+    return import_times
+
+
+def test_import_time_submitr_command():
+    import_times = _get_import_times("submitr.scripts.submitr")
+    assert not [module for module in _SLOW_MODULES if module in import_times]
+
+
+@pytest.mark.skipif(not _IMPORT_TIME_BUDGET, reason="SUBMITR_IMPORT_TIME_BUDGET not set")
+def test_import_time_submitr_command_budget():
+    import_times = _get_import_times("submitr.scripts.submitr")
+    assert import_times["submitr.scripts.submitr"] <= _IMPORT_TIME_BUDGET, (
+        f"Import time of submitr command ({import_times['submitr.scripts.submitr']}us)"
+        f" exceeds budget ({_IMPORT_TIME_BUDGET}us).")
+
+
+def test_import_time_deferred_modules():
+    # These are needed by the submitr version command and by rcloner (respectively),
+    # but neither should need the modules which are deferred until actually used.
+    for module in ["submitr.utils", "submitr.rclone"]:
+        import_times = _get_import_times(module)
+        assert not [slow_module for slow_module in _SLOW_MODULES
+                    if slow_module in import_times and not slow_module.startswith(module)]
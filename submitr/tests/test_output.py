@@ -0,0 +1,54 @@
+import gzip
+import io
+import os
+from unittest import mock
+from dcicutils.tmpfile_utils import temporary_directory
+from submitr import output as output_module
+from submitr.output import OutputFileWriter, close_output_file, setup_for_output_file_option
+
+
+def test_output_file_writer():
+    with temporary_directory() as tmpdir:
+        file = os.path.join(tmpdir, "output.txt")
+        writer = OutputFileWriter(file, flush_interval=60, buffer_size=10)
+        writer.write("abc\n")
+        assert os.path.getsize(file) == 0  # buffered
+        writer.write("defghijk\n")
+        assert io.open(file).read() == "abc\ndefghijk\n"  # buffer size exceeded
+        writer.write("lmn\n")
+        writer.flush()
+        assert io.open(file).read() == "abc\ndefghijk\nlmn\n"
+        writer.write("opq\n")
+        writer.close()
+        assert io.open(file).read() == "abc\ndefghijk\nlmn\nopq\n"
+        writer.write("ignored\n")
+        writer.close()
+        assert io.open(file).read() == "abc\ndefghijk\nlmn\nopq\n"
+
+
+def test_output_file_writer_periodic_flush():
+    with temporary_directory() as tmpdir:
+        file = os.path.join(tmpdir, "output.txt")
+        writer = OutputFileWriter(file, flush_interval=0.01)
+        writer.write("abc\n")
+        writer._stopped.wait(0.5)
+        assert io.open(file).read() == "abc\n"
+        writer.close()
+
+
+def test_setup_for_output_file_option_compressed():
+    with temporary_directory() as tmpdir:
+        file = os.path.join(tmpdir, "output.txt.gz")
+        with mock.patch.multiple(output_module, _print=mock.DEFAULT, _show=mock.DEFAULT, PRINT=mock.DEFAULT,
+                                 PRINT_OUTPUT=mock.DEFAULT, PRINT_STDOUT=mock.DEFAULT, SHOW=mock.DEFAULT,
+                                 _OUTPUT_FILE=None):
+            try:
+                _, print_output, _, show = setup_for_output_file_option(file)
+                for i in range(1000):
+                    print_output(f"Line {i}")
+                show("Last line")
+            finally:
+                close_output_file()
+        lines = gzip.open(file, "rt").read().splitlines()
+        assert lines[0].startswith("TIME: ") and lines[1].startswith("COMMAND: ") and lines[2].startswith("VERSION: ")
+        assert lines[3:] == [f"Line {i}" for i in range(1000)] + ["Last line"]
@@ -0,0 +1,44 @@
+import os
+from dcicutils.structured_data import StructuredDataSet
+from dcicutils.submitr.custom_excel import CustomExcel
+from submitr.parallel_excel import ParallelExcel
+
+_TEST_FILES = ["submission_test.xlsx", "submission_test_with_errors.xlsx", "test_custom_column_mappings.xlsx"]
+_TEST_DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _read(excel) -> dict:
+    return {sheet_name: list(excel.sheet_reader(sheet_name)) for sheet_name in excel.sheet_names}
+
+
+def test_parallel_excel_same_as_custom_excel():
+    for file in _TEST_FILES:
+        file = os.path.join(_TEST_DATA_DIRECTORY, file)
+        excel_class = ParallelExcel.with_workers(3)
+        assert issubclass(excel_class, CustomExcel)
+        assert _read(excel_class(file)) == _read(CustomExcel(file))
+        # Sheets are parsed (by the worker processes) once per file, and shared by all instances;
+        # and released once read the specified number of times (twice by default).
+        futures = excel_class._sheets[file]
+        assert set(futures) == set(excel_class(file).sheet_names)
+        assert _read(excel_class(file)) == _read(CustomExcel(file))
+        assert excel_class._sheets[file] is futures and futures == {}
+        assert _read(excel_class(file)) == _read(CustomExcel(file))
+
+
+def test_parallel_excel_structured_data():
+    file = os.path.join(_TEST_DATA_DIRECTORY, "test_custom_column_mappings.xlsx")
+    excel_class = ParallelExcel.with_workers(2, reads=1)
+    structured_data = StructuredDataSet(None, excel_class=excel_class)
+    structured_data.load_file(file)
+    assert excel_class._sheets[file] == {}
+    expected = StructuredDataSet(None, excel_class=CustomExcel)
+    expected.load_file(file)
+    assert structured_data.data == expected.data and structured_data.data
+
+
+def test_parallel_excel_no_workers():
+    file = os.path.join(_TEST_DATA_DIRECTORY, "submission_test.xlsx")
+    excel_class = ParallelExcel.with_workers(1)
+    assert _read(excel_class(file)) == _read(CustomExcel(file))
+    assert excel_class._sheets[file] == {}
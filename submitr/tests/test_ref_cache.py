@@ -0,0 +1,46 @@
+from unittest.mock import Mock
+from submitr.disk_cache import DiskCache
+from submitr.ref_cache import clear_ref_cache, install_ref_cache
+
+
+def _define_portal(server: str, resolved: dict) -> Mock:
+    portal = Mock()
+    portal.server = server
+    portal.ref_lookup = Mock(side_effect=lambda path: resolved.get(path))
+    return portal
+
+
+def test_ref_cache(tmp_path):
+    resolved = {"/Donor/D1": {"uuid": "uuid-d1", "other": "x"}, "/Software/S1": {"uuid": "uuid-s1"}}
+    portal = _define_portal("http://portal-a", resolved)
+    ref_lookup = portal.ref_lookup
+    cache = DiskCache("refs", ttl=60, directory=str(tmp_path))
+    assert install_ref_cache(portal, cache=cache) is True
+    assert portal.ref_lookup("/Donor/D1") == {"uuid": "uuid-d1", "other": "x"}
+    assert portal.ref_lookup("/Donor/D2") is None
+    assert ref_lookup.call_count == 2
+    assert portal.ref_disk_cache_hit_count == 0
+    cache.save()
+    # Next run (new cache object reading the same file); positive lookups only are served from the cache.
+    portal = _define_portal("http://portal-a", resolved)
+    ref_lookup = portal.ref_lookup
+    cache = DiskCache("refs", ttl=60, directory=str(tmp_path))
+    install_ref_cache(portal, cache=cache)
+    assert portal.ref_lookup("/Donor/D1") == {"uuid": "uuid-d1"}
+    assert portal.ref_lookup("/Donor/D2") is None
+    assert portal.ref_lookup("/Software/S1") == {"uuid": "uuid-s1"}
+    assert [call.args for call in ref_lookup.call_args_list] == [("/Donor/D2",), ("/Software/S1",)]
+    assert portal.ref_disk_cache_hit_count == 1
+    # Different server has nothing cached.
+    portal = _define_portal("http://portal-b", resolved)
+    ref_lookup = portal.ref_lookup
+    install_ref_cache(portal, cache=cache)
+    assert portal.ref_lookup("/Donor/D1") == {"uuid": "uuid-d1", "other": "x"}
+    assert ref_lookup.call_count == 1
+    assert sorted(cache.keys()) == ["http://portal-a|/Donor/D1", "http://portal-a|/Software/S1",
+                                    "http://portal-b|/Donor/D1"]
+    # Invalidation, for a single server or entirely.
+    assert clear_ref_cache(server="http://portal-a/", cache=cache) == 2
+    assert cache.keys() == ["http://portal-b|/Donor/D1"]
+    assert clear_ref_cache(cache=cache) == 1
+    assert len(DiskCache("refs", ttl=60, directory=str(tmp_path))) == 0
@@ -0,0 +1,111 @@
+import threading
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+import openpyxl
+from submitr import ref_resolver
+from submitr.ref_resolver import RefPrefetcher, resolve_refs
+from submitr.streaming_excel import StreamingExcel
+
+_SCHEMAS = {
+    "Donor": {"identifyingProperties": ["uuid", "accession", "submitted_id"],
+              "properties": {"accession": {"type": "string", "pattern": "^SMA[DT][0-9A-Z]+$"},
+                             "submitted_id": {"type": "string", "pattern": "^[A-Z]+_DONOR_[A-Z0-9]+$"}}},
+    "Tissue": {"identifyingProperties": ["uuid", "submitted_id"],
+               "properties": {"submitted_id": {"type": "string"},
+                              "donor": {"type": "string", "linkTo": "Donor"},
+                              "protocols": {"type": "array", "items": {"type": "string", "linkTo": "Protocol"}}}},
+    "Protocol": {"identifyingProperties": ["uuid", "identifier"], "properties": {}},
+}
+_ITEMS = {
+    "Donor": [{"uuid": "uuid-d1", "submitted_id": "X_DONOR_D1"}, {"uuid": "uuid-d2", "accession": "SMADD2"}],
+    "Protocol": [{"uuid": "uuid-p1", "identifier": "P1"}, {"uuid": "uuid-p2", "identifier": "P 2"}],
+}
+
+
+def _define_portal() -> mock.Mock:
+    portal = mock.Mock()
+    portal.key = {"server": "http://portal-refs", "key": "k", "secret": "s"}
+    portal.server = "http://portal-refs"
+    portal.get_schema = mock.Mock(side_effect=lambda type_name: _SCHEMAS.get(type_name))
+    portal.ref_lookup = mock.Mock(return_value=None)
+    return portal
+
+
+def _search_metadata(queries: list):
+    lock = threading.Lock()
+
+    def search_metadata(query, key):
+        args = parse_qs(urlparse(query).query)
+        property_name = [field for field in args["field"] if field != "uuid"][0]
+        with lock:
+            queries.append((args["type"][0], property_name, sorted(args[property_name])))
+        return [item for item in _ITEMS.get(args["type"][0], []) if item.get(property_name) in args[property_name]]
+    return search_metadata
+
+
+def test_resolve_refs():
+    queries = []
+    paths = ["/Donor/X_DONOR_D1", "/Donor/SMADD2", "/Donor/X_DONOR_NOPE", "/Donor/X_DONOR_D1",
+             "/Protocol/P1", "/Protocol/P 2", "/Protocol/P3", "invalid"]
+    with mock.patch.object(ref_resolver.ff_utils, "search_metadata", side_effect=_search_metadata(queries)):
+        resolved = resolve_refs(_define_portal(), paths, nthreads=4)
+    assert resolved == {"/Donor/X_DONOR_D1": "uuid-d1", "/Donor/SMADD2": "uuid-d2", "/Donor/X_DONOR_NOPE": None,
+                        "/Protocol/P1": "uuid-p1", "/Protocol/P 2": "uuid-p2", "/Protocol/P3": None}
+    # Values are only searched for the identifying properties (in order, uuid last) whose pattern they match.
+    assert sorted(queries) == [("Donor", "accession", ["SMADD2"]),
+                               ("Donor", "submitted_id", ["X_DONOR_D1", "X_DONOR_NOPE"]),
+                               ("Protocol", "identifier", ["P 2", "P1", "P3"])]
+
+
+def test_resolve_refs_paged():
+    queries = []
+    paths = [f"/Protocol/P{i}" for i in range(250)]
+    with mock.patch.object(ref_resolver.ff_utils, "search_metadata", side_effect=_search_metadata(queries)):
+        resolved = resolve_refs(_define_portal(), paths)
+    assert [len(query[2]) for query in sorted(queries, key=lambda query: query[2][0])] == [100, 100, 50]
+    assert resolved["/Protocol/P1"] == "uuid-p1" and len(resolved) == 250
+
+
+def test_ref_prefetcher(tmp_path):
+    file = str(tmp_path / "refs.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Donor"
+    for row in [["submitted_id"], ["X_DONOR_D3"]]:
+        sheet.append(row)
+    sheet = workbook.create_sheet("Tissue")
+    for row in [["submitted_id", "donor", "protocols", "other"],
+                ["X_TISSUE_T1", "X_DONOR_D1", "P1|P 2", "x"],
+                ["X_TISSUE_T2", "X_DONOR_D1", None, "y"],
+                ["X_TISSUE_T3", "X_DONOR_D3", "P3", None]]:
+        sheet.append(row)
+    workbook.save(file)
+    portal = _define_portal()
+    ref_lookup = portal.ref_lookup
+    prefetcher = RefPrefetcher(StreamingExcel)
+    assert issubclass(prefetcher.excel_class, StreamingExcel)
+    assert prefetcher.install(portal) is True
+    queries = []
+    rows = {}
+    with mock.patch.object(ref_resolver.ff_utils, "search_metadata", side_effect=_search_metadata(queries)), \
+         mock.patch.object(ref_resolver, "is_ref_cached", side_effect=lambda server, path: path == "/Protocol/P1"), \
+         mock.patch.object(ref_resolver, "_REFS_PREFETCH_ROWS", 2):
+        excel = prefetcher.excel_class(file)
+        for sheet_name in excel.sheet_names:
+            reader = excel.sheet_reader(sheet_name)
+            # The references of each batch of rows are resolved before any of its rows is read.
+            rows[sheet_name] = [(row, reader.row_number, len(queries)) for row in reader]
+    expected = StreamingExcel(file)
+    for sheet_name in expected.sheet_names:
+        reader = expected.sheet_reader(sheet_name)
+        assert [(row, row_number) for row, row_number, _ in rows[sheet_name]] == \
+               [(row, reader.row_number) for row in reader]
+    assert [nqueries for _, _, nqueries in rows["Tissue"]] == [2, 2, 3]
+    # X_DONOR_D3 is defined within the file itself (before it is referenced), and P1 is cached, so are excluded.
+    assert sorted(queries[:2]) == [("Donor", "submitted_id", ["X_DONOR_D1"]), ("Protocol", "identifier", ["P 2"])]
+    assert queries[2:] == [("Protocol", "identifier", ["P3"])]
+    assert prefetcher.count == 2
+    assert portal.ref_lookup("/Donor/X_DONOR_D1") == {"uuid": "uuid-d1"}
+    assert portal.ref_lookup("/Protocol/P 2") == {"uuid": "uuid-p2"}
+    assert portal.ref_lookup("/Protocol/P3") is None
+    assert [call.args for call in ref_lookup.call_args_list] == [("/Protocol/P3",)]
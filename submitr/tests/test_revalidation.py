@@ -0,0 +1,55 @@
+from unittest.mock import Mock
+from dcicutils.structured_data import StructuredDataSet
+from submitr.disk_cache import DiskCache
+from submitr.validators.decorators import define_structured_data_validator_hook, _flush_column_validators
+from submitr.validators.submitted_id_validator import _submitted_id_validator_finish
+from submitr.validators.utils.revalidation import RevalidationState
+
+
+def _validate(cache: DiskCache, rows: list, statuses: dict, calls: list) -> Mock:
+
+    def get_metadata(path):
+        calls.append(submitted_id := path.split("/")[-1])
+        return {"status": statuses[submitted_id]}
+
+    structured_data = Mock(spec=StructuredDataSet)
+    structured_data.portal = Mock()
+    structured_data.portal.server = "http://portal-revalidation"
+    structured_data.portal.get_metadata = Mock(side_effect=get_metadata)
+    structured_data.portal.ref_lookup = Mock(return_value=None)
+    structured_data.note_validation_error = Mock()
+    revalidation = RevalidationState("some-file.xlsx", structured_data.portal.server, cache=cache)
+    revalidation.attach(structured_data)
+    hook = define_structured_data_validator_hook()
+    for row, (submitted_id, donor) in enumerate(rows, start=1):
+        hook(structured_data, "Tissue", "submitted_id", row, submitted_id)
+        hook(structured_data, "Tissue", "donor", row, donor)
+    _flush_column_validators(structured_data)
+    _submitted_id_validator_finish(structured_data)
+    revalidation.save()
+    structured_data.revalidation = revalidation
+    return structured_data
+
+
+def test_revalidation(tmp_path):
+    cache = DiskCache("revalidation", directory=str(tmp_path))
+    calls = []
+    rows = [("T1", "D1"), ("T2", "D1"), ("T3", "D2")]
+    statuses = {"T1": "OK", "T2": "Bad T2", "T3": "OK", "T4": "Bad T4"}
+    structured_data = _validate(cache, rows, statuses, calls)
+    assert sorted(calls) == ["T1", "T2", "T3"]
+    assert not structured_data.revalidation.has_previous
+    assert [call.args for call in structured_data.note_validation_error.call_args_list] == [("Bad T2", "Tissue", 2)]
+    # Change the donor of the third row, add a fourth row, and move the second row to the top.
+    calls.clear()
+    statuses["T2"] = "Now OK (but cached)"
+    rows = [("T2", "D1"), ("T1", "D1"), ("T3", "D3"), ("T4", "D1")]
+    structured_data = _validate(cache, rows, statuses, calls)
+    assert sorted(calls) == ["T3", "T4"]
+    assert structured_data.revalidation.counts() == {"rows": 4, "unchanged": 2, "reused": 2}
+    assert [call.args for call in structured_data.note_validation_error.call_args_list] == [
+        ("Bad T2", "Tissue", 1), ("Bad T4", "Tissue", 4)]
+    # References are not served from the (revalidation) cache; see ref_cache.
+    assert structured_data.portal.ref_lookup("/Donor/D1") is None
+    # Different file (lineage) has nothing cached.
+    assert not RevalidationState("other-file.xlsx", "http://portal-revalidation", cache=cache).has_previous
@@ -0,0 +1,85 @@
+import json
+import os
+import pytest
+from unittest import mock
+from dcicutils.tmpfile_utils import temporary_directory
+from submitr import run_metrics as run_metrics_module
+from submitr.run_metrics import (
+    COUNTER_RETRIES, COUNTER_UPLOADED_BYTES, COUNTER_UPLOAD_SECONDS, PHASE_PARSE, PHASE_UPLOADS,
+    RunMetrics, run_metrics, run_metrics_command, set_run_metrics_files
+)
+
+
+def test_run_metrics():
+    metrics = RunMetrics()
+    metrics.reset("submit-metadata-bundle")
+    metrics.set_server("https://portal.example.org")
+    with metrics.phase(PHASE_PARSE):
+        pass
+    with metrics.phase(PHASE_PARSE):
+        pass
+    metrics.begin_phase(PHASE_UPLOADS)
+    metrics.increment(COUNTER_UPLOADED_BYTES, 1000)
+    metrics.increment(COUNTER_UPLOAD_SECONDS, 2)
+    metrics.increment(COUNTER_RETRIES)
+    metrics.note_request("https://portal.example.org/Donor/D1")
+    metrics.note_request("https://portal.example.org/health")
+    metrics.note_request("https://pypi.org/pypi/smaht-submitr/json")
+    metrics.finish(1)
+    result = metrics.to_dict()
+    assert result["command"] == "submit-metadata-bundle" and result["exit_code"] == 1
+    assert set(result["phases"]) == {PHASE_PARSE, PHASE_UPLOADS}  # unfinished phase ended by finish
+    assert result["uploaded_bytes"] == 1000 and result["upload_throughput"] == 500
+    assert result["retries"] == 1 and result["portal_requests"] == 2 and result["rclone_invocations"] == 0
+    openmetrics = metrics.to_openmetrics().splitlines()
+    assert "# TYPE submitr_run_duration_seconds gauge" in openmetrics
+    assert "submitr_uploaded_bytes{command=\"submit-metadata-bundle\"} 1000" in openmetrics
+    assert "submitr_upload_throughput_bytes_per_second{command=\"submit-metadata-bundle\"} 500" in openmetrics
+    assert any(line.startswith("submitr_phase_duration_seconds{command=\"submit-metadata-bundle\",phase=\"parse\"}")
+               for line in openmetrics)
+    assert "submitr_portal_requests{command=\"submit-metadata-bundle\"} 2" in openmetrics
+    assert openmetrics[-1] == "# EOF"
+
+
+def test_run_metrics_command():
+
+    @run_metrics_command("check-submission")
+    def inner_command():
+        run_metrics.increment(COUNTER_RETRIES)
+
+    @run_metrics_command("submit-metadata-bundle")
+    def outer_command(exit_code):
+        with run_metrics.phase(PHASE_PARSE):
+            inner_command()
+        exit(exit_code)
+
+    with temporary_directory() as tmpdir:
+        json_file = os.path.join(tmpdir, "metrics.json")
+        prom_file = os.path.join(tmpdir, "metrics", "submitr.prom")
+        try:
+            with mock.patch.object(run_metrics_module, "_install_request_counter"):
+                set_run_metrics_files(f"{json_file},{prom_file}")
+                with pytest.raises(SystemExit):
+                    outer_command(2)
+        finally:
+            set_run_metrics_files(None)
+        with open(json_file) as f:
+            result = json.load(f)
+        # Only the outermost command writes the metrics, including those of any nested command.
+        assert result["command"] == "submit-metadata-bundle" and result["exit_code"] == 2
+        assert result["retries"] == 1 and PHASE_PARSE in result["phases"]
+        with open(prom_file) as f:
+            assert "submitr_run_exit_code{command=\"submit-metadata-bundle\"} 2\n" in f.read()
+        assert sorted(os.listdir(tmpdir)) == ["metrics", "metrics.json"]
+
+
+def test_run_metrics_command_not_enabled():
+
+    @run_metrics_command("resume-uploads")
+    def command():
+        return 123
+
+    with mock.patch.dict(os.environ, {"SUBMITR_METRICS_FILE": ""}):
+        with mock.patch.object(RunMetrics, "write") as mock_write:
+            assert command() == 123
+            assert mock_write.call_count == 0
@@ -0,0 +1,61 @@
+import gzip
+import json
+from unittest.mock import Mock
+from dcicutils.structured_data import Portal
+from submitr.schema_bundle import (
+    download_schema_bundle, get_default_schema_bundle_file, get_schema_bundle, load_schema_bundle, use_schema_bundle
+)
+
+_SCHEMAS = {"Donor": {"title": "Donor", "properties": {"submitted_id": {"type": "string"}}},
+            "Tissue": {"title": "Tissue", "properties": {"donor": {"type": "string", "linkTo": "Donor"}}}}
+
+
+def _define_portal(version: str = "1.0.0", schemas: dict = _SCHEMAS) -> Mock:
+    portal = Mock()
+    portal.server = "https://portal.example.org"
+    portal.get_version = Mock(return_value=version)
+    portal.get_schemas = Mock(return_value=schemas)
+    return portal
+
+
+def test_schema_bundle(tmp_path, monkeypatch):
+    monkeypatch.setenv("SUBMITR_CACHE_DIRECTORY", str(tmp_path))
+    file = get_default_schema_bundle_file("https://portal.example.org/")
+    assert file == str(tmp_path / "schemas" / "portal.example.org.json.gz")
+    assert load_schema_bundle(file) is None
+    # No bundle yet so downloaded.
+    portal = _define_portal()
+    assert get_schema_bundle(portal) == _SCHEMAS
+    assert portal.get_schemas.call_count == 1
+    with gzip.open(file, "rt") as f:
+        bundle = json.load(f)
+    assert bundle["portal_version"] == "1.0.0" and bundle["server"] == "https://portal.example.org"
+    # Same portal version so not downloaded.
+    portal = _define_portal()
+    assert get_schema_bundle(portal) == _SCHEMAS
+    assert portal.get_schemas.call_count == 0
+    # Portal version unknown (e.g. no network) so existing bundle used.
+    portal = _define_portal(version=None)
+    assert get_schema_bundle(portal) == _SCHEMAS
+    assert portal.get_schemas.call_count == 0
+    # Different portal version so refreshed.
+    schemas = {**_SCHEMAS, "Sample": {"title": "Sample"}}
+    portal = _define_portal(version="1.1.0", schemas=schemas)
+    assert get_schema_bundle(portal) == schemas
+    assert portal.get_schemas.call_count == 1
+    assert load_schema_bundle(file)["portal_version"] == "1.1.0"
+    # Download failure falls back to existing bundle.
+    portal = _define_portal(version="1.2.0", schemas={"status": "error"})
+    assert get_schema_bundle(portal) == schemas
+    # Explicit file.
+    other_file = str(tmp_path / "other.json.gz")
+    assert download_schema_bundle(_define_portal(), other_file)["schemas"] == _SCHEMAS
+    assert get_schema_bundle(_define_portal(version=None, schemas=None), file=other_file) == _SCHEMAS
+
+
+def test_use_schema_bundle():
+    portal = Portal({"key": "key", "secret": "secret", "server": "http://portal.example.org"})
+    use_schema_bundle(portal, _SCHEMAS)
+    assert portal.get_schema("Tissue") == _SCHEMAS["Tissue"]
+    assert portal.get_schema("tissue") == _SCHEMAS["Tissue"]
+    assert portal.get_schema("Nope") is None
@@ -0,0 +1,68 @@
+import threading
+import time
+import pytest
+from submitr.startup_probes import StartupProbes
+
+
+def test_startup_probes():
+    portal = object()
+    started = threading.Barrier(3, timeout=5)
+    def probe(value):  # noqa
+        def function(argument):  # noqa
+            assert argument is portal
+            started.wait()  # i.e. all probes must be running at the same time
+            return value
+        return function
+    startup_probes = StartupProbes()
+    startup_probes.add("version", probe("1.2.3"))
+    startup_probes.add("ping", probe(True))
+    startup_probes.add("health", probe({"metadata_bundles_bucket": "some-bucket"}))
+    startup_probes.start(portal)
+    assert startup_probes.result("version", lambda: "not-called") == "1.2.3"
+    assert startup_probes.result("ping") is True
+    assert startup_probes.result("health") == {"metadata_bundles_bucket": "some-bucket"}
+    assert startup_probes.result("health") == {"metadata_bundles_bucket": "some-bucket"}
+    # Probes not added are called directly.
+    assert startup_probes.result("user_record", lambda: {"title": "Some User"}) == {"title": "Some User"}
+    assert startup_probes.result("submission_centers") is None
+    output = []
+    startup_probes.print_summary(output.append)
+    assert output[0].startswith("DEBUG: Startup probes: 3 | Serial: ")
+    assert "| Critical path: " in output[0]
+    assert sorted(line.split(":")[1].strip("- ") for line in output[1:]) == ["health", "ping", "version"]
+
+
+def test_startup_probes_errors():
+    def exit_probe(portal):  # noqa
+        time.sleep(0.05)
+        raise SystemExit(1)
+    startup_probes = StartupProbes()
+    startup_probes.add("user_record", exit_probe)
+    startup_probes.add("version", lambda portal: 1 / 0)
+    startup_probes.start(object())
+    with pytest.raises(SystemExit):
+        startup_probes.result("user_record")
+    with pytest.raises(ZeroDivisionError):
+        startup_probes.result("version")
+    assert startup_probes.waited > 0
+
+
+def test_startup_probes_not_started():
+    startup_probes = StartupProbes()
+    startup_probes.add("version", lambda portal: "1.2.3")
+    assert startup_probes.result("version", lambda: "4.5.6") == "4.5.6"
+    output = []
+    startup_probes.print_summary(output.append)
+    assert output == []
+
+
+def test_startup_probes_do_not_delay_exit():
+    # A probe still running (e.g. a slow request) must not keep the process from exiting.
+    release = threading.Event()
+    startup_probes = StartupProbes()
+    startup_probes.add("health", lambda portal: release.wait(timeout=5))
+    startup_probes.start(object())
+    threads = [thread for thread in threading.enumerate() if thread.name == "submitr-probe-health"]
+    assert threads and all(thread.daemon for thread in threads)
+    release.set()
+    assert startup_probes.result("health") is True
@@ -0,0 +1,40 @@
+import os
+import openpyxl
+from dcicutils.submitr.custom_excel import CustomExcel
+from submitr.streaming_excel import StreamingExcel
+
+_TEST_FILES = ["submission_test.xlsx", "submission_test_with_errors.xlsx", "test_custom_column_mappings.xlsx"]
+_TEST_DATA_DIRECTORY = os.path.join(os.path.dirname(__file__), "data")
+
+
+def _read(excel) -> dict:
+    return {sheet_name: list(excel.sheet_reader(sheet_name)) for sheet_name in excel.sheet_names}
+
+
+def test_streaming_excel_same_as_custom_excel():
+    for file in _TEST_FILES:
+        file = os.path.join(_TEST_DATA_DIRECTORY, file)
+        assert _read(StreamingExcel(file)) == _read(CustomExcel(file))
+
+
+def test_streaming_excel(tmp_path):
+    file = str(tmp_path / "streaming.xlsx")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.title = "Tissue"
+    for row in [["submitted_id", "donor", "comment"],
+                ["X_TISSUE_T1", "X_DONOR_D1", "x" * 300],
+                ["X_TISSUE_T2", "X_DONOR_" + "D1", "x" * 300],
+                [None, "*delete*", 123]]:
+        sheet.append(row)
+    workbook.create_sheet("(Hidden)")
+    workbook.save(file)
+    excel = StreamingExcel(file)
+    assert excel.sheet_names == ["Tissue"]
+    rows = list(excel.sheet_reader("Tissue"))
+    assert [row["submitted_id"] for row in rows] == ["X_TISSUE_T1", "X_TISSUE_T2", ""]
+    # Repeated (short) values are shared, i.e. stored once.
+    assert rows[0]["donor"] is rows[1]["donor"]
+    assert rows[0]["comment"] == rows[1]["comment"] and rows[0]["comment"] is not rows[1]["comment"]
+    assert rows[2]["comment"] == "123"
+    assert rows == list(CustomExcel(file).sheet_reader("Tissue"))
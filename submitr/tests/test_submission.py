@@ -39,6 +39,8 @@ from ..submission import (  # noqa
     _collapse_formatted_srcs,
     _format_src,
     _format_issue,
+    _format_reference_errors,
+    _validate_references,
 )
 from ..utils import FakeResponse
 
@@ -201,7 +203,8 @@ def make_user_record(title=SOME_USER_TITLE, contact_email=SOME_USER_EMAIL, **kwa
     return user_record
 
 
-def test_get_user_record():
+@mock.patch("submitr.http_cache._get_http_cache", return_value=None)
+def test_get_user_record(mock_get_http_cache):
 
     def make_mocked_get(auth_failure_code=400):
         def mocked_get(url, *, auth, **kwargs):
@@ -1476,3 +1479,47 @@ def test_format_issue_src_and_row():
 def test_format_issue_uses_format_src_when_present():
     issue = {"src": {"file": "x.tsv", "row": 2}, "warning": "Hello"}
     assert _format_issue(issue) == "x [row: 3]: Hello"
+
+
+# --------------------------------------------------------------------------------------
+# _validate_references / _format_reference_errors
+# --------------------------------------------------------------------------------------
+
+
+def test_validate_references_groups_by_ref():
+    ref_errors = [
+        {"error": "/Donor/D2", "src": {"type": "Tissue", "column": "donor", "row": 3}},
+        {"error": "/Donor/D1", "src": {"type": "Tissue", "column": "donor", "row": 1}},
+        {"error": "/Donor/D2", "src": {"type": "Tissue", "column": "donor", "row": 4}},
+        {"error": "/Donor/D2"},
+        {"truncated": True, "more": 5, "details": "http://example.com"},
+    ]
+    result = _validate_references(ref_errors, "test.xlsx")
+    assert [r["ref"] for r in result[:2]] == ["/Donor/D1", "/Donor/D2"]
+    assert result[1]["count"] == 3
+    assert len(result[1]["srcs"]) == 2
+    assert result[2]["ref"].startswith("Truncated")
+    assert _format_reference_errors(result) == [
+        "- Reference errors: 2",
+        "  - ERROR: /Donor/D1 (refs: 1)",
+        "    - Tissue.donor [row: 2]",
+        "  - ERROR: /Donor/D2 (refs: 3)",
+        "    - Tissue.donor [rows: 4, 5]",
+        f"  - {result[2]['ref']}",
+    ]
+
+
+def test_format_reference_errors_capped_unless_verbose():
+    ref_errors = [
+        {"error": f"/Donor/D{i:05d}", "src": {"type": f"Tissue{j}", "column": "donor", "row": 1}}
+        for i in range(40000) for j in range(2 if i else 20)
+    ]
+    result = _validate_references(ref_errors, "test.xlsx")
+    assert len(result) == 40000
+    formatted = _format_reference_errors(result)
+    assert formatted[0] == "- Reference errors: 40000"
+    assert formatted[1] == "  - ERROR: /Donor/D00000 (refs: 20)"
+    assert formatted[12] == "    - And 10 more (use --verbose to see all)"
+    assert formatted[-1] == "  - And 39900 more reference errors (use --verbose to see all)"
+    assert len(formatted) == 1 + 100 + 11 + 99 * 2 + 1
+    assert len(_format_reference_errors(result, verbose=True)) == 1 + 40000 + 20 + 39999 * 2
@@ -66,6 +66,12 @@ def test_submit_metadata_bundle_script(keyfile):
                             "noprogress": False,
                             "output_file": False,
                             "timeout": None,
+                            "incremental": False,
+                            "streaming": False,
+                            "workers": None,
+                            "schema_bundle": None,
+                            "profile_validators": None,
+                            "http_trace": None,
                             "debug": False,
                             "debug_sleep": False
                         }
@@ -0,0 +1,93 @@
+import threading
+from unittest.mock import Mock
+from submitr.validators.decorators import define_structured_data_validator_hook, _flush_column_validators
+from submitr.validators.submitted_id_validator import _submitted_id_validator_finish
+from submitr.validators.utils import submitted_id as submitted_id_utils
+from .datafixtures import make_structured_data_mock
+
+
+def _run_submitted_id_column_hook(structured_data: Mock, rows: list) -> None:
+    hook = define_structured_data_validator_hook()
+    for schema, row, value in rows:
+        assert hook(structured_data, schema, "submitted_id", row, value) == value
+    _flush_column_validators(structured_data)
+
+
+def test_submitted_id_validator_individually_deduplicated_in_row_order():
+    calls = []
+    lock = threading.Lock()
+
+    def get_metadata(path):
+        with lock:
+            calls.append(path)
+        submitted_id = path.split("/")[-1].split("?")[0]
+        return {"status": "OK" if submitted_id.startswith("GOOD") else f"Bad: {submitted_id}"}
+
+    structured_data = make_structured_data_mock()
+    portal = structured_data.portal
+    portal.server = "http://portal-individual"
+    portal.get_metadata = Mock(side_effect=get_metadata)
+    _run_submitted_id_column_hook(structured_data, [
+        ("Donor", 2, "BAD_2"), ("Donor", 0, "GOOD_1"), ("Donor", 1, "BAD_1"),
+        ("Tissue", 0, "BAD_1"), ("Tissue", 1, "GOOD_1"), ("Tissue", 2, "GOOD_1"),
+    ])
+    _submitted_id_validator_finish(structured_data, valid_submission_centers="smaht")
+    assert sorted(calls) == sorted(f"/validators/submitted_id/{submitted_id}?submission_centers=smaht"
+                                   for submitted_id in ["BAD_2", "GOOD_1", "BAD_1"])
+    assert [call.args for call in structured_data.note_validation_error.call_args_list] == [
+        ("Duplicate submission_id: GOOD_1 (first seen on item: 2)", "Tissue", 2),
+        ("Bad: BAD_1", "Donor", 1),
+        ("Bad: BAD_2", "Donor", 2),
+        ("Bad: BAD_1", "Tissue", 0),
+    ]
+
+
+def test_submitted_id_validator_retries_failures(monkeypatch):
+    monkeypatch.setattr(submitted_id_utils, "_SUBMITTED_ID_VALIDATOR_RETRY_DELAY", 0)
+    attempts = {}
+
+    def get_metadata(path):
+        attempts[path] = attempts.get(path, 0) + 1
+        if attempts[path] < 2:
+            raise Exception("Service Unavailable")
+        return {"status": "Invalid"}
+
+    portal = make_structured_data_mock().portal
+    portal.server = "http://portal-flaky"
+    portal.get_metadata = Mock(side_effect=get_metadata)
+    results = submitted_id_utils.validate_submitted_ids(portal, ["A", "B", "A"], nthreads=2, max_nthreads=4)
+    assert results == {"A": "Invalid", "B": "Invalid"}
+    assert attempts == {"/validators/submitted_id/A": 2, "/validators/submitted_id/B": 2}
+
+
+def test_submitted_id_validator_reports_failures(monkeypatch):
+    monkeypatch.setattr(submitted_id_utils, "_SUBMITTED_ID_VALIDATOR_RETRY_DELAY", 0)
+
+    def get_metadata(path):
+        if "DOWN" in path:
+            raise Exception("Service Unavailable")
+        return {"status": "OK"}
+
+    structured_data = make_structured_data_mock()
+    structured_data.portal.server = "http://portal-down"
+    structured_data.portal.get_metadata = Mock(side_effect=get_metadata)
+    _run_submitted_id_column_hook(structured_data, [("Donor", 0, "UP_1"), ("Donor", 1, "DOWN_1")])
+    _submitted_id_validator_finish(structured_data)
+    # Not silently dropped after all retries fail; reported as an error for the row.
+    assert structured_data.portal.get_metadata.call_count == 1 + submitted_id_utils._SUBMITTED_ID_VALIDATOR_RETRIES
+    assert [call.args for call in structured_data.note_validation_error.call_args_list] == [
+        ("Cannot validate submitted_id via portal (request failed): DOWN_1", "Donor", 1)]
+
+
+def test_adaptive_concurrency_limiter():
+    limiter = submitted_id_utils._AdaptiveConcurrencyLimiter(2, 3)
+    for _ in range(2):
+        limiter.succeeded()
+    assert limiter.limit == 3
+    for _ in range(10):
+        limiter.succeeded()
+    assert limiter.limit == 3
+    limiter.failed()
+    assert limiter.limit == 1
+    limiter.failed()
+    assert limiter.limit == 1
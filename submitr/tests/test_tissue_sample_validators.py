@@ -1,5 +1,9 @@
+import json
 from unittest import mock
 import pytest
+from dcicutils.structured_data import StructuredDataSet
+from submitr.validators import decorators
+from submitr.validators.decorators import define_structured_data_validator_hook
 from submitr.validators.tissue_sample_validator import (
     _tissue_sample_external_id_validator,
     _tissue_sample_metadata_validator,
@@ -21,6 +25,7 @@ from submitr.validators.tissue_sample_validator import (
     _tissue_sample_external_id_sample_source_consistency_validator,
     _note_validation_warning,
 )
+from submitr.validators.utils import portal as portal_utils
 
 from .datafixtures import (
     NDRI_TISSUE_SUBMITTED_ID,
@@ -1018,10 +1023,14 @@ def test_metadata_validator_multiple_items_mixed():
     )
     mock_data = make_structured_data_mock({"TissueSample": [sample1, sample2]})
     with mock.patch(
+        "submitr.validators.utils.portal.search_tissue_samples_by_external_ids",
+        return_value={PRODUCTION_EXTERNAL_ID: [], BENCHMARKING_EXTERNAL_ID: []},
+    ) as mock_batch_search, mock.patch(
         "submitr.validators.utils.portal.search_tissue_samples_by_external_id",
-        return_value=[],
-    ):
+    ) as mock_search:
         _tissue_sample_metadata_validator(mock_data)
+    mock_batch_search.assert_called_once()
+    mock_search.assert_not_called()
     mock_data.note_validation_error.assert_not_called()
 
 
@@ -1072,6 +1081,44 @@ def test_metadata_validator_caching_behavior():
         assert mock_search.call_count == 1
 
 
+def test_metadata_validator_batched_portal_queries():
+    """Queries portal in batches for all external_ids up front; falls back to single queries on batch failure."""
+    external_ids = [f"SMHT001-3A-{i:03d}A1" for i in range(1, 121)]
+    samples = [
+        make_tissue_sample(f"NDRI_TISSUE-SAMPLE_{external_id}", external_id,
+                           [NDRI_TISSUE_SUBMITTED_ID], submission_centers=[NDRI_TPC_CENTER])
+        for external_id in external_ids
+    ]
+    mock_data = make_structured_data_mock({"TissueSample": samples})
+
+    def batch_search(batch, portal_key):
+        return None if external_ids[0] in batch else {external_id: [] for external_id in batch}
+
+    with mock.patch(
+        "submitr.validators.utils.portal.search_tissue_samples_by_external_ids",
+        side_effect=batch_search,
+    ) as mock_batch_search, mock.patch(
+        "submitr.validators.utils.portal.search_tissue_samples_by_external_id",
+        return_value=[],
+    ) as mock_search:
+        _tissue_sample_metadata_validator(mock_data)
+    assert mock_batch_search.call_count == 3
+    assert sorted(sum((list(call.args[0]) for call in mock_batch_search.call_args_list), [])) == external_ids
+    assert mock_search.call_count == 50
+    mock_data.note_validation_error.assert_not_called()
+
+
+def test_search_tissue_samples_by_external_ids():
+    """Multi-valued search results are grouped by external_id."""
+    found = [{"external_id": "A", "uuid": "1"}, {"external_id": "B", "uuid": "2"}, {"external_id": "A", "uuid": "3"}]
+    with mock.patch("submitr.validators.utils.portal.ff_utils.search_metadata", return_value=found) as mock_search:
+        result = portal_utils.search_tissue_samples_by_external_ids(["A", "B", "C"], MOCK_PORTAL_KEY)
+    assert mock_search.call_args[0][0].endswith("&external_id=A&external_id=B&external_id=C")
+    assert result == {"A": [found[0], found[2]], "B": [found[1]], "C": []}
+    with mock.patch("submitr.validators.utils.portal.ff_utils.search_metadata", side_effect=Exception):
+        assert portal_utils.search_tissue_samples_by_external_ids(["A", "B"], MOCK_PORTAL_KEY) is None
+
+
 def test_metadata_validator_portal_query_failure():
     """Handles portal query failure gracefully."""
     tissue_sample = make_tissue_sample(
@@ -1256,6 +1303,23 @@ def test_ext_id_category_range_invalid_boundaries(external_id):
     mock_data.note_validation_error.assert_called_once()
 
 
+def test_ext_id_category_json_input(tmp_path, monkeypatch):
+    """Checked (via the finish hook) for JSON input too, i.e. with no per-value validator hook calls."""
+    monkeypatch.setattr(decorators, "_FINISH_VALIDATORS", [_tissue_sample_external_id_category_match_validator])
+    tissue_samples = [
+        make_tissue_sample(NDRI_TISSUE_SAMPLE_SUBMITTED_ID, "SMHT001-3AT-001", [], category="Tissue Aliquot"),
+        make_tissue_sample(GCC_TISSUE_SAMPLE_SUBMITTED_ID, "SMHT001-2AT-001", [], category="Tissue Aliquot"),
+    ]
+    (file := tmp_path / "submission.json").write_text(json.dumps({"TissueSample": tissue_samples}))
+    structured_data = StructuredDataSet(None, validator_hook=define_structured_data_validator_hook())
+    structured_data._portal = mock.Mock(get_schema=mock.Mock(return_value=None))
+    structured_data.load_file(str(file))
+    assert [error["error"] for error in structured_data.validation_errors] == [
+        f"TissueSample: item {GCC_TISSUE_SAMPLE_SUBMITTED_ID} has category Tissue Aliquot"
+        f" but external_id SMHT001-2AT-001 does not match expected pattern for that category."
+    ]
+
+
 # ============================================================================
 # Test _text_before_nth()
 # ============================================================================
@@ -6,6 +6,7 @@ from submitr.validators.tissue_validator import (
     _tissue_preservation_type_validator,
     _get_term_info,
 )
+from submitr.validators.utils import ontology_term as ontology_term_utils
 
 
 @pytest.fixture
@@ -216,7 +217,7 @@ def test_tissue_external_id_validator_multiple_tissues(mock_structured_data):
 # Tests for _get_term_info
 
 
-@patch("submitr.validators.tissue_validator.ff_utils.search_metadata")
+@patch("submitr.validators.utils.ontology_term.ff_utils.search_metadata")
 def test_get_term_info_success(mock_search):
     """Test _get_term_info with valid term."""
     mock_search.return_value = [
@@ -235,7 +236,7 @@ def test_get_term_info_success(mock_search):
     )
 
 
-@patch("submitr.validators.tissue_validator.ff_utils.search_metadata")
+@patch("submitr.validators.utils.ontology_term.ff_utils.search_metadata")
 def test_get_term_info_no_results(mock_search):
     """Test _get_term_info when no term found."""
     mock_search.return_value = []
@@ -246,7 +247,7 @@ def test_get_term_info_no_results(mock_search):
     assert result == {}
 
 
-@patch("submitr.validators.tissue_validator.ff_utils.search_metadata")
+@patch("submitr.validators.utils.ontology_term.ff_utils.search_metadata")
 def test_get_term_info_multiple_results(mock_search):
     """Test _get_term_info with multiple results (should handle first only)."""
     mock_search.return_value = [
@@ -260,7 +261,7 @@ def test_get_term_info_multiple_results(mock_search):
     assert result == {}  # Multiple results, doesn't match len == 1 condition
 
 
-@patch("submitr.validators.tissue_validator.ff_utils.search_metadata")
+@patch("submitr.validators.utils.ontology_term.ff_utils.search_metadata")
 def test_get_term_info_no_valid_protocol_ids(mock_search):
     """Test _get_term_info when term has no valid_protocol_ids."""
     mock_search.return_value = [{"identifier": "UBERON:0001234"}]
@@ -271,7 +272,7 @@ def test_get_term_info_no_valid_protocol_ids(mock_search):
     assert result == {}
 
 
-@patch("submitr.validators.tissue_validator.ff_utils.search_metadata")
+@patch("submitr.validators.utils.ontology_term.ff_utils.search_metadata")
 def test_get_term_info_protocol_without_underscore(mock_search):
     """Test _get_term_info with protocol ID without underscore."""
     mock_search.return_value = [
@@ -540,3 +541,44 @@ def test_tissue_preservation_type_validator_multiple_codes_in_term_info(
     _tissue_preservation_type_validator(mock_structured_data)
     # error because PAX code in external_id but preservation_type not FFPE
     assert mock_structured_data.note_validation_error.call_count == 1
+
+
+# Tests for the shared OntologyTerm cache
+
+
+@patch("submitr.validators.utils.ontology_term.ff_utils.search_metadata")
+def test_tissue_preservation_type_validator_prefetches_terms_once(
+    mock_search, mock_structured_data
+):
+    """Test that all referenced terms are fetched with one search and shared across calls."""
+    ontology_term_utils.clear_ontology_terms_cache()
+    mock_search.return_value = [
+        {"identifier": "UBERON:0000001", "valid_protocol_ids": ["OCT_frozenTissue"]},
+        {"identifier": "UBERON:0000002", "valid_protocol_ids": ["PAX_FFPE"]},
+    ]
+    mock_structured_data.portal.key = {"key": "test_key", "server": "https://portal.example.org"}
+    mock_structured_data.data = {
+        "Tissue": [
+            {"submitted_id": "TEST_TISSUE001", "uberon_id": "UBERON:0000001",
+             "external_id": "OCT-001", "preservation_type": "FFPE"},
+            {"submitted_id": "TEST_TISSUE002", "uberon_id": "UBERON:0000002",
+             "external_id": "PAX-002", "preservation_type": "FFPE"},
+            {"submitted_id": "TEST_TISSUE003", "uberon_id": "UBERON:0000003",
+             "external_id": "PAX-003", "preservation_type": "FFPE"},
+        ]
+    }
+    _tissue_preservation_type_validator(mock_structured_data)
+    _tissue_preservation_type_validator(mock_structured_data)
+    mock_search.assert_called_once_with(
+        "/search/?type=OntologyTerm&identifier=UBERON:0000001"
+        "&identifier=UBERON:0000002&identifier=UBERON:0000003",
+        mock_structured_data.portal.key,
+    )
+    assert mock_structured_data.note_validation_error.call_count == 2
+    assert "TEST_TISSUE001" in mock_structured_data.note_validation_error.call_args_list[0][0][0]
+    # Cache is keyed by server.
+    mock_search.return_value = []
+    assert ontology_term_utils.search_ontology_terms(
+        "UBERON:0000001", {"server": "https://other.example.org"}) == []
+    assert mock_search.call_count == 2
+    ontology_term_utils.clear_ontology_terms_cache()
@@ -0,0 +1,25 @@
+from unittest.mock import Mock
+from dcicutils.structured_data import StructuredDataSet
+from submitr.validators.unreferenced_validator import _get_unreferenced_references, report_unreferenced_references
+from .datafixtures import make_structured_data_mock
+
+
+def test_get_unreferenced_references():
+    super_types = {"CellCultureSample": ["Sample", "Item"], "Sequencer": ["Item"]}
+    structured_data = make_structured_data_mock({
+        "CellCultureSample": [{"submitted_id": "A"}, {"submitted_id": "B"}, {"submitted_id": "C"}, {}],
+        "Sequencer": [{"submitted_id": "X"}, {"submitted_id": "Y"}],
+        "AlignedReads": [{"submitted_id": "Z"}],
+        "Software": [{"submitted_id": 123}],
+    }, spec=StructuredDataSet)
+    structured_data.resolved_refs = ["/CellCultureSample/A", "/Sample/B", "/Sequencer/Y", "/Software/123", "/Sample/X"]
+    structured_data.portal.get_schema_super_type_names = Mock(side_effect=lambda type: super_types.get(type, []))
+    assert _get_unreferenced_references(structured_data, ignore_types=["AlignedReads"]) == [
+        "/CellCultureSample/C", "/Sequencer/X"
+    ]
+    # Super types looked up just once per type.
+    assert structured_data.portal.get_schema_super_type_names.call_count == 3
+    printed = []
+    assert report_unreferenced_references(structured_data, printf=printed.append) == 2  # AlignedReads allowed
+    assert printed == ["\n- Unreferenced items:", "  - /CellCultureSample/C", "  - /Sequencer/X"]
+    assert _get_unreferenced_references(structured_data) == ["/CellCultureSample/C", "/Sequencer/X", "/AlignedReads/Z"]
@@ -1,11 +1,16 @@
 import contextlib
 import pytest
 import re
+import threading
+import time
 
 from unittest import mock
 
+from dcicutils.tmpfile_utils import temporary_directory
+
 from .. import utils as utils_module
-from ..utils import show, keyword_as_title, FakeResponse, ERASE_LINE, TIMESTAMP_REGEXP
+from ..disk_cache import DiskCache
+from ..utils import show, keyword_as_title, FakeResponse, ERASE_LINE, TIMESTAMP_REGEXP, get_most_recent_version_info
 
 
 @contextlib.contextmanager
@@ -138,3 +143,58 @@ def test_fake_response():
 
     with pytest.raises(Exception):
         error_response.raise_for_status()
+
+
+SOME_PYPI_PACKAGE_INFO = {
+    "info": {"version": "1.2.0", "summary": "Whatever"},
+    "releases": {
+        "1.1.0": [{"upload_time": "2024-01-10T10:00:00", "size": 1234}],
+        "1.2.0": [{"upload_time": "2024-02-10T10:00:00", "size": 1234}],
+        "1.3.0b1": [{"upload_time": "2024-03-10T10:00:00", "size": 1234}],
+        "1.3.0b2": []
+    }
+}
+
+
+@contextlib.contextmanager
+def pypi_package_info_state(directory):
+    with mock.patch.object(utils_module, "_pypi_cache", DiskCache("pypi", ttl=60, directory=directory)):
+        with mock.patch.object(utils_module, "_pypi_package_info", {}):
+            with mock.patch.object(utils_module, "_pypi_package_info_threads", {}):
+                yield
+
+
+def test_get_most_recent_version_info():
+    with temporary_directory() as tmpdir:
+        with mock.patch.object(utils_module, "get_version", return_value="1.1.0"):
+            with mock.patch("requests.get", return_value=FakeResponse(200, json=SOME_PYPI_PACKAGE_INFO)) as mock_get:
+                with pypi_package_info_state(tmpdir):
+                    info = get_most_recent_version_info("some-package")
+                    assert mock_get.call_args.kwargs["timeout"] == utils_module._PYPI_REQUEST_TIMEOUT
+                    assert info.version == "1.2.0" and info.beta_version == "1.3.0b1"
+                    assert info.this_version == "1.1.0" and info.this_release_date
+                # The (trimmed) package info is now cached on disk; so no request again.
+                with pypi_package_info_state(tmpdir):
+                    assert utils_module._pypi_cache.get("some-package") == {
+                        "info": {"version": "1.2.0"},
+                        "releases": {"1.1.0": [{"upload_time": "2024-01-10T10:00:00"}],
+                                     "1.2.0": [{"upload_time": "2024-02-10T10:00:00"}],
+                                     "1.3.0b1": [{"upload_time": "2024-03-10T10:00:00"}]}}
+                    assert get_most_recent_version_info("some-package") == info
+                assert mock_get.call_count == 1
+
+
+def test_get_most_recent_version_info_does_not_block():
+    unblock = threading.Event()
+    def blocked_get(url, **kwargs):  # noqa
+        unblock.wait(5)
+        return FakeResponse(200, json=SOME_PYPI_PACKAGE_INFO)
+    with temporary_directory() as tmpdir:
+        with mock.patch("requests.get", side_effect=blocked_get):
+            with pypi_package_info_state(tmpdir):
+                started = time.time()
+                assert get_most_recent_version_info("some-package", timeout=0.1) is None
+                assert time.time() - started < 2
+                unblock.set()
+                utils_module._pypi_package_info_threads["some-package"].join(5)
+                assert get_most_recent_version_info("some-package").version == "1.2.0"
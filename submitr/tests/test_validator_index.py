@@ -0,0 +1,64 @@
+from submitr.validators.file_set_count_validator import _file_set_count_validator
+from submitr.validators.paired_read_validator import _paired_read_validator
+from submitr.validators.utils.index import get_schema_index
+from .datafixtures import make_structured_data_mock
+
+
+def test_schema_index_lookups():
+    items = [
+        {"submitted_id": "A", "file_sets": ["FS1", "FS2"]},
+        {"submitted_id": "B", "file_sets": ["FS1", "FS1"]},
+        {"submitted_id": "A", "file_sets": "FS2"},
+        {"file_sets": None},
+    ]
+    structured_data = make_structured_data_mock({"UnalignedReads": items})
+    index = get_schema_index(structured_data, "UnalignedReads")
+    assert index.items("A") == [items[0], items[2]]
+    assert index.item("B") is items[1]
+    assert index.item("C") is None
+    assert index.items_in(["B", "A", "Z"]) == [items[0], items[1], items[2]]
+    assert index.items_in("xBx") == [items[1], items[3]]  # as with "in" the empty string matches
+    assert index.referencing("file_sets", "FS1") == [items[0], items[1]]
+    assert index.referencing("file_sets", "FS2") == [items[0], items[2]]
+    assert index.referencing("file_sets", "FS3") == []
+    assert get_schema_index(structured_data, "UnalignedReads") is index
+    assert get_schema_index(structured_data, "Missing").items_in(["A"]) == []
+
+
+def test_schema_index_rebuilt_when_data_changes():
+    structured_data = make_structured_data_mock({"Tissue": [{"submitted_id": "A"}]})
+    index = get_schema_index(structured_data, "Tissue")
+    structured_data.data["Tissue"].append({"submitted_id": "B"})
+    assert (index := get_schema_index(structured_data, "Tissue")).item("B")
+    structured_data.data = {"Tissue": [{"submitted_id": "C"}]}
+    assert get_schema_index(structured_data, "Tissue") is not index
+    assert get_schema_index(structured_data, "Tissue").item("C")
+
+
+def test_file_set_count_validator():
+    structured_data = make_structured_data_mock({
+        "FileSet": [{"submitted_id": "FS1", "expected_file_count": "3"},
+                    {"submitted_id": "FS2", "expected_file_count": 2}],
+        "AlignedReads": [{"submitted_id": "AR1", "file_sets": ["FS1"]}],
+        "UnalignedReads": [{"submitted_id": "UR1", "file_sets": ["FS1", "FS2"]},
+                           {"submitted_id": "UR2", "file_sets": ["FS1"]}],
+    })
+    _file_set_count_validator(structured_data)
+    structured_data.note_validation_error.assert_called_once()
+    assert "FS2" in structured_data.note_validation_error.call_args[0][0]
+    assert all("expected_file_count" not in item for item in structured_data.data["FileSet"])
+
+
+def test_paired_read_validator():
+    structured_data = make_structured_data_mock({
+        "UnalignedReads": [
+            {"submitted_id": "R1", "file_sets": ["FS1"], "read_pair_number": "R1"},
+            {"submitted_id": "R2", "file_sets": ["FS1"], "read_pair_number": "R2", "paired_with": "R1"},
+            {"submitted_id": "R3", "file_sets": ["FS2"], "read_pair_number": "R2", "paired_with": "R1"},
+        ]
+    })
+    _paired_read_validator(structured_data)
+    errors = [call[0][0] for call in structured_data.note_validation_error.call_args_list]
+    assert len(errors) == 2
+    assert "R3 paired_with file must be linked to the same FileSet" in errors[0]
+    assert "referenced in paired_with by multiple R2 files" in errors[1]
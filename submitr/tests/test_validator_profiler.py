@@ -0,0 +1,58 @@
+import json
+import threading
+from unittest.mock import Mock
+from dcicutils import ff_utils
+from submitr.validators.profiler import ValidatorProfiler
+from .datafixtures import make_structured_data_mock
+
+
+def _column_validator(structured_data, schema, column, row, value, **kwargs):
+    structured_data.portal.get_metadata(f"/{value}")
+    if value == "bad":
+        structured_data.note_validation_error("Bad value", schema, row)
+    return value
+
+
+def _finish_validator(structured_data, **kwargs):
+    def query():  # noqa
+        structured_data.portal.get_metadata("/threaded")
+    threads = [threading.Thread(target=query) for _ in range(3)]
+    [thread.start() for thread in threads]
+    [thread.join() for thread in threads]
+    ff_utils.search_metadata("/search/?type=Donor", None)
+
+
+def test_validator_profiler(monkeypatch, tmp_path):
+    monkeypatch.setattr(ff_utils, "search_metadata", Mock(return_value=[]))
+    search_metadata = ff_utils.search_metadata
+    profiler = ValidatorProfiler()
+    structured_data = make_structured_data_mock()
+    structured_data.portal.get_metadata = get_metadata = Mock(return_value={})
+    note_validation_error = structured_data.note_validation_error
+    with profiler:
+        for row, value in enumerate(["good", "bad", "bad"]):
+            assert profiler.call("column", _column_validator, structured_data,
+                                 "Donor", "submitted_id", row, value=value) == value
+        profiler.call("finish", _finish_validator, structured_data, valid_submission_centers=None)
+        structured_data.portal.get_metadata("/not-in-validator")
+    assert ff_utils.search_metadata is search_metadata
+    # The portal methods and note_validation_error are restored on exit.
+    assert structured_data.portal.get_metadata is get_metadata
+    assert structured_data.note_validation_error is note_validation_error
+    search_metadata.assert_called_once()
+    assert note_validation_error.call_count == 2
+    results = {stats["name"]: stats for stats in profiler.get_results()}
+    assert results["_column_validator"]["kind"] == "column"
+    assert results["_column_validator"]["calls"] == 3
+    assert results["_column_validator"]["portal_calls"] == 3
+    assert results["_column_validator"]["errors"] == 2
+    assert results["_finish_validator"]["kind"] == "finish"
+    assert results["_finish_validator"]["calls"] == 1
+    assert results["_finish_validator"]["portal_calls"] == 4
+    assert results["_finish_validator"]["errors"] == 0
+    lines = profiler.format_results()
+    assert lines[0].startswith("Validator")
+    assert len(lines) == 4
+    profiler.write(file := str(tmp_path / "profile.json"))
+    with open(file) as f:
+        assert json.load(f)["validators"] == profiler.get_results()
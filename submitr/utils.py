@@ -6,16 +6,17 @@ import io
 from json import dumps as json_dumps, loads as json_loads
 import os
 from pathlib import Path
-import pkg_resources
 import requests
 from signal import signal, SIGINT
 import string
 import sys
+import threading
 from typing import Any, Callable, List, Optional, Tuple, Union
 from dcicutils.datetime_utils import format_datetime, parse_datetime
 from dcicutils.function_cache_decorator import function_cache
 from dcicutils.misc_utils import PRINT, str_to_bool
-from dcicutils.structured_data import Portal
+from submitr.disk_cache import DiskCache
+from submitr.http_cache import cached_get
 
 
 ERASE_LINE = "\033[K"
@@ -164,16 +165,42 @@ def get_submission_center_code(submission_center: Union[dict, str]) -> str:
 @lru_cache(maxsize=1)
 def get_version(package_name: str = "smaht-submitr") -> str:
     try:
-        return pkg_resources.get_distribution(package_name).version
+        # Note importlib.metadata rather than pkg_resources which is slow to import.
+        from importlib.metadata import version
+        return version(package_name)
     except Exception:
         return ""
 
 
-@lru_cache(maxsize=2)
-def get_most_recent_version_info(package_name: str = "smaht-submitr", beta: bool = True) -> object:
-    pypi_url = f"https://pypi.org/pypi/{package_name}/json"
+# The PyPI package info (i.e. the versions and release dates) used by get_most_recent_version_info is fetched
+# in a background (daemon) thread, with a short request timeout, and cached on disk for a day; so on hosts with
+# restricted egress this never hangs; callers wait for it at most _PYPI_WAIT_TIMEOUT and otherwise get None.
+_PYPI_CACHE_NAME = "pypi"
+_PYPI_CACHE_TTL = 24 * 60 * 60  # seconds
+_PYPI_REQUEST_TIMEOUT = 5  # seconds
+_PYPI_WAIT_TIMEOUT = 2  # seconds
+_pypi_cache = None
+_pypi_package_info = {}
+_pypi_package_info_threads = {}
+_pypi_package_info_lock = threading.Lock()
+
+
+def start_most_recent_version_check(package_name: str = "smaht-submitr") -> None:
+    """
+    Starts getting the PyPI package info for the given package in the background (for use
+    by get_most_recent_version_info), from the disk cache, or from PyPI if not cached.
+    """
+    with _pypi_package_info_lock:
+        if package_name not in _pypi_package_info_threads:
+            thread = threading.Thread(target=_load_pypi_package_info, args=(package_name,), daemon=True)
+            _pypi_package_info_threads[package_name] = thread
+            thread.start()
+
+
+def get_most_recent_version_info(package_name: str = "smaht-submitr", beta: bool = True,
+                                 timeout: Optional[float] = _PYPI_WAIT_TIMEOUT) -> object:
     try:
-        if (response := requests.get(pypi_url)).status_code == 200 and (response := response.json()):
+        if response := _get_pypi_package_info(package_name, timeout=timeout):
             latest_non_beta_version = response["info"]["version"]
             this_version = get_version(package_name=package_name)
             this_release_date = None
@@ -214,6 +241,41 @@ def get_most_recent_version_info(package_name: str = "smaht-submitr", beta: bool
     return None
 
 
+def _get_pypi_package_info(package_name: str, timeout: Optional[float] = None) -> Optional[dict]:
+    start_most_recent_version_check(package_name)
+    _pypi_package_info_threads[package_name].join(timeout)
+    return _pypi_package_info.get(package_name)
+
+
+def _load_pypi_package_info(package_name: str) -> None:
+    if isinstance(package_info := (cache := _get_pypi_cache()).get(package_name), dict):
+        _pypi_package_info[package_name] = package_info
+        return
+    try:
+        pypi_url = f"https://pypi.org/pypi/{package_name}/json"
+        if (response := requests.get(pypi_url, timeout=_PYPI_REQUEST_TIMEOUT)).status_code != 200:
+            return
+        response = response.json()
+        # Only the (latest) version and the release dates (of the first file of each release) are needed.
+        package_info = {
+            "info": {"version": response["info"]["version"]},
+            "releases": {version: [{"upload_time": files[0].get("upload_time")}]
+                         for version, files in response["releases"].items() if files}
+        }
+    except Exception:
+        return
+    _pypi_package_info[package_name] = package_info
+    cache.set(package_name, package_info)
+    cache.save()
+
+
+def _get_pypi_cache() -> DiskCache:
+    global _pypi_cache
+    if _pypi_cache is None:
+        _pypi_cache = DiskCache(_PYPI_CACHE_NAME, ttl=_PYPI_CACHE_TTL)
+    return _pypi_cache
+
+
 def remove_punctuation_and_space(value: str) -> str:
     return "".join(c for c in value if c not in string.punctuation + " ") if isinstance(value, str) else ""
 
@@ -235,7 +297,8 @@ def catch_interrupt(on_interrupt: Optional[Callable] = None):
 
 @function_cache(serialize_key=True)
 def get_health_page(key: dict) -> dict:
-    return Portal(key).get_health().json()
+    from dcicutils.portal_utils import Portal
+    return cached_get(Portal(key), "/health").json()
 
 
 def DEBUGGING():
@@ -10,7 +10,7 @@ _MOLECULE_PROPERTY_NAME = "molecule"
 _RNA_VALUE = "RNA"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["Analyte"])
 def _analyte_rin_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_ANALYTE_SCHEMA_NAME), list):
         return
@@ -29,7 +29,7 @@ _AGE_RELATED_STAINING_FIELDS = [
 
 
 # Neuropathology Present/Description Pairs
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["BrainPathologyReport"])
 def _brain_pathology_neuropathology_present_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -63,7 +63,7 @@ def _brain_pathology_neuropathology_present_validator(
 
 
 # Brain Subregions present
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["BrainPathologyReport"])
 def _brain_pathology_subregions_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -110,7 +110,7 @@ def _brain_pathology_subregions_validator(
 
 
 # Additional Age-Related Staining
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["BrainPathologyReport"])
 def _brain_pathology_age_related_staining_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -1,9 +1,24 @@
-from typing import Any, Callable
+import concurrent.futures
+import os
+import threading
+from typing import Any, Callable, List, Optional
+from dcicutils.misc_utils import to_integer
 from dcicutils.structured_data import StructuredDataSet
+from submitr.compact_rows import compact_structured_data
+from submitr.validators.profiler import ValidatorProfiler
+from submitr.validators.utils.revalidation import get_revalidation_state
 
 _VALIDATORS = {}
+_COLUMN_VALIDATORS = []
+_COLUMN_VALIDATORS_COLUMNS = {}
+_COLUMN_VALIDATORS_PROPERTY = "__column_validator_values__"
 _FINISH_VALIDATORS = []
+_FINISH_VALIDATORS_INFO = {}
+_FINISH_VALIDATORS_OPTIONS = ["sheets", "io", "after"]
+_FINISH_VALIDATORS_NTHREADS = max(
+    to_integer(os.environ.get("SUBMITR_FINISH_VALIDATOR_THREADS"), fallback=4) or 4, 1)
 _SHEET_VALIDATORS = {}
+_ALL_SHEETS = "*"
 
 
 # Decorator for per-column per-schema/type/sheet validators. Called by StructuredData
@@ -46,40 +61,100 @@ def structured_data_validator_hook(*decorator_args, **decorator_kwargs) -> Calla
     return decorator
 
 
+# Decorator for column-batch per-schema/type/sheet validators. Called (once) with whole columns
+# of values after a sheet has been parsed (rather than once per value). Usage like this:
+#
+#   @structured_data_validator_columns_hook("TissueSample", ["external_id", "category"])
+#   def your_validator(structured_data: StructuredDataSet, schema: str,
+#                      columns: Dict[str, List[Any]], rows: List[int], **kwargs) -> None:
+#
+# The first @structured_data_validator_columns_hook argument is a schema name (aka type or sheet name),
+# or "*" (_ALL_SHEETS) for all schemas; the second is a column name or list of column names. The validator
+# is called (once per schema) with the row numbers of the rows of the schema having any of the named columns,
+# and the values of each named column for those rows (None if not present), as lists, in row order.
+# The values are the (raw) values as given to per-column validators (see structured_data_validator_hook)
+# and as returned by any of those; the return value of a column-batch validator is ignored.
+#
+def structured_data_validator_columns_hook(*decorator_args, **decorator_kwargs) -> Callable:
+    if (len(decorator_args) > 0) and callable(decorator_args[0]):
+        print(f"CODE ERROR: Missing schema and column(s) arguments for"
+              f" @structured_data_validator_columns_hook: {decorator_args[0].__name__}")
+        exit(1)
+    def decorator(wrapped_function: Callable) -> Callable:  # noqa
+        nonlocal decorator_args, decorator_kwargs
+        if not ((len(decorator_args) == 2) and (not decorator_kwargs) and
+                isinstance(schema := decorator_args[0], str) and schema and
+                isinstance(columns := decorator_args[1], (str, list)) and columns):
+            print(f"CODE ERROR: Only schema and column(s) arguments permitted for"
+                  f" @structured_data_validator_columns_hook: {wrapped_function.__name__}")
+            exit(1)
+        if isinstance(columns, str):
+            columns = [columns]
+        _COLUMN_VALIDATORS.append({"schema": schema, "columns": columns, "validator": wrapped_function})
+        for column in columns:
+            _COLUMN_VALIDATORS_COLUMNS.setdefault(column, set()).add(schema)
+        return wrapped_function
+    return decorator
+
+
 # Decorator for finish validator. Called by StructuredData at the end of processing. Usage like this:
 #
 #   @structured_data_validator_finish_hook
 #   def your_finish_validator(structured_data: StructuredDataSet, *kwargs) -> None:
 #
+#   @structured_data_validator_finish_hook(sheets=["Tissue", "Donor"], io=True, after=["_some_validator"])
+#   def your_finish_validator(structured_data: StructuredDataSet, *kwargs) -> None:
+#
+# The optional sheets argument is the list of the schema/type/sheet names whose data the validator reads
+# (or modifies), where "*" means any/all sheets (the default); the io argument indicates if the validator
+# performs I/O, i.e. makes portal calls (default False); and the after argument is a list of the names of
+# any other finish validators which must run before this one. Finish validators whose sheets do not overlap
+# may run concurrently, I/O-bound ones on a thread pool; those whose sheets overlap run in the order defined.
+#
 def structured_data_validator_finish_hook(*decorator_args, **decorator_kwargs) -> Callable:
     # Reminder of how decorators works:
     # - @structured_data_validator_finish_hook -> decorator_args == tuple(wrapped_function)
     #   And the decorator function below does NOT get called.
     # - @structured_data_validator_finish_hook() -> decorator_args == tuple()
-    # - @structured_data_validator_finish_hook(arg) -> decorator_args == tuple(arg)
+    # - @structured_data_validator_finish_hook(sheets=[...]) -> decorator_kwargs == {"sheets": [...]}
     #   And the decorator function below DOES get called with the wrapped_function.
     if (len(decorator_args) == 1) and callable(wrapped_function := decorator_args[0]) and (not decorator_kwargs):
-        _FINISH_VALIDATORS.append(wrapped_function)
-        return wrapped_function  # <-- ADDED THIS LINE
+        _register_finish_validator(wrapped_function)
+        return wrapped_function
     def decorator(wrapped_function: Callable) -> Callable:  # noqa
         nonlocal decorator_args, decorator_kwargs
-        if (((len(decorator_args) != 0) and
-             (not (len(decorator_args) == 1 and
-                   ([f for f in _FINISH_VALIDATORS if f == wrapped_function]))))) or decorator_kwargs:
-            print(f"CODE ERROR: No arguments permitted for"
+        if decorator_args or [name for name in decorator_kwargs if name not in _FINISH_VALIDATORS_OPTIONS]:
+            print(f"CODE ERROR: Only sheets, io, and after keyword arguments permitted for"
                   f" @structured_data_validator_finish_hook: {wrapped_function.__name__}")
             exit(1)
-        _FINISH_VALIDATORS.append(wrapped_function)
-        return wrapped_function  # <-- AND THIS LINE
+        _register_finish_validator(wrapped_function, **decorator_kwargs)
+        return wrapped_function
     return decorator
 
 
+def _register_finish_validator(validator: Callable, sheets: Optional[List[str]] = None,
+                               io: bool = False, after: Optional[List[str]] = None) -> None:
+    if isinstance(sheets, str):
+        sheets = [sheets]
+    if isinstance(after, str):
+        after = [after]
+    _FINISH_VALIDATORS.append(validator)
+    _FINISH_VALIDATORS_INFO[validator] = {
+        "sheets": None if (sheets is None) or (_ALL_SHEETS in sheets) else set(sheets),
+        "io": io is True,
+        "after": set(after or [])
+    }
+
+
 # Decorator for per-schema/type/sheeet validators. Called from StructuredDataSet
 # at the end of processing for each sheet for post-processing. Usage like this:
 #
 #   @structured_data_validator_sheet_hook(["Analyte", "CellLine"])
 #   def some_validator(structured_data: StructuredDataSet, schema: str, data: dict) -> None:
 #
+# The special schema name "*" (_ALL_SHEETS) means the validator will be called for every sheet
+# (in addition to any validator defined specifically for the sheet).
+#
 def structured_data_validator_sheet_hook(*decorator_args, **decorator_kwargs) -> Callable:
     if (len(decorator_args) > 0) and callable(decorator_args[0]):
         print(f"CODE ERROR: Single schema name argument required for"
@@ -103,26 +178,220 @@ def structured_data_validator_sheet_hook(*decorator_args, **decorator_kwargs) ->
 
 
 # Define the main per-column/value StructuredDataSet hook (including the "finish" hook as a property thereof).
+# If a ValidatorProfiler is given then each validator call is profiled via it (see submitr.validators.profiler).
+# Values of columns having column-batch validators are saved up (in a hidden property of the StructuredDataSet)
+# and the column-batch validators are called for them when the sheet is done, i.e. from the per-sheet hook, or
+# when values for a different schema start arriving (e.g. for CSV), or at the latest, before finish validators.
+# If incremental validation is enabled (see submitr.validators.utils.revalidation) each value is noted for the
+# per-row content hashes. If compact_rows is True then the items of each sheet are replaced with compact rows
+# (see submitr.compact_rows) when values for a different schema start arriving, and the rest before the finish
+# validators; i.e. only the items of the sheet being parsed are held as full dictionaries (see --streaming).
 #
-def define_structured_data_validator_hook(**kwargs) -> Callable:
-    def hook(structured_data: StructuredDataSet, schema: str,
+def define_structured_data_validator_hook(profiler: Optional[ValidatorProfiler] = None,
+                                          compact_rows: bool = False, **kwargs) -> Callable:
+    previous_schema = None
+    def hook(structured_data: StructuredDataSet, schema: str,  # noqa
              column: str, row: int, value: Any) -> Any:
+        nonlocal previous_schema
+        if schema != previous_schema:
+            if compact_rows and previous_schema:
+                compact_structured_data(structured_data, previous_schema)
+            previous_schema = schema
         if ((validator := _VALIDATORS.get(column)) or
             (validator := _VALIDATORS.get(f"{schema}.{column}"))):  # noqa
-            return validator(structured_data, schema, column, row, value=value, **kwargs)
+            if profiler:
+                value = profiler.call("column", validator, structured_data, schema, column, row, value=value, **kwargs)
+            else:
+                value = validator(structured_data, schema, column, row, value=value, **kwargs)
+        if revalidation := get_revalidation_state(structured_data):
+            revalidation.note_value(schema, column, row, value)
+        if (schemas := _COLUMN_VALIDATORS_COLUMNS.get(column)) and ((schema in schemas) or (_ALL_SHEETS in schemas)):
+            if (column_values := getattr(structured_data, _COLUMN_VALIDATORS_PROPERTY, None)) is None:
+                column_values = _ColumnValues(profiler, kwargs)
+                setattr(structured_data, _COLUMN_VALIDATORS_PROPERTY, column_values)
+            elif column_values.schema != schema:
+                column_values.flush(structured_data)
+            column_values.add(schema, column, row, value)
         return value
     def finish_hook(structured_data: StructuredDataSet) -> None:  # noqa
         nonlocal kwargs
-        for validator in _FINISH_VALIDATORS:
-            validator(structured_data, **kwargs)
+        _flush_column_validators(structured_data)
+        if compact_rows:
+            compact_structured_data(structured_data)
+        _run_finish_validators(structured_data, _FINISH_VALIDATORS, profiler=profiler, **kwargs)
     setattr(hook, "finish", finish_hook)
     return hook
 
 
 # Define the main StructuredDataSet per-sheet hook.
 #
-def define_structured_data_validator_sheet_hook() -> Callable:
+def define_structured_data_validator_sheet_hook(profiler: Optional[ValidatorProfiler] = None) -> Callable:
     def hook(structured_data: StructuredDataSet, schema: str, data: dict) -> None:
-        if validator := _SHEET_VALIDATORS.get(schema):
-            validator(structured_data, schema, data)
+        _flush_column_validators(structured_data)
+        for validator in [_SHEET_VALIDATORS.get(schema), _SHEET_VALIDATORS.get(_ALL_SHEETS)]:
+            if validator:
+                if profiler:
+                    profiler.call("sheet", validator, structured_data, schema, data)
+                else:
+                    validator(structured_data, schema, data)
     return hook
+
+
+class _ColumnValues:
+    """
+    The saved up values, by row, of the columns (of a single schema at a time)
+    having column-batch validators; flush calls those validators for them.
+    """
+
+    def __init__(self, profiler: Optional[ValidatorProfiler], kwargs: dict) -> None:
+        self._profiler = profiler
+        self._kwargs = kwargs
+        self._schema = None
+        self._rows = {}
+
+    @property
+    def schema(self) -> Optional[str]:
+        return self._schema
+
+    def add(self, schema: str, column: str, row: int, value: Any) -> None:
+        self._schema = schema
+        if (row_values := self._rows.get(row)) is None:
+            self._rows[row] = row_values = {}
+        row_values[column] = value
+
+    def flush(self, structured_data: StructuredDataSet) -> None:
+        schema, row_values = self._schema, self._rows
+        self._schema, self._rows = None, {}
+        if not row_values:
+            return
+        for column_validator in _COLUMN_VALIDATORS:
+            if column_validator["schema"] not in (schema, _ALL_SHEETS):
+                continue
+            rows = [row for row, values in row_values.items()
+                    if any(column in values for column in column_validator["columns"])]
+            if not rows:
+                continue
+            rows.sort()
+            columns = {column: [row_values[row].get(column) for row in rows] for column in column_validator["columns"]}
+            if self._profiler:
+                self._profiler.call("columns", column_validator["validator"],
+                                    structured_data, schema, columns, rows, **self._kwargs)
+            else:
+                column_validator["validator"](structured_data, schema, columns, rows, **self._kwargs)
+
+
+def _flush_column_validators(structured_data: StructuredDataSet) -> None:
+    if column_values := getattr(structured_data, _COLUMN_VALIDATORS_PROPERTY, None):
+        column_values.flush(structured_data)
+
+
+# Runs the given finish validators, concurrently where possible (see structured_data_validator_finish_hook),
+# i.e. each validator starts once all of the (earlier defined) validators whose sheets overlap with its own,
+# and those it is declared to run after, are done; I/O-bound validators run on a thread pool, others inline.
+# So that the final ordering of validation errors is deterministic, those noted by each validator are buffered
+# (per validator) while the validators run, and are then actually noted, in validator (definition) order, once
+# all are done; errors noted by threads started by a validator are associated with it if it is the only one
+# running (and otherwise are noted after those of all of the validators).
+# The number of threads may be set via SUBMITR_FINISH_VALIDATOR_THREADS; if one they are run sequentially.
+#
+def _run_finish_validators(structured_data: StructuredDataSet, validators: List[Callable],
+                           profiler: Optional[ValidatorProfiler] = None,
+                           nthreads: Optional[int] = None, **kwargs) -> None:
+
+    def run_validator(index: int) -> None:  # noqa
+        validator = validators[index]
+        if profiler:
+            profiler.call("finish", validator, structured_data, **kwargs)
+        else:
+            validator(structured_data, **kwargs)
+
+    if (nthreads := nthreads or _FINISH_VALIDATORS_NTHREADS) <= 1 or len(validators) <= 1:
+        for index in range(len(validators)):
+            run_validator(index)
+        return
+
+    dependencies = _get_finish_validator_dependencies(validators)
+    lock = threading.RLock()
+    thread = threading.local()
+    running = set()
+    exceptions = {}
+    errors = [[] for _ in range(len(validators) + 1)]
+    note_validation_error = structured_data.note_validation_error
+
+    def run_tracked_validator(index: int) -> None:  # noqa
+        thread.validator = index
+        with lock:
+            running.add(index)
+        try:
+            run_validator(index)
+        except Exception as e:
+            exceptions[index] = e
+        finally:
+            with lock:
+                running.discard(index)
+            thread.validator = None
+
+    def tracked_note_validation_error(*args, **kwargs) -> None:  # noqa
+        with lock:
+            if (index := getattr(thread, "validator", None)) is None:
+                index = next(iter(running)) if len(running) == 1 else len(validators)
+            errors[index].append((args, kwargs))
+
+    setattr(structured_data, "note_validation_error", tracked_note_validation_error)
+    try:
+        pending = list(range(len(validators)))
+        done = set()
+        futures = {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+            while pending or futures:
+                if exceptions:
+                    # As in the sequential case, once a validator raises no further validators are started;
+                    # those already running are waited for (they cannot be interrupted) before raising.
+                    pending.clear()
+                    if not futures:
+                        break
+                ready = [index for index in pending if dependencies[index] <= done]
+                if not ready and not futures:
+                    ready = [pending[0]]  # Circular after dependencies; just run in definition order.
+                inline_index = None
+                for index in ready:
+                    if _FINISH_VALIDATORS_INFO.get(validators[index], {}).get("io"):
+                        futures[executor.submit(run_tracked_validator, index)] = index
+                        pending.remove(index)
+                    elif inline_index is None:
+                        inline_index = index
+                if inline_index is not None:
+                    pending.remove(inline_index)
+                    run_tracked_validator(inline_index)
+                    done.add(inline_index)
+                    continue
+                finished, _ = concurrent.futures.wait(futures, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in finished:
+                    done.add(futures.pop(future))
+    finally:
+        setattr(structured_data, "note_validation_error", note_validation_error)
+        for validator_errors in errors:
+            for args, kwargs in validator_errors:
+                note_validation_error(*args, **kwargs)
+    if exceptions:
+        raise exceptions[min(exceptions)]
+
+
+def _get_finish_validator_dependencies(validators: List[Callable]) -> List[set]:
+    dependencies = []
+    for index, validator in enumerate(validators):
+        info = _FINISH_VALIDATORS_INFO.get(validator, {})
+        sheets, after = info.get("sheets"), info.get("after") or set()
+        validator_dependencies = set()
+        for other_index, other_validator in enumerate(validators):
+            if other_index == index:
+                continue
+            if (other_index < index) and ((sheets is None) or
+                                          ((other_sheets := _FINISH_VALIDATORS_INFO.get(
+                                              other_validator, {}).get("sheets")) is None) or
+                                          (sheets & other_sheets)):
+                validator_dependencies.add(other_index)
+            elif getattr(other_validator, "__name__", None) in after:
+                validator_dependencies.add(other_index)
+        dependencies.append(validator_dependencies)
+    return dependencies
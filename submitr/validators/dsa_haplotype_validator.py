@@ -13,7 +13,7 @@ _FASTA_FILE_FORMAT = "fa"
 _DSA_DATA_TYPE = "DSA"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["SupplementaryFile"])
 def _dsa_haplotype_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_SUPP_FILE_SCHEMA_NAME), list):
         return
@@ -1,37 +1,53 @@
-import json
-from typing import List, Optional, Tuple
+from typing import Any, Hashable, List, Optional
+from dcicutils.lang_utils import conjoined_list
 from dcicutils.structured_data import StructuredDataSet
 from submitr.validators.decorators import structured_data_validator_sheet_hook
 
-# Sheets for which we will check for duplicate rows, per:
-# https://docs.google.com/document/d/1zj-edWR1ugqhd6ZxC07Rkq6M7I_jqiR-pO598gFg0p8
-_DUPLICATE_ROW_DETECTION_SHEETS = [
-    "AnalytePreparation",
-    "Basecalling",
-    "LibraryPreparation",
-    "PreparationKit",
-    "Sequencing",
-    "Software",
-    "Treatment"
-]
+# Validator which checks for duplicate (i.e. identical) rows within each sheet. Originally only done for
+# certain sheets (AnalytePreparation, Basecalling, LibraryPreparation, PreparationKit, Sequencing, Software,
+# Treatment) per: https://docs.google.com/document/d/1zj-edWR1ugqhd6ZxC07Rkq6M7I_jqiR-pO598gFg0p8
+# But since this is now cheap (linear in the number of cells, via hashing of a canonical hashable
+# form of each row rather than of its JSON serialization), we do it for every sheet.
+# All groups of duplicate rows are reported, one validation error per group.
 
 
-@structured_data_validator_sheet_hook(_DUPLICATE_ROW_DETECTION_SHEETS)
+@structured_data_validator_sheet_hook("*")
 def _duplicate_row_validator(structured_data: StructuredDataSet, schema: str, data: List[dict]) -> Optional[List[dict]]:
-    index, duplicate_index = _find_duplicate_elements(data)
-    if duplicate_index is not None:
+    for duplicate_indices in _find_duplicate_elements(data):
         # When reporting the indices we add two; one because it was
         # zero-indexed (by _find_duplicate_elements), and another one for the header column.
         structured_data.note_validation_error(
-            f"Duplicate rows in sheet: {schema} (items: {index + 2} and {duplicate_index + 2})", schema)
+            f"Duplicate rows in sheet: {schema}"
+            f" (items: {conjoined_list([index + 2 for index in duplicate_indices])})", schema)
 
 
-def _find_duplicate_elements(array: List[dict]) -> Tuple[Optional[int], Optional[int]]:
+def _find_duplicate_elements(array: List[dict]) -> List[List[int]]:
+    """
+    Returns the list of groups of (zero-based) indices of duplicate (identical) elements of the
+    given list; each group is in ascending order, and the groups are ordered by their first index.
+    """
+    duplicates = []
     if isinstance(array, list):
         seen = {}
         for index, element in enumerate(array):
-            serialized_element = json.dumps(element, sort_keys=True)
-            if serialized_element in seen:
-                return seen[serialized_element], index
-            seen[serialized_element] = index
-    return None, None
+            if (indices := seen.get(canonical_element := _canonical(element))) is None:
+                seen[canonical_element] = [index]
+            else:
+                if len(indices) == 1:
+                    duplicates.append(indices)
+                indices.append(index)
+    return duplicates
+
+
+def _canonical(value: Any) -> Hashable:
+    # Returns a hashable form of the given (JSON-like) value such that two values have equal canonical
+    # forms iff they would have equal JSON serializations (with sorted keys): dictionaries are order-
+    # independent (frozenset), lists are ordered (tuple); non-string scalars are tagged with their type
+    # so that, for example, 1, 1.0, and True, which are equal (and hash equally) in Python, are distinct.
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return frozenset((key, _canonical(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_canonical(item) for item in value)
+    return (type(value), value) if isinstance(value, Hashable) else (type(value), repr(value))
@@ -1,6 +1,7 @@
 from dcicutils.structured_data import StructuredDataSet
 from dcicutils.misc_utils import to_integer
 from submitr.validators.decorators import structured_data_validator_finish_hook
+from submitr.validators.utils.index import get_schema_index
 
 # Sanity check the pseudo-column FileSet.expected_file_count which should be equal,
 # for each FileSet row, to all of the actual file type (e.g. AlignedReads) rows
@@ -10,23 +11,22 @@ from submitr.validators.decorators import structured_data_validator_finish_hook
 _FILE_SET_SCHEMA_NAME = "FileSet"
 _FILE_SET_EXPECTED_FILE_COUNT_PSEUDO_COLUMN_NAME = "expected_file_count"
 _FILE_SCHEMA_NAMES = ["AlignedReads", "UnalignedReads", "VariantCalls"]
+_FILE_SETS_PROPERTY_NAME = "file_sets"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["FileSet", "AlignedReads", "UnalignedReads", "VariantCalls"])
 def _file_set_count_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_FILE_SET_SCHEMA_NAME), list):
         return
-    for item in data:
+    for index, item in enumerate(data):
         if _FILE_SET_EXPECTED_FILE_COUNT_PSEUDO_COLUMN_NAME in item:
             if ((submitted_id := item.get("submitted_id")) and
                 ((expected_file_count :=
                   to_integer(item[_FILE_SET_EXPECTED_FILE_COUNT_PSEUDO_COLUMN_NAME], fallback=-1)) >= 0)):  # noqa
-                actual_file_count = 0
-                for file_schema_name in _FILE_SCHEMA_NAMES:
-                    if isinstance(files := structured_data.data.get(file_schema_name), list):
-                        for file in files:
-                            if file.get("submitted_id") == submitted_id:
-                                actual_file_count += 1
+                actual_file_count = sum(
+                    len(get_schema_index(structured_data, file_schema_name).referencing(
+                        _FILE_SETS_PROPERTY_NAME, submitted_id))
+                    for file_schema_name in _FILE_SCHEMA_NAMES)
                 if actual_file_count != expected_file_count:
                     structured_data.note_validation_error(
                         f"{_FILE_SET_SCHEMA_NAME}.{_FILE_SET_EXPECTED_FILE_COUNT_PSEUDO_COLUMN_NAME}"
@@ -34,3 +34,4 @@ def _file_set_count_validator(structured_data: StructuredDataSet, **kwargs) -> N
                         f" files defined for this set: {submitted_id}")
                     pass
             del item[_FILE_SET_EXPECTED_FILE_COUNT_PSEUDO_COLUMN_NAME]
+            data[index] = item  # Written back as the rows may be compact (see submitr.compact_rows).
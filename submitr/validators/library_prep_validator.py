@@ -1,5 +1,6 @@
 from dcicutils.structured_data import StructuredDataSet
 from submitr.validators.decorators import structured_data_validator_finish_hook
+from submitr.validators.utils.index import get_schema_index
 
 # Validator that reports if any Library items defined in the spreadsheet (StructuredDataSet)
 # are missing the strand property in LibraryPreparation if they are linked to RNA Analyte items
@@ -23,33 +24,25 @@ _LIBRARY_PREP_SCHEMA_NAME = "LibraryPreparation"
 _STRAND_PROPERTY_NAME = "strand"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["Library", "Analyte", "LibraryPreparation"])
 def _library_prep_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_LIBRARY_SCHEMA_NAME), list):
         return
+    analyte_index = get_schema_index(structured_data, _ANALTYE_SCHEMA_NAME)
+    library_prep_index = get_schema_index(structured_data, _LIBRARY_PREP_SCHEMA_NAME)
     for item in data:
         if _ANALYTE_PROPERTY_NAME in item and (
             submitted_id := item.get("submitted_id", "")
         ):
-            if (analytes := [
-                    analyte_item
-                    for analyte_item in structured_data.data.get(_ANALTYE_SCHEMA_NAME, [])
-                    if analyte_item.get("submitted_id", "")
-                    in item.get(_ANALYTE_PROPERTY_NAME, [])
-            ]):
+            if (analytes := analyte_index.items_in(item.get(_ANALYTE_PROPERTY_NAME, []))):
                 for analyte in analytes:
                     if _RNA_VALUE_NAME in analyte.get(_MOLECULE_PROPERTY_NAME, ""):
                         # RNA analyte
                         if _LIBRARY_PREP_PROPERTY_NAME in item:
                             # library prep item present
-                            if library_prep := [
-                                lp_item
-                                for lp_item in structured_data.data.get(
-                                    _LIBRARY_PREP_SCHEMA_NAME, []
-                                )
-                                if lp_item.get("submitted_id", "")
-                                == item.get(_LIBRARY_PREP_PROPERTY_NAME, "")
-                            ]:
+                            if library_prep := library_prep_index.items(
+                                item.get(_LIBRARY_PREP_PROPERTY_NAME, "")
+                            ):
                                 assay = item.get(_ASSAY_PROPERTY_NAME, "")
                                 if _STRAND_PROPERTY_NAME not in library_prep[0]:
                                     # missing strand property
@@ -76,14 +69,9 @@ def _library_prep_validator(structured_data: StructuredDataSet, **kwargs) -> Non
                             )
                     else:
                         if _LIBRARY_PREP_PROPERTY_NAME in item:
-                            if library_prep := [
-                                lp_item
-                                for lp_item in structured_data.data.get(
-                                    _LIBRARY_PREP_SCHEMA_NAME, []
-                                )
-                                if lp_item.get("submitted_id", "")
-                                == item.get(_LIBRARY_PREP_PROPERTY_NAME, "")
-                            ]:
+                            if library_prep := library_prep_index.items(
+                                item.get(_LIBRARY_PREP_PROPERTY_NAME, "")
+                            ):
                                 if _STRAND_PROPERTY_NAME in library_prep[0]:
                                     # DNA analyte with strand property
                                     structured_data.note_validation_error(
@@ -12,7 +12,7 @@ _PATHOLOGIC_FINDINGS_PROPERTY = "pathologic_findings"
 
 
 # Validator 1: Target Tissues
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["NonBrainPathologyReport"])
 def _non_brain_pathology_target_tissues_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -91,7 +91,7 @@ def _non_brain_pathology_target_tissues_validator(
 
 
 # Validator 2: Non-Target Tissues
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["NonBrainPathologyReport"])
 def _non_brain_pathology_non_target_tissues_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -140,7 +140,7 @@ def _non_brain_pathology_non_target_tissues_validator(
 
 
 # Validator 3: Pathologic Findings
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["NonBrainPathologyReport"])
 def _non_brain_pathology_findings_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -33,7 +33,7 @@ _FASTQ_FILE_FORMAT = "fastq_gz"
 _ONT_SEARCH_QUERY = "search/?type=Sequencer&platform=ONT&field=identifier"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["UnalignedReads", "FileSet", "Sequencing", "Software"], io=True)
 def _ont_unaligned_reads_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_UNALIGNED_READS_SCHEMA_NAME), list):
         return
@@ -1,5 +1,6 @@
 from dcicutils.structured_data import StructuredDataSet
 from submitr.validators.decorators import structured_data_validator_finish_hook
+from submitr.validators.utils.index import get_schema_index
 
 import collections
 
@@ -13,10 +14,11 @@ _READ_PAIR_NUMBER_PROPERTY_NAME = "read_pair_number"
 _PAIRED_WITH_PROPERTY_NAME = "paired_with"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["UnalignedReads"])
 def _paired_read_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_UNALIGNED_READS_SCHEMA_NAME), list):
         return
+    unaligned_reads_index = get_schema_index(structured_data, _UNALIGNED_READS_SCHEMA_NAME)
     for item in data:
         if _FILE_SETS_PROPERTY_NAME in item and (
             submitted_id := item.get("submitted_id", "")
@@ -32,11 +34,7 @@ def _paired_read_validator(structured_data: StructuredDataSet, **kwargs) -> None
                         f" File read_pair_number is"
                         f" {item.get(_READ_PAIR_NUMBER_PROPERTY_NAME)}."
                     )
-                if (paired_file := [
-                    paired_file_item
-                    for paired_file_item in structured_data.data.get(_UNALIGNED_READS_SCHEMA_NAME, [])
-                    if paired_file_item.get("submitted_id", "") == item.get(_PAIRED_WITH_PROPERTY_NAME, "")
-                ]):
+                if (paired_file := unaligned_reads_index.items(item.get(_PAIRED_WITH_PROPERTY_NAME, ""))):
                     paired_file_set = paired_file[0].get(_FILE_SETS_PROPERTY_NAME, "")
                     read_pair_number = paired_file[0].get(_READ_PAIR_NUMBER_PROPERTY_NAME, "")
                     if item.get(_FILE_SETS_PROPERTY_NAME) != paired_file_set:
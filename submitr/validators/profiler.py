@@ -0,0 +1,181 @@
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from dcicutils import ff_utils
+
+# Profiler for the validators defined via the decorators in submitr.validators.decorators; records,
+# per validator, the number of calls, cumulative (wall-clock) time, number of portal calls made, and
+# number of validation errors noted. Pass an instance of ValidatorProfiler as the profiler argument to
+# define_structured_data_validator_hook and define_structured_data_validator_sheet_hook, and use it as
+# a context manager around StructuredDataSet.load_file; results via get_results, format_results, write.
+#
+# Portal calls are counted via instance-level wrappers of the (HTTP) methods of the StructuredDataSet
+# portal, and of the dcicutils.ff_utils search/get functions; all of which (as well as the wrapper of
+# the StructuredDataSet note_validation_error method) are in place only while the profiler context is
+# active, i.e. the originals are restored on exit;
+# they (and noted validation errors) are attributed to the validator running in the calling thread;
+# or, for threads started by a validator (e.g. for concurrent portal queries), to the validator which
+# is running if there is just one, otherwise they are attributed to "(unattributed)".
+
+_PORTAL_METHODS = ["get", "post", "patch", "head", "get_metadata"]
+_FF_UTILS_FUNCTIONS = ["search_metadata", "get_metadata"]
+_UNATTRIBUTED = "(unattributed)"
+
+
+class ValidatorProfiler:
+
+    def __init__(self) -> None:
+        self._stats = {}
+        self._running = {}
+        self._lock = threading.Lock()
+        self._thread = threading.local()
+        self._instrumented = {}
+        self._ff_utils_functions = None
+
+    def __enter__(self) -> "ValidatorProfiler":
+        if self._ff_utils_functions is None:
+            self._ff_utils_functions = {}
+            for name in _FF_UTILS_FUNCTIONS:
+                self._ff_utils_functions[name] = function = getattr(ff_utils, name)
+                setattr(ff_utils, name, self._portal_call_wrapper(function))
+        return self
+
+    def __exit__(self, *args) -> None:
+        if self._ff_utils_functions is not None:
+            for name, function in self._ff_utils_functions.items():
+                setattr(ff_utils, name, function)
+            self._ff_utils_functions = None
+        with self._lock:
+            instrumented = list(self._instrumented.values())
+            self._instrumented = {}
+        for originals in instrumented:
+            for target, name, original in originals:
+                try:
+                    setattr(target, name, original)
+                except Exception:
+                    pass
+
+    def call(self, kind: str, validator: Callable, structured_data: Any, *args, **kwargs) -> Any:
+        """
+        Calls the given validator (of the given kind, i.e. column, sheet, or finish) with the given
+        StructuredDataSet and other arguments, recording its call count and time, and returns its value.
+        """
+        name = getattr(validator, "__name__", None) or str(validator)
+        self._instrument(structured_data)
+        stack = self._get_stack()
+        stack.append(name)
+        with self._lock:
+            self._running[name] = self._running.get(name, 0) + 1
+        started = time.perf_counter()
+        try:
+            return validator(structured_data, *args, **kwargs)
+        finally:
+            duration = time.perf_counter() - started
+            stack.pop()
+            with self._lock:
+                if (running := self._running[name] - 1) > 0:
+                    self._running[name] = running
+                else:
+                    del self._running[name]
+                stats = self._get_stats(name, kind)
+                stats["calls"] += 1
+                stats["time"] += duration
+
+    def get_results(self) -> List[Dict]:
+        """
+        Returns the profile results, i.e. per validator a dictionary with its name, kind, calls,
+        time (seconds), portal_calls, and errors; ordered by time descending (then name).
+        """
+        with self._lock:
+            return sorted([dict(stats) for stats in self._stats.values()],
+                          key=lambda stats: (-stats["time"], stats["name"]))
+
+    def format_results(self) -> List[str]:
+        if not (results := self.get_results()):
+            return []
+        rows = [["Validator", "Kind", "Calls", "Time", "Avg", "Portal calls", "Errors"]]
+        for stats in results:
+            average = stats["time"] / stats["calls"] if stats["calls"] else 0
+            rows.append([stats["name"], stats["kind"], str(stats["calls"]), f"{stats['time']:.3f}s",
+                         f"{average * 1000:.3f}ms", str(stats["portal_calls"]), str(stats["errors"])])
+        widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+        lines = []
+        for index, row in enumerate(rows):
+            lines.append(" | ".join(value.ljust(widths[i]) if i < 2 else value.rjust(widths[i])
+                                    for i, value in enumerate(row)).rstrip())
+            if index == 0:
+                lines.append("-+-".join("-" * width for width in widths))
+        return lines
+
+    def write(self, file: str) -> None:
+        with open(file, "w") as f:
+            json.dump({"validators": self.get_results()}, f, indent=4)
+            f.write("\n")
+
+    def _instrument(self, structured_data: Any) -> None:
+        # Only while the profiler context is active; the originals are restored on exit.
+        if (self._ff_utils_functions is None) or (id(structured_data) in self._instrumented):
+            return
+        with self._lock:
+            if id(structured_data) in self._instrumented:
+                return
+            self._instrumented[id(structured_data)] = originals = []
+        if portal := getattr(structured_data, "portal", None):
+            for name in _PORTAL_METHODS:
+                if callable(method := getattr(portal, name, None)):
+                    try:
+                        setattr(portal, name, self._portal_call_wrapper(method))
+                        originals.append((portal, name, method))
+                    except Exception:
+                        pass
+        if callable(note_validation_error := getattr(structured_data, "note_validation_error", None)):
+            def profiled_note_validation_error(*args, **kwargs) -> Any:  # noqa
+                self._count("errors")
+                return note_validation_error(*args, **kwargs)
+            try:
+                setattr(structured_data, "note_validation_error", profiled_note_validation_error)
+                originals.append((structured_data, "note_validation_error", note_validation_error))
+            except Exception:
+                pass
+
+    def _portal_call_wrapper(self, function: Callable) -> Callable:
+        def profiled_portal_call(*args, **kwargs) -> Any:  # noqa
+            # Only count the outermost call, e.g. not ff_utils.get_metadata called from portal.get_metadata.
+            if getattr(self._thread, "portal_call", False):
+                return function(*args, **kwargs)
+            self._thread.portal_call = True
+            try:
+                self._count("portal_calls")
+                return function(*args, **kwargs)
+            finally:
+                self._thread.portal_call = False
+        return profiled_portal_call
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            if not (name := self._get_current_validator()):
+                return
+            if (stats := self._stats.get(name)) is None:
+                stats = self._get_stats(name, "")
+            stats[counter] += 1
+
+    def _get_current_validator(self) -> Optional[str]:
+        if stack := self._get_stack():
+            return stack[-1]
+        if len(self._running) == 1:
+            return next(iter(self._running))
+        return _UNATTRIBUTED if self._running else None
+
+    def _get_stack(self) -> List[str]:
+        if (stack := getattr(self._thread, "stack", None)) is None:
+            self._thread.stack = stack = []
+        return stack
+
+    def _get_stats(self, name: str, kind: str) -> Dict:
+        if (stats := self._stats.get(name)) is None:
+            self._stats[name] = stats = {"name": name, "kind": kind, "calls": 0,
+                                         "time": 0.0, "portal_calls": 0, "errors": 0}
+        elif kind and not stats["kind"]:
+            stats["kind"] = kind
+        return stats
@@ -1,40 +1,41 @@
-from typing import Any
-from dcicutils.misc_utils import run_concurrently  # noqa
+from typing import Any, Dict, List
 from dcicutils.structured_data import StructuredDataSet
-from submitr.validators.decorators import structured_data_validator_hook, structured_data_validator_finish_hook
+from submitr.validators.decorators import structured_data_validator_columns_hook, structured_data_validator_finish_hook
+from submitr.validators.utils.revalidation import get_revalidation_state
+from submitr.validators.utils.submitted_id import validate_submitted_ids
 
 # Validator for the submitted_id column which is checked for EVERY schema (aka type or sheet)
-# within the submission metadata. We use the smaht-portal /validators/submitted_id/{submitted_id}
-# endpoint/API to do the actual validation. But for better performance we do this in parallel
-# as much as possible. And to do this we need to save up the list of all submitted_id values,
-# within the main _submitted_id_validator function. Then when the _submitted_id_validator_finish
-# function is called at the end of the submission metadata processing, we make the smaht-portal
-# API calls concurrently (via run_concurrently); this function also checks-for/reports duplicates.
+# within the submission metadata. We use the smaht-portal /validators/submitted_id endpoint/API
+# to do the actual validation. But for better performance we do this in bulk as much as possible.
+# And to do this we need to save up the list of all submitted_id values, within the main
+# _submitted_id_validator function. Then when the _submitted_id_validator_finish function is called
+# at the end of the submission metadata processing, we validate all of the (unique, across all schemas)
+# submitted_id values at once via validate_submitted_ids (which makes the API calls concurrently),
+# and then report any errors in row order, including for any submitted_id which could not be validated
+# at all (i.e. the portal request failed even after retries); this function also checks-for/reports
+# duplicates. With incremental validation (see the revalidation module) the (portal) result for a row
+# whose content is unchanged since the previous run is reused.
 
 _STRUCTURED_DATA_HOOK_PROPERTY = "__submitted_id_validator__"
-_NTHREADS_FOR_SMAHT_PORTAL_API_CALLS = 6
 
 
-@structured_data_validator_hook("submitted_id")
+@structured_data_validator_columns_hook("*", "submitted_id")
 def _submitted_id_validator(structured_data: StructuredDataSet, schema: str,
-                            column: str, row: int, value: Any, **kwargs) -> Any:
+                            columns: Dict[str, List[Any]], rows: List[int], **kwargs) -> None:
 
     # Squirrel away the list of all seen submitted_id values within a hidden property
     # in the StructuredDataSet object. We save these up and process/validate them all
     # at once in _submitted_id_validator_finish so that we can do themt in parallel.
+    # This is a column-batch validator so we get the whole (sheet) column of values at once.
     if not hasattr(structured_data, _STRUCTURED_DATA_HOOK_PROPERTY):
         setattr(structured_data, _STRUCTURED_DATA_HOOK_PROPERTY, {})
     submitted_ids = getattr(structured_data, _STRUCTURED_DATA_HOOK_PROPERTY)
     if schema not in submitted_ids:
         submitted_ids[schema] = []
-    # If we decide at some point that we don't want to store the entire
-    # submitted_id list in memory, we could kick off the calls here in
-    # parallel _NTHREADS_FOR_SMAHT_PORTAL_API_CALLS at a time.
-    submitted_ids[schema].append({"value": value, "row": row})
-    return value
+    submitted_ids[schema].extend({"value": value, "row": row} for value, row in zip(columns["submitted_id"], rows))
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=[], io=True)
 def _submitted_id_validator_finish(structured_data: StructuredDataSet, **kwargs) -> None:
 
     if not hasattr(structured_data, _STRUCTURED_DATA_HOOK_PROPERTY):
@@ -43,30 +44,13 @@ def _submitted_id_validator_finish(structured_data: StructuredDataSet, **kwargs)
         return
     valid_submission_centers = kwargs.get("valid_submission_centers")
 
-    def validate_submitted_id(submitted_id: str, schema: str, row: int) -> None:
-        nonlocal structured_data, valid_submission_centers
-        path = f"/validators/submitted_id/{submitted_id}"
-        if valid_submission_centers:
-            path += f"?submission_centers={valid_submission_centers}"
-        # Here is the actual call to the /validators/submitted_id/{submitted_id} endpoint/API.
-        if result := structured_data.portal.get_metadata(path):
-            if (result := result.get("status")) != "OK":
-                structured_data.note_validation_error(result, schema, row)
-
-    # The submitted_id_validators array here will be the list of functions/lambdas to be called
-    # in parallel (see run_concurrently call below) for better performance. This same
-    # loop also checks for duplicate submitted_id values within each schema/type/sheet.
-    submitted_id_validators = []
+    # This loop checks for duplicate submitted_id values within each schema/type/sheet.
     for schema in submitted_ids:
         uniques = {}
         duplicates = []
         for item in submitted_ids[schema]:
             submitted_id = item.get("value")
             row = item.get("row")
-            # This adds the actual validation function/lambda to the submitted_id_validators list.
-            submitted_id_validators.append(
-                lambda submitted_id=submitted_id, schema=schema, row=row:
-                    validate_submitted_id(submitted_id, schema, row))
             if submitted_id not in uniques:
                 uniques[submitted_id] = row
             else:
@@ -77,6 +61,30 @@ def _submitted_id_validator_finish(structured_data: StructuredDataSet, **kwargs)
                                 f" (first seen on item: {uniques[duplicate_submitted_id] + 1})")
             duplicate_row = duplicate.get("row")
             structured_data.note_validation_error(validation_error, schema, duplicate_row)
-    # This call kicks off calls to the validation functions/lambdas (in submitted_id_validators)
-    # in parallel, up to _NTHREADS_FOR_SMAHT_PORTAL_API_CALLS threads at a time.
-    run_concurrently(submitted_id_validators, nthreads=_NTHREADS_FOR_SMAHT_PORTAL_API_CALLS)
+
+    # This call validates all of the unique submitted_id values (across all schemas) via the portal,
+    # concurrently; and we then report any errors, for each schema, in row order. If doing incremental
+    # validation then the results (from the previous run) for unchanged rows are reused; a failure to
+    # validate a submitted_id at all is reported as an error, but not saved for reuse of course.
+    revalidation = get_revalidation_state(structured_data)
+    revalidation_key = f"submitted_id|{valid_submission_centers or ''}"
+    cached_results = {}
+    if revalidation:
+        for schema in submitted_ids:
+            for item in submitted_ids[schema]:
+                if (status := revalidation.get_result(revalidation_key, schema, item.get("row"))) is not None:
+                    cached_results[(schema, item.get("row"))] = status
+    results = validate_submitted_ids(structured_data.portal,
+                                     [item.get("value") for schema in submitted_ids
+                                      for item in submitted_ids[schema]
+                                      if (schema, item.get("row")) not in cached_results],
+                                     submission_centers=valid_submission_centers)
+    for schema in submitted_ids:
+        for item in sorted(submitted_ids[schema], key=lambda item: item.get("row")):
+            if (status := cached_results.get((schema, item.get("row")))) is None:
+                if (status := results.get(item.get("value"))) and revalidation:
+                    revalidation.set_result(revalidation_key, schema, item.get("row"), status)
+                elif (status is None) and (item.get("value") in results):
+                    status = f"Cannot validate submitted_id via portal (request failed): {item.get('value')}"
+            if status and (status != "OK"):
+                structured_data.note_validation_error(status, schema, item.get("row"))
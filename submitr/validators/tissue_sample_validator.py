@@ -1,11 +1,13 @@
 from typing import Dict, List, Optional, Tuple
 import re
 import logging
+from dcicutils.misc_utils import run_concurrently
 from dcicutils.structured_data import StructuredDataSet
 
 from submitr.validators.decorators import structured_data_validator_finish_hook
 
-from submitr.validators.utils import portal as portal_utils, item as item_utils
+from submitr.validators.utils import portal as portal_utils, item as item_utils, regex as regex_utils
+from submitr.validators.utils.index import get_schema_index
 
 # Validator that reports if any TissueSample items are linked to Tissue items
 # with an external_id that does not contain the external_id of the Tissue
@@ -22,6 +24,8 @@ _NDRI_TPC_DISPLAY_TITLE = "NDRI TPC"
 _BENCHMARKING_PREFIX = "ST"
 _PRODUCTION_PREFIX = "SMHT"
 _METADATA_COMPARISON_PROPERTIES = ["category", "preservation_type"]
+_EXTERNAL_IDS_PER_PORTAL_QUERY = 50
+_NTHREADS_FOR_PORTAL_QUERIES = 6
 _CATEGORY_REGEX_MAP = {
     "Tissue Aliquot": re.compile(
         r"-[13](?:A[A-Z]?|[B-Z])-(?:00[1-9]|0[1-9][0-9]|1[0-1][0-9]|12[0-5])$"
@@ -62,7 +66,7 @@ def _note_validation_warning(structured_data: StructuredDataSet, message: str) -
     _logger.warning("Validation warning: %s", message)
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["TissueSample", "Tissue"])
 def _tissue_sample_external_id_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -70,16 +74,13 @@ def _tissue_sample_external_id_validator(
         data := structured_data.data.get(_TISSUE_SAMPLE_SCHEMA_NAME), list
     ):
         return
+    tissue_index = get_schema_index(structured_data, _TISSUE_SCHEMA_NAME)
     for item in data:
         if _SAMPLE_SOURCE_PROPERTY_NAME in item and (
             submitted_id := item.get("submitted_id", "")
         ):
             tissue_sample_sc = submitted_id.split("_")[0]
-            if tissue_items := [
-                tissue
-                for tissue in structured_data.data.get(_TISSUE_SCHEMA_NAME, [])
-                if tissue.get("submitted_id", "") in item.get(_SAMPLE_SOURCE_PROPERTY_NAME, "")
-            ]:
+            if tissue_items := tissue_index.items_in(item.get(_SAMPLE_SOURCE_PROPERTY_NAME, "")):
                 tissue_sc = tissue_items[0].get("submitted_id", "").split("_")[0]
                 if (
                     tissue_sample_sc == _NDRI_SUBMISSION_CENTER_PREFIX
@@ -100,7 +101,7 @@ def _tissue_sample_external_id_validator(
                         )
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["TissueSample"], io=True)
 def _tissue_sample_metadata_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -128,6 +129,19 @@ def _tissue_sample_metadata_validator(
 
     portal_key = structured_data.portal.key
 
+    # Query portal up front (in batches, concurrently) for all relevant external_ids.
+    _prefetch_tissue_samples(
+        [
+            external_id
+            for item in data
+            if (external_id := item_utils.get_external_id(item))
+            and item_utils.get_submitted_id(item)
+            and _is_benchmarking_or_production(external_id)
+        ],
+        samples_cache,
+        portal_key,
+    )
+
     for item in data:
         submitted_id = item_utils.get_submitted_id(item)
         external_id = item_utils.get_external_id(item)
@@ -147,10 +161,7 @@ def _tissue_sample_metadata_validator(
         # Track this external_id
         seen_external_ids[external_id] = submitted_id
 
-        if not (
-            external_id.startswith(_BENCHMARKING_PREFIX)
-            or external_id.startswith(_PRODUCTION_PREFIX)
-        ):
+        if not _is_benchmarking_or_production(external_id):
             continue
 
         # Determine if this is TPC or GCC submission
@@ -232,6 +243,51 @@ def _get_or_fetch_tissue_samples(
     return samples
 
 
+def _is_benchmarking_or_production(external_id: str) -> bool:
+    return external_id.startswith(_BENCHMARKING_PREFIX) or external_id.startswith(
+        _PRODUCTION_PREFIX
+    )
+
+
+def _prefetch_tissue_samples(
+    external_ids: List[str],
+    cache: Dict[str, List[Dict]],
+    portal_key: Dict,
+) -> None:
+    """
+    Fetch from portal tissue samples for all given (not already cached) external_ids, caching results.
+    Queried in batches (multi-valued external_id search), with batches run concurrently; if a batch
+    query fails then each of its external_ids is queried individually (failures cached as None).
+    """
+    external_ids = [
+        external_id
+        for external_id in dict.fromkeys(external_ids)
+        if external_id not in cache
+    ]
+    if not external_ids:
+        return
+
+    def fetch_batch(batch: List[str]) -> None:  # noqa
+        if (samples := portal_utils.search_tissue_samples_by_external_ids(batch, portal_key)) is None:
+            samples = {
+                external_id: portal_utils.search_tissue_samples_by_external_id(external_id, portal_key)
+                for external_id in batch
+            }
+        cache.update(samples)
+
+    batches = [
+        external_ids[i:i + _EXTERNAL_IDS_PER_PORTAL_QUERY]
+        for i in range(0, len(external_ids), _EXTERNAL_IDS_PER_PORTAL_QUERY)
+    ]
+    if len(batches) == 1:
+        fetch_batch(batches[0])
+    else:
+        run_concurrently(
+            [lambda batch=batch: fetch_batch(batch) for batch in batches],
+            nthreads=_NTHREADS_FOR_PORTAL_QUERIES,
+        )
+
+
 def _categorize_samples_by_submission_center(
     samples: List[Dict],
 ) -> Tuple[List[Dict], List[Dict]]:
@@ -435,7 +491,7 @@ def _validate_metadata_consistency(
         )
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["TissueSample"])
 def _tissue_sample_external_id_category_match_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -446,19 +502,24 @@ def _tissue_sample_external_id_category_match_validator(
     ):
         return
 
-    for item in data:
-        submitted_id = item_utils.get_submitted_id(item)
-        external_id = item_utils.get_external_id(item)
-        category = item.get("category", "")
-        """Check that external_id pattern matches for category."""
-        if category in _TISSUE_CATEGORIES and external_id:
-            category_regex = _CATEGORY_REGEX_MAP.get(category)
-            if category_regex and not category_regex.search(external_id):
-                structured_data.note_validation_error(
-                    f"TissueSample: item {submitted_id} has category {category} "
-                    f"but external_id {external_id} does not match expected pattern "
-                    f"for that category."
-                )
+    # Check that external_id pattern matches for category (batched over the external_ids per category).
+    indices_by_category = {}
+    for index, item in enumerate(data):
+        if (category := item.get("category", "")) in _TISSUE_CATEGORIES and item_utils.get_external_id(item):
+            indices_by_category.setdefault(category, []).append(index)
+    mismatched_indices = []
+    for category, indices in indices_by_category.items():
+        matches = regex_utils.search_column(
+            _CATEGORY_REGEX_MAP[category], [item_utils.get_external_id(data[index]) for index in indices]
+        )
+        mismatched_indices.extend(index for index, matched in zip(indices, matches) if not matched)
+    for index in sorted(mismatched_indices):
+        item = data[index]
+        structured_data.note_validation_error(
+            f"TissueSample: item {item_utils.get_submitted_id(item)} has category {item.get('category')} "
+            f"but external_id {item_utils.get_external_id(item)} does not match expected pattern "
+            f"for that category."
+        )
 
 
 def _text_before_nth(text: str, delimiter: str, n: int) -> Optional[str]:
@@ -522,7 +583,7 @@ def _extract_donor_tissue_prefix_from_sample_source(sample_source: str) -> Optio
     return _text_before_nth(after_second_underscore, "-", 2)
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["TissueSample"])
 def _tissue_sample_external_id_in_submitted_id_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -570,7 +631,7 @@ def _tissue_sample_external_id_in_submitted_id_validator(
                 _note_validation_warning(structured_data, message)
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["TissueSample", "Tissue"])
 def _tissue_sample_external_id_sample_source_consistency_validator(
     structured_data: StructuredDataSet, **kwargs
 ) -> None:
@@ -597,6 +658,7 @@ def _tissue_sample_external_id_sample_source_consistency_validator(
     ):
         return
 
+    tissue_index = get_schema_index(structured_data, _TISSUE_SCHEMA_NAME)
     for item in data:
         submitted_id = item_utils.get_submitted_id(item)
         external_id = item_utils.get_external_id(item)
@@ -618,10 +680,7 @@ def _tissue_sample_external_id_sample_source_consistency_validator(
         # already covers that case and we avoid duplicate error messages.
         # Non-NDRI items are not guarded since _tissue_sample_external_id_validator
         # only fires for NDRI items.
-        tissue_in_submission = any(
-            tissue.get("submitted_id", "") in sample_sources
-            for tissue in structured_data.data.get(_TISSUE_SCHEMA_NAME, [])
-        )
+        tissue_in_submission = bool(tissue_index.items_in(sample_sources))
         if is_ndri and tissue_in_submission:
             continue
 
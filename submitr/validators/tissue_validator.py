@@ -1,7 +1,7 @@
 from typing import Dict
-from dcicutils import ff_utils
 from dcicutils.structured_data import StructuredDataSet
 from submitr.validators.decorators import structured_data_validator_finish_hook
+from submitr.validators.utils import ontology_term as ontology_term_utils
 
 
 # Validator that reports if any Tissue items are linked to Donor items
@@ -14,10 +14,9 @@ _EXTERNAL_ID_PROPERTY_NAME = "external_id"
 _DONOR_SCHEMA_NAME = "Donor"
 _NDRI_SUBMISSION_CENTER = "NDRI"
 _TISSUE_TERM_PROPERTY_NAME = "uberon_id"
-_OT_TYPE = "OntologyTerm"
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["Tissue", "Donor"])
 def _tissue_external_id_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_TISSUE_SCHEMA_NAME), list):
         return
@@ -46,8 +45,7 @@ def _tissue_external_id_validator(structured_data: StructuredDataSet, **kwargs)
 
 def _get_term_info(term_id: str, key: Dict) -> str:
     term_info = {}
-    query = f"/search/?type={_OT_TYPE}&identifier={term_id}"
-    result = ff_utils.search_metadata(query, key)
+    result = ontology_term_utils.search_ontology_terms(term_id, key)
     if result and len(result) == 1:
         term = result[0]
         if term and (pids := term.get('valid_protocol_ids')):
@@ -57,10 +55,18 @@ def _get_term_info(term_id: str, key: Dict) -> str:
     return term_info
 
 
-@structured_data_validator_finish_hook
+@structured_data_validator_finish_hook(sheets=["Tissue"], io=True)
 def _tissue_preservation_type_validator(structured_data: StructuredDataSet, **kwargs) -> None:
     if not isinstance(data := structured_data.data.get(_TISSUE_SCHEMA_NAME), list):
         return
+    # Pre-warm the (shared) OntologyTerm cache with all terms referenced by the Tissue items.
+    ontology_term_utils.prefetch_ontology_terms(
+        [
+            term_id for item in data if isinstance(item, dict)
+            if isinstance(term_id := item.get(_TISSUE_TERM_PROPERTY_NAME), str)
+        ],
+        structured_data.portal.key,
+    )
     seen = {}
     for item in data:
         if _TISSUE_TERM_PROPERTY_NAME not in item or not (
@@ -41,18 +41,15 @@ def _get_unreferenced_references(structured_data: StructuredDataSet,
                                  ignore_types: Optional[List[str]] = None,
                                  identifying_property_name: Optional[str] = None) -> List[str]:
 
-    def get_item_identifying_paths(item: dict, item_type: str) -> List[str]:
-        nonlocal structured_data, identifying_property_name
-        if isinstance(item, dict) and isinstance(item_type, str):
-            if item_identifying_value := item.get(identifying_property_name):
-                identifying_paths = set()
-                if item_super_type_names := structured_data.portal.get_schema_super_type_names(item_type):
-                    for item_super_type_name in item_super_type_names:
-                        identifying_paths.add(f"/{item_super_type_name}/{item_identifying_value}")
-                identifying_paths = list(identifying_paths)
-                identifying_paths.insert(0, f"/{item_type}/{item_identifying_value}")
-                return identifying_paths
-        return []
+    def get_type_names(item_type: str) -> List[str]:
+        nonlocal structured_data
+        # The given type name followed by its (unique) super type names; computed once per type.
+        type_names = [item_type]
+        if item_super_type_names := structured_data.portal.get_schema_super_type_names(item_type):
+            for item_super_type_name in item_super_type_names:
+                if item_super_type_name not in type_names:
+                    type_names.append(item_super_type_name)
+        return type_names
 
     if not isinstance(structured_data, StructuredDataSet):
         return []
@@ -65,16 +62,30 @@ def _get_unreferenced_references(structured_data: StructuredDataSet,
 
     # Note that structured_data.resolved_refs is an array of all of the references
     # within the spreadsheet, identified by path (e.g. /Sequencer/pacbio_revio_hifi),
-    # and is set up by the StructuredDataSet spreadsheet parsing process.
-    resolved_refs = set(structured_data.resolved_refs)
+    # and is set up by the StructuredDataSet spreadsheet parsing process. We group these
+    # by type name, i.e. into a dictionary of type name to set of referenced identifying values.
+    referenced_values_by_type = {}
+    for resolved_ref in set(structured_data.resolved_refs):
+        if isinstance(resolved_ref, str) and (len(resolved_ref_parts := resolved_ref.split("/", 2)) == 3):
+            if (referenced_values := referenced_values_by_type.get(resolved_ref_parts[1])) is None:
+                referenced_values = referenced_values_by_type[resolved_ref_parts[1]] = set()
+            referenced_values.add(resolved_ref_parts[2])
+
     unreferenced_items = []
 
     for item_type in structured_data.data:
         if ignore_types and (item_type in ignore_types):
             continue
-        for item in structured_data.data[item_type]:
-            if item_identifying_paths := get_item_identifying_paths(item, item_type):
-                if bool(set(item_identifying_paths) & resolved_refs) is False:
-                    unreferenced_items.append(item_identifying_paths[0])
+        if not (isinstance(item_type, str) and isinstance(items := structured_data.data[item_type], list)):
+            continue
+        # An item is referenced iff it is referenced via its own type or any of its super types;
+        # so the unreferenced items of this type are its items less all such referenced values.
+        referenced_values = set()
+        for type_name in get_type_names(item_type):
+            referenced_values |= referenced_values_by_type.get(type_name, set())
+        for item in items:
+            if (isinstance(item, dict) and (item_identifying_value := item.get(identifying_property_name)) and
+                (str(item_identifying_value) not in referenced_values)):  # noqa
+                unreferenced_items.append(f"/{item_type}/{item_identifying_value}")
 
     return unreferenced_items
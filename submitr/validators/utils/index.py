@@ -0,0 +1,112 @@
+import threading
+from typing import Any, Hashable, List, Optional
+from dcicutils.structured_data import StructuredDataSet
+
+# Shared, lazily built, per-schema index of the items within a StructuredDataSet, for use by the
+# (finish) validators which need to cross-reference items across sheets; without this such validators
+# tend to re-scan entire sheets for every row, which is O(n*m) and very slow for large workbooks.
+# The index for a schema is built on first use and attached to the StructuredDataSet (via a hidden
+# property), so it is shared by all validators; it is rebuilt if the list of items for the schema
+# is replaced or changes size. Items within each index are kept in their original sheet order; only the
+# positions of items are held, so that the index does not keep compact rows (see submitr.compact_rows) expanded.
+# As finish validators may run concurrently, getting/building an index is serialized via a lock.
+
+_STRUCTURED_DATA_INDEX_PROPERTY = "__schema_index__"
+_SUBMITTED_ID_PROPERTY_NAME = "submitted_id"
+_STRUCTURED_DATA_INDEX_LOCK = threading.RLock()
+
+
+class SchemaIndex:
+
+    def __init__(self, items: List[dict]) -> None:
+        self._items = items
+        self._size = len(items)
+        self._by_submitted_id = {}  # Positions (within items) by submitted_id
+        self._by_reference = {}  # By property name; positions (within items) by referenced value
+        for position, item in enumerate(items):
+            if isinstance(item, dict) and _is_hashable(submitted_id := item.get(_SUBMITTED_ID_PROPERTY_NAME, "")):
+                if (positions := self._by_submitted_id.get(submitted_id)) is None:
+                    self._by_submitted_id[submitted_id] = [position]
+                else:
+                    positions.append(position)
+
+    def is_stale(self, items: List[dict]) -> bool:
+        return (items is not self._items) or (len(items) != self._size)
+
+    def items(self, submitted_id: Any) -> List[dict]:
+        """
+        Returns the list of items (in sheet order) with the given submitted_id; normally just one.
+        """
+        if not _is_hashable(submitted_id):
+            return [item for item in self._items if item.get(_SUBMITTED_ID_PROPERTY_NAME, "") == submitted_id]
+        return self._get_items(self._by_submitted_id.get(submitted_id, []))
+
+    def item(self, submitted_id: Any) -> Optional[dict]:
+        """
+        Returns the first item (in sheet order) with the given submitted_id, or None if none.
+        """
+        return items[0] if (items := self.items(submitted_id)) else None
+
+    def items_in(self, submitted_ids: Any) -> List[dict]:
+        """
+        Returns the list of items (in sheet order) whose submitted_id is "in" the given value, which
+        is normally a list of submitted_id values (i.e. a multi-valued reference property value);
+        if it is a string then (as with the Python "in" operator) it is treated as a substring test.
+        """
+        if isinstance(submitted_ids, str) or not isinstance(submitted_ids, (list, tuple, set)):
+            return [item for item in self._items if item.get(_SUBMITTED_ID_PROPERTY_NAME, "") in submitted_ids]
+        if not all(_is_hashable(submitted_id) for submitted_id in submitted_ids):
+            return [item for item in self._items if item.get(_SUBMITTED_ID_PROPERTY_NAME, "") in submitted_ids]
+        positions = set()
+        for submitted_id in set(submitted_ids):
+            positions.update(self._by_submitted_id.get(submitted_id, []))
+        return self._get_items(sorted(positions))
+
+    def referencing(self, property_name: str, submitted_id: Hashable) -> List[dict]:
+        """
+        Returns the list of items (in sheet order) whose given (reference) property, which may be
+        single-valued or multi-valued (i.e. a list), refers to (i.e. contains) the given submitted_id.
+        """
+        if (references := self._by_reference.get(property_name)) is None:
+            references = {}
+            for position, item in enumerate(self._items):
+                if not isinstance(item, dict) or (value := item.get(property_name)) is None:
+                    continue
+                for reference in (value if isinstance(value, list) else [value]):
+                    if _is_hashable(reference):
+                        if (positions := references.get(reference)) is None:
+                            references[reference] = [position]
+                        elif positions[-1] != position:
+                            positions.append(position)
+            self._by_reference[property_name] = references
+        return self._get_items(references.get(submitted_id, []))
+
+    def _get_items(self, positions: List[int]) -> List[dict]:
+        # Note the items are gotten (by position) only when asked for, as they may be built on demand
+        # (see submitr.compact_rows); for this reason the index holds only their positions.
+        items = self._items
+        return [items[position] for position in positions]
+
+
+def get_schema_index(structured_data: StructuredDataSet, schema: str) -> SchemaIndex:
+    """
+    Returns the (shared, lazily built) index for the items of the given schema within
+    the given StructuredDataSet; if there are no such items then an empty index is returned.
+    """
+    if not isinstance(items := structured_data.data.get(schema), list):
+        items = []
+    with _STRUCTURED_DATA_INDEX_LOCK:
+        if (indexes := getattr(structured_data, _STRUCTURED_DATA_INDEX_PROPERTY, None)) is None:
+            indexes = {}
+            setattr(structured_data, _STRUCTURED_DATA_INDEX_PROPERTY, indexes)
+        if ((index := indexes.get(schema)) is None) or index.is_stale(items):
+            index = indexes[schema] = SchemaIndex(items)
+        return index
+
+
+def _is_hashable(value: Any) -> bool:
+    try:
+        hash(value)
+        return True
+    except TypeError:
+        return False
@@ -0,0 +1,101 @@
+import os
+import threading
+from typing import Dict, List, Optional
+from dcicutils import ff_utils
+from dcicutils.misc_utils import to_integer
+from submitr.disk_cache import DiskCache
+
+# Shared cache of OntologyTerm search results (i.e. list of matching terms) by identifier (e.g. an
+# Uberon ID), for use by any validators which need to look up OntologyTerm items; shared across all
+# validators (in-memory) and, optionally, across runs, via an on-disk cache whose entries expire after
+# the number of seconds specified by the SUBMITR_ONTOLOGY_TERM_CACHE_TTL environment variable (unset
+# or zero means no on-disk cache). Cache keys include the portal server so different portals never mix.
+# To minimize portal calls, prefetch_ontology_terms can be called with all identifiers of interest
+# to pre-warm the cache with a single multi-identifier search.
+
+_OT_TYPE = "OntologyTerm"
+_IDENTIFIER_PROPERTY_NAME = "identifier"
+_IDENTIFIERS_PER_PORTAL_QUERY = 100
+_ONTOLOGY_TERM_CACHE_TTL = to_integer(os.environ.get("SUBMITR_ONTOLOGY_TERM_CACHE_TTL"), fallback=0) or 0
+
+_ontology_terms = {}
+_ontology_terms_lock = threading.Lock()
+_ontology_terms_disk_cache = DiskCache("ontology-terms", ttl=_ONTOLOGY_TERM_CACHE_TTL) \
+    if _ONTOLOGY_TERM_CACHE_TTL > 0 else None
+
+
+def search_ontology_terms(identifier: str, portal_key: Dict) -> Optional[List[Dict]]:
+    """
+    Returns the list of OntologyTerm items matching the given identifier, from the
+    cache if present there, or otherwise (and caching) from a portal search.
+    """
+    if (terms := _get_cached_ontology_terms(identifier, portal_key)) is not None:
+        return terms
+    query = f"/search/?type={_OT_TYPE}&{_IDENTIFIER_PROPERTY_NAME}={identifier}"
+    terms = ff_utils.search_metadata(query, portal_key)
+    _cache_ontology_terms(identifier, terms, portal_key)
+    return terms
+
+
+def prefetch_ontology_terms(identifiers: List[str], portal_key: Dict) -> None:
+    """
+    Pre-warms the cache with the OntologyTerm items for all of the given (not already cached)
+    identifiers, using a single multi-identifier portal search (per batch of identifiers).
+    Does nothing if the portal server is not known (as the cache is keyed by server).
+    """
+    if not _get_server(portal_key):
+        return
+    identifiers = [identifier for identifier in dict.fromkeys(identifiers)
+                   if identifier and (_get_cached_ontology_terms(identifier, portal_key) is None)]
+    for i in range(0, len(identifiers), _IDENTIFIERS_PER_PORTAL_QUERY):
+        batch = identifiers[i:i + _IDENTIFIERS_PER_PORTAL_QUERY]
+        query = f"/search/?type={_OT_TYPE}" + "".join(
+            f"&{_IDENTIFIER_PROPERTY_NAME}={identifier}" for identifier in batch)
+        try:
+            found_terms = ff_utils.search_metadata(query, portal_key)
+        except Exception:
+            return
+        terms = {identifier: [] for identifier in batch}
+        for term in found_terms or []:
+            if (identifier := term.get(_IDENTIFIER_PROPERTY_NAME)) in terms:
+                terms[identifier].append(term)
+        for identifier, identifier_terms in terms.items():
+            _cache_ontology_terms(identifier, identifier_terms, portal_key)
+
+
+def clear_ontology_terms_cache() -> None:
+    with _ontology_terms_lock:
+        _ontology_terms.clear()
+    if _ontology_terms_disk_cache:
+        _ontology_terms_disk_cache.clear()
+
+
+def _get_cached_ontology_terms(identifier: str, portal_key: Dict) -> Optional[List[Dict]]:
+    if not (cache_key := _get_cache_key(identifier, portal_key)):
+        return None
+    with _ontology_terms_lock:
+        if (terms := _ontology_terms.get(cache_key)) is not None:
+            return terms
+    if _ontology_terms_disk_cache and ((terms := _ontology_terms_disk_cache.get(cache_key)) is not None):
+        with _ontology_terms_lock:
+            _ontology_terms[cache_key] = terms
+        return terms
+    return None
+
+
+def _cache_ontology_terms(identifier: str, terms: Optional[List[Dict]], portal_key: Dict) -> None:
+    if (terms is None) or not (cache_key := _get_cache_key(identifier, portal_key)):
+        return
+    with _ontology_terms_lock:
+        _ontology_terms[cache_key] = terms
+    if _ontology_terms_disk_cache:
+        _ontology_terms_disk_cache.set(cache_key, terms)
+
+
+def _get_cache_key(identifier: str, portal_key: Dict) -> Optional[str]:
+    return f"{server}|{identifier}" if (server := _get_server(portal_key)) and identifier else None
+
+
+def _get_server(portal_key: Dict) -> Optional[str]:
+    return server.rstrip("/") if isinstance(portal_key, dict) and isinstance(
+        server := portal_key.get("server"), str) else None
@@ -27,6 +27,41 @@ def search_tissue_samples_by_external_id(
         return None
 
 
+def search_tissue_samples_by_external_ids(
+    external_ids: List[str],
+    portal_key: Dict,
+) -> Optional[Dict[str, List[Dict]]]:
+    """
+    Query portal for TissueSample items with any of the given external_ids,
+    in a single (paged) search with a multi-valued external_id parameter.
+
+    Args:
+        external_ids: External IDs to search for
+        portal_key: Portal authentication key
+
+    Returns:
+        Dict of each given external_id to its list of matching TissueSample items,
+        or None on error
+    """
+    if len(external_ids) == 1:
+        if (result := search_tissue_samples_by_external_id(external_ids[0], portal_key)) is None:
+            return None
+        return {external_ids[0]: result}
+    try:
+        query = (
+            "/search/?type=TissueSample&status!=deleted"
+            + "".join(f"&external_id={external_id}" for external_id in external_ids)
+        )
+        result = ff_utils.search_metadata(query, portal_key)
+        samples = {external_id: [] for external_id in external_ids}
+        for sample in result or []:
+            if (external_id := sample.get("external_id")) in samples:
+                samples[external_id].append(sample)
+        return samples
+    except Exception:
+        return None
+
+
 def get_item_by_identifier(
     identifier: str,
     portal_key: Dict,
@@ -0,0 +1,39 @@
+import re
+from bisect import bisect_right
+from typing import Any, List, Pattern
+
+# Batched regular expression matching over a column of values; rather than one search call per value,
+# the (string) values are joined with newlines and searched in a single pass with the MULTILINE variant
+# of the given regular expression, so that ^ and $ anchor at the start/end of each value. This requires
+# that the regular expression cannot match a newline (true of the column value patterns used here);
+# values which themselves contain a newline are searched individually.
+
+_MULTILINE_REGEXES = {}
+
+
+def search_column(regex: Pattern, values: List[Any]) -> List[bool]:
+    """
+    Returns a list of booleans, one for each of the given values, indicating whether or not the given
+    (compiled) regular expression matches (via search) the value; non-string values never match.
+    """
+    if (multiline_regex := _MULTILINE_REGEXES.get(regex)) is None:
+        multiline_regex = _MULTILINE_REGEXES[regex] = re.compile(regex.pattern, regex.flags | re.MULTILINE)
+    results = [False] * len(values)
+    indices = []
+    line_starts = []
+    text = []
+    position = 0
+    for index, value in enumerate(values):
+        if not isinstance(value, str):
+            continue
+        if "\n" in value:
+            results[index] = regex.search(value) is not None
+            continue
+        indices.append(index)
+        line_starts.append(position)
+        text.append(value)
+        position += len(value) + 1
+    if text:
+        for match in multiline_regex.finditer("\n".join(text)):
+            results[indices[bisect_right(line_starts, match.start()) - 1]] = True
+    return results
@@ -0,0 +1,105 @@
+import hashlib
+import os
+from typing import Any, Dict, Optional
+from dcicutils.structured_data import StructuredDataSet
+from submitr.disk_cache import DiskCache
+
+# Support for incremental (re-)validation of a metadata file, i.e. e.g. when a submitter fixes a few rows
+# of a large workbook and re-runs validation. We compute a content hash for each row (of each sheet) as it is
+# parsed (via the main validator hook), and persist (in an on-disk cache, keyed by the portal server and the
+# absolute path of the file, i.e. its lineage) the row hashes, along with the cached results of (row-local)
+# portal-backed validators for each row. On a later run for the same file lineage, validators may reuse the
+# previous results for rows whose hash is unchanged (they are keyed by hash so moved rows are still matched).
+# Only results which depend solely on the row itself (e.g. the portal validation of its submitted_id) may be
+# cached; validators which check across rows or sheets are always re-run, as such results may depend on changed
+# rows. Cached state expires after _REVALIDATION_TTL. Note that resolved references are not kept here, as they
+# may become stale much sooner; these are cached (with a much shorter TTL) by the reference cache (ref_cache).
+
+_REVALIDATION_CACHE_NAME = "revalidation"
+_REVALIDATION_TTL = 24 * 60 * 60  # seconds
+_STRUCTURED_DATA_REVALIDATION_PROPERTY = "__revalidation__"
+
+_revalidation_cache = None
+
+
+class RevalidationState:
+
+    def __init__(self, file: str, server: str, cache: Optional[DiskCache] = None) -> None:
+        self._cache = cache if cache is not None else _get_revalidation_cache()
+        self._key = hashlib.sha256(f"{server}|{os.path.abspath(file)}".encode()).hexdigest()
+        previous = self._cache.get(self._key)
+        self._previous = previous if isinstance(previous, dict) else {}
+        self._row_hashers = {}
+        self._results = {}
+        self._nreused = 0
+
+    @property
+    def has_previous(self) -> bool:
+        return bool(self._previous)
+
+    @property
+    def reused_count(self) -> int:
+        return self._nreused
+
+    def note_value(self, schema: str, column: str, row: int, value: Any) -> None:
+        if (hasher := self._row_hashers.get((schema, row))) is None:
+            hasher = self._row_hashers[(schema, row)] = hashlib.sha256()
+        hasher.update(f"{column}\0{value!r}\0".encode())
+
+    def row_hash(self, schema: str, row: int) -> Optional[str]:
+        return hasher.hexdigest()[:32] if (hasher := self._row_hashers.get((schema, row))) else None
+
+    def is_unchanged(self, schema: str, row: int) -> bool:
+        return ((row_hash := self.row_hash(schema, row)) is not None and
+                row_hash in (self._previous.get("rows", {}).get(schema) or {}))
+
+    def get_result(self, validator: str, schema: str, row: int) -> Any:
+        """
+        Returns the result cached by the given validator, on the previous run, for
+        the given row if the row is unchanged since then; otherwise returns None.
+        """
+        if ((row_hash := self.row_hash(schema, row)) is not None and
+            (results := (self._previous.get("rows", {}).get(schema) or {}).get(row_hash)) and
+            ((result := results.get(validator)) is not None)):  # noqa
+            self._nreused += 1
+            self.set_result(validator, schema, row, result)
+            return result
+        return None
+
+    def set_result(self, validator: str, schema: str, row: int, result: Any) -> None:
+        if (row_hash := self.row_hash(schema, row)) is not None:
+            self._results.setdefault(schema, {}).setdefault(row_hash, {})[validator] = result
+
+    def counts(self) -> Dict[str, int]:
+        nrows = len(self._row_hashers)
+        nunchanged = len([key for key in self._row_hashers if self.is_unchanged(*key)])
+        return {"rows": nrows, "unchanged": nunchanged, "reused": self._nreused}
+
+    def save(self) -> None:
+        rows = {}
+        for (schema, row) in self._row_hashers:
+            row_hash = self.row_hash(schema, row)
+            rows.setdefault(schema, {})[row_hash] = (self._results.get(schema) or {}).get(row_hash) or {}
+        self._cache.set(self._key, {"rows": rows})
+        self._cache.save()
+
+    def attach(self, structured_data: StructuredDataSet) -> None:
+        """
+        Associates this state with the given StructuredDataSet (see get_revalidation_state).
+        """
+        setattr(structured_data, _STRUCTURED_DATA_REVALIDATION_PROPERTY, self)
+
+
+def get_revalidation_state(structured_data: StructuredDataSet) -> Optional[RevalidationState]:
+    return getattr(structured_data, _STRUCTURED_DATA_REVALIDATION_PROPERTY, None)
+
+
+def clear_revalidation_cache() -> None:
+    _get_revalidation_cache().clear()
+
+
+def _get_revalidation_cache() -> DiskCache:
+    global _revalidation_cache
+    if _revalidation_cache is None:
+        _revalidation_cache = DiskCache(_REVALIDATION_CACHE_NAME, ttl=_REVALIDATION_TTL)
+    return _revalidation_cache
@@ -0,0 +1,126 @@
+import concurrent.futures
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+from dcicutils.misc_utils import to_integer
+from dcicutils.portal_utils import Portal
+from submitr.run_metrics import COUNTER_RETRIES, run_metrics
+
+# Client for the smaht-portal submitted_id validation API, i.e. one GET of
+# /validators/submitted_id/{submitted_id} per (unique) submitted_id, using a pool of worker threads
+# whose concurrency adapts to the portal response, i.e. increasing (up to a maximum) while requests
+# are succeeding, and (multiplicatively) decreasing when they fail, with failed requests retried.
+# The (initial and maximum) number of worker threads are configurable via environment variables.
+
+_SUBMITTED_ID_VALIDATOR_PATH = "/validators/submitted_id"
+_SUBMITTED_ID_VALIDATOR_NTHREADS = max(
+    to_integer(os.environ.get("SUBMITR_SUBMITTED_ID_VALIDATOR_THREADS"), fallback=6) or 6, 1)
+_SUBMITTED_ID_VALIDATOR_MAX_NTHREADS = max(
+    to_integer(os.environ.get("SUBMITR_SUBMITTED_ID_VALIDATOR_MAX_THREADS"), fallback=24) or 24,
+    _SUBMITTED_ID_VALIDATOR_NTHREADS)
+_SUBMITTED_ID_VALIDATOR_RETRIES = 3
+_SUBMITTED_ID_VALIDATOR_RETRY_DELAY = 0.5  # seconds
+
+
+def validate_submitted_ids(portal: Portal, submitted_ids: List[str],
+                           submission_centers: Optional[str] = None,
+                           nthreads: Optional[int] = None,
+                           max_nthreads: Optional[int] = None) -> Dict[str, Optional[str]]:
+    """
+    Validates the given submitted_id values via the portal and returns a dictionary of each
+    (unique) submitted_id to its validation status, which is "OK" if valid and otherwise an
+    error message; the status is None for any submitted_id which could not be validated, i.e.
+    for which the portal request failed (after retries); any with no result are omitted.
+    """
+    if not (submitted_ids := list(dict.fromkeys(submitted_ids))):
+        return {}
+    return _validate_submitted_ids_concurrently(
+        portal, submitted_ids, submission_centers,
+        nthreads=nthreads or _SUBMITTED_ID_VALIDATOR_NTHREADS,
+        max_nthreads=max_nthreads or _SUBMITTED_ID_VALIDATOR_MAX_NTHREADS)
+
+
+def _validate_submitted_ids_concurrently(portal: Portal, submitted_ids: List[str],
+                                         submission_centers: Optional[str] = None,
+                                         nthreads: int = _SUBMITTED_ID_VALIDATOR_NTHREADS,
+                                         max_nthreads: int = _SUBMITTED_ID_VALIDATOR_MAX_NTHREADS
+                                         ) -> Dict[str, Optional[str]]:
+
+    results = {}
+    limiter = _AdaptiveConcurrencyLimiter(nthreads, max(max_nthreads, nthreads))
+
+    def validate_submitted_id(submitted_id: str) -> None:  # noqa
+        path = f"{_SUBMITTED_ID_VALIDATOR_PATH}/{submitted_id}"
+        if submission_centers:
+            path += f"?submission_centers={submission_centers}"
+        for attempt in range(_SUBMITTED_ID_VALIDATOR_RETRIES):
+            if attempt > 0:
+                run_metrics.increment(COUNTER_RETRIES)
+                time.sleep(_SUBMITTED_ID_VALIDATOR_RETRY_DELAY * attempt)
+            with limiter:
+                try:
+                    result = portal.get_metadata(path)
+                except Exception:
+                    limiter.failed()
+                    continue
+            limiter.succeeded()
+            if result:
+                results[submitted_id] = _get_status(result)
+            return
+        results[submitted_id] = None
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=limiter.maximum) as executor:
+        for future in [executor.submit(validate_submitted_id, submitted_id) for submitted_id in submitted_ids]:
+            future.result()
+    return results
+
+
+def _get_status(result: object) -> str:
+    return result.get("status") if isinstance(result, dict) else result
+
+
+class _AdaptiveConcurrencyLimiter:
+    """
+    Limits the number of concurrently active callers (via "with" statement) to a limit which increases
+    by one (up to the given maximum) after a limit's worth of successes, and is halved on a failure.
+    """
+
+    def __init__(self, limit: int, maximum: int) -> None:
+        self._limit = max(limit, 1)
+        self._maximum = max(maximum, self._limit)
+        self._active = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def maximum(self) -> int:
+        return self._maximum
+
+    def __enter__(self) -> None:
+        with self._condition:
+            while self._active >= self._limit:
+                self._condition.wait()
+            self._active += 1
+
+    def __exit__(self, *args) -> None:
+        with self._condition:
+            self._active -= 1
+            self._condition.notify_all()
+
+    def succeeded(self) -> None:
+        with self._condition:
+            self._successes += 1
+            if (self._successes >= self._limit) and (self._limit < self._maximum):
+                self._limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def failed(self) -> None:
+        with self._condition:
+            self._limit = max(self._limit // 2, 1)
+            self._successes = 0